@@ -1,4 +1,14 @@
 from .client import *
+from .async_client import *
 from .utils import *
 from .types import *
+from .instrumentation import RpcStats, RpcCallRecord
 
+from .telemetry import StateLog
+from .mapping import LidarAccumulator
+from .pointcloud import PointCloud, depth_to_points
+from .io import AsyncFrameWriter
+from .stream import ImageStream, ImageFrame
+from .stepping import SimStepper
+from .decode import DecodePool
+from .dataset import Dataset, Episode, EpisodeWriter
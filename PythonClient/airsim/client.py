@@ -2,6 +2,8 @@ from __future__ import print_function
 
 from .utils import *
 from .types import *
+from .instrumentation import RpcCallRecord
+from .stream import ImageStream
 
 import msgpackrpc #install as admin: pip install msgpack-rpc-python
 import numpy as np #pip install numpy
@@ -9,12 +11,357 @@ import msgpack
 import time
 import math
 import logging
+import inspect
+import threading
+from msgpackrpc.transport import tcp
+from tornado.iostream import IOStream
+
+class _MeteredClientSocket(tcp.ClientSocket):
+    # records on the future of each request the size of its request and response messages and the time spent packing the request,
+    # read by _ObservedClient. Only while its transport is metered, i.e. an observer is set, otherwise it's a plain ClientSocket.
+    def send_message(self, message, callback = None):
+        if not self._transport.metered:
+            return tcp.ClientSocket.send_message(self, message, callback)
+        start = time.perf_counter()
+        data = self._packer.pack(message)
+        future = self._transport._session._request_table.get(message[1])
+        if future is not None:
+            future.serialize_time = time.perf_counter() - start
+            future.bytes_sent = len(data)
+        self._stream.write(data, callback = callback)
+
+    def on_read(self, data):
+        if not self._transport.metered:
+            return tcp.ClientSocket.on_read(self, data)
+        self._unpacker.feed(data)
+        offset = self._unpacker.tell()
+        for message in self._unpacker:
+            end = self._unpacker.tell()
+            if len(message) == 4 and message[0] == msgpackrpc.message.RESPONSE:
+                future = self._transport._session._request_table.get(message[1])
+                if future is not None:
+                    future.bytes_received = end - offset
+            offset = end
+            self.on_message(message)
+
+class _NoDelayClientTransport(tcp.ClientTransport):
+    # requests are small, disable Nagle so pipelined calls aren't held back until the previous response is acknowledged
+    metered = False   # set by VehicleClient.set_rpc_observer
+
+    def connect(self):
+        stream = IOStream(self._address.socket(), io_loop = self._session._loop._ioloop)
+        _MeteredClientSocket(stream, self, self._encodings).connect()
+
+    def on_connect(self, sock):
+        sock._stream.set_nodelay(True)
+        tcp.ClientTransport.on_connect(self, sock)
+
+class _tcp_no_delay:
+    ClientTransport = _NoDelayClientTransport
+
+class _PooledFuture:
+    # msgpackrpc future whose loop may only be run while holding its channel's lock
+    def __init__(self, future, lock):
+        self._future = future
+        self._lock = lock
+
+    def join(self):
+        with self._lock:
+            self._future.join()
+
+    def get(self):
+        with self._lock:
+            return self._future.get()
+
+class RpcClientPool:
+    """
+    Several msgpack-rpc connections to the same server, used by `VehicleClient` when `pool_size > 1`
+
+    Each vehicle is pinned to one connection, assigned round-robin the first time the vehicle is seen, so a long call for one
+    vehicle (e.g. `simGetImages`) doesn't delay calls for vehicles on other connections. Calls without a vehicle, like `simPause`
+    or the plotting APIs, share the channel of the `None` key. A connection serves one thread at a time, which makes the
+    client safe to share between threads.
+
+    Args:
+        ip (str): Address of the AirSim server
+        port (int): RPC port of the AirSim server
+        timeout_value (float): Timeout of each call in seconds
+        pool_size (int): Number of connections to open
+    """
+    # RPC methods which don't take vehicle_name as their last argument
+    _global_methods = frozenset(['reset', 'ping', 'getServerVersion', 'getMinRequiredClientVersion', 'simPause', 'simIsPaused',
+        'simContinueForTime', 'simSwapTextures', 'simSetTimeOfDay', 'simEnableWeather', 'simSetWeatherParameter',
+        'simGetMeshPositionVertexBuffers', 'simGetObjectPose', 'simSetObjectPose', 'simListSceneObjects',
+        'simSetSegmentationObjectID', 'simGetSegmentationObjectID', 'simPrintLogMessage', 'simFlushPersistentMarkers',
+        'simPlotPoints', 'simPlotLineStrip', 'simPlotLineList', 'simPlotArrows', 'simPlotStrings', 'simPlotTransforms',
+        'simPlotTransformsWithNames', 'waitOnLastTask'])
+
+    def __init__(self, ip, port, timeout_value, pool_size):
+        self._channels = [msgpackrpc.Client(msgpackrpc.Address(ip, port), timeout = timeout_value, builder = _tcp_no_delay,
+                                            pack_encoding = 'utf-8', unpack_encoding = 'utf-8') for _ in range(pool_size)]
+        self._locks = [threading.Lock() for _ in range(pool_size)]
+        self._affinity = {}
+        self._affinity_lock = threading.Lock()
+
+    @staticmethod
+    def vehicle_name_of(method, args):
+        """
+        Returns the vehicle a call is for, or None for calls not bound to a vehicle
+        """
+        if method in RpcClientPool._global_methods or not args or not isinstance(args[-1], str):
+            return None
+        return args[-1]
+
+    def channel_index(self, vehicle_name):
+        """
+        Returns the index of the connection used for calls to `vehicle_name`
+        """
+        with self._affinity_lock:
+            index = self._affinity.get(vehicle_name)
+            if index is None:
+                index = len(self._affinity) % len(self._channels)
+                self._affinity[vehicle_name] = index
+            return index
+
+    def call(self, method, *args):
+        index = self.channel_index(RpcClientPool.vehicle_name_of(method, args))
+        with self._locks[index]:
+            return self._channels[index].call(method, *args)
+
+    def call_async(self, method, *args):
+        index = self.channel_index(RpcClientPool.vehicle_name_of(method, args))
+        with self._locks[index]:
+            future = self._channels[index].call_async(method, *args)
+        return _PooledFuture(future, self._locks[index])
+
+    def close(self):
+        for lock, channel in zip(self._locks, self._channels):
+            with lock:
+                channel.close()
+
+def _list_of(cls):
+    return lambda responses_raw: [cls.from_msgpack(response_raw) for response_raw in responses_raw]
+
+def _image_or_none(result):
+    # because simGetImage returns std::vector<uint8>, msgpack decides to encode it as a string unfortunately.
+    if (result == "" or result == "\0" or result == b"" or result == b"\0"):
+        return None
+    return result
+
+# converts raw msgpack results of the typed APIs and other APIs which post-process their result, keyed by RPC method name
+_rpc_result_decoders = {
+    'simGetImage': _image_or_none,
+    'getHomeGeoPoint': GeoPoint.from_msgpack,
+    'simGetImages': _list_of(ImageResponse),
+    'simGetMeshPositionVertexBuffers': _list_of(MeshPositionVertexBuffersResponse),
+    'simGetCollisionInfo': CollisionInfo.from_msgpack,
+    'simGetVehiclePose': Pose.from_msgpack,
+    'simGetObjectPose': Pose.from_msgpack,
+    'simGetCameraInfo': CameraInfo.from_msgpack,
+    'simGetGroundTruthKinematics': KinematicsState.from_msgpack,
+    'simGetGroundTruthEnvironment': EnvironmentState.from_msgpack,
+    'getImuData': ImuData.from_msgpack,
+    'getBarometerData': BarometerData.from_msgpack,
+    'getMagnetometerData': MagnetometerData.from_msgpack,
+    'getGpsData': GpsData.from_msgpack,
+    'getDistanceSensorData': DistanceSensorData.from_msgpack,
+    'getLidarData': LidarData.from_msgpack,
+    'getMultirotorState': MultirotorState.from_msgpack,
+    'getCarState': CarState.from_msgpack,
+    'getCarControls': CarControls.from_msgpack,
+}
+
+def _get_decoded(future, decoder):
+    # an observed call times the decoding itself
+    if isinstance(future, _ObservedFuture):
+        return future.get(decoder)
+    result = future.get()
+    return decoder(result) if decoder is not None else result
+
+class RpcBatch:
+    """
+    Queue of RPCs sent back-to-back on one connection, created by `VehicleClient.batch()`
+
+    Client APIs called on the batch are queued instead of executed, e.g. `b.getMultirotorState('Drone1')`, and return the index
+    of their result. On leaving the `with` block all queued requests are written without waiting for responses, then the responses
+    are collected and decoded in order into `results`, e.g. `MultirotorState`, `CollisionInfo` or `list[ImageResponse]`.
+    `*Async` APIs are already non-blocking and can't be batched.
+    """
+    # Python API names which differ from their RPC method name
+    _rpc_names = {'simIsPause': 'simIsPaused'}
+    _unsupported = ('confirmConnection', 'getClientVersion', 'getMinRequiredServerVersion', 'batch', 'getLidarScan', 'stream_images',
+                    'setAngleRateControllerGains', 'setAngleLevelControllerGains', 'setVelocityControllerGains', 'setPositionControllerGains')
+
+    def __init__(self, vehicle_client):
+        self._vehicle_client = vehicle_client
+        self._calls = []
+        self.results = None
+
+    def call(self, method, *args):
+        """
+        Queue a raw RPC, its result is decoded to the API's type if the method is a typed getter
+
+        Args:
+            method (str): RPC method name
+            *args: Arguments sent to the server
+
+        Returns:
+            int: Index of the result in `results`
+        """
+        self._calls.append((method, args))
+        return len(self._calls) - 1
+
+    def __getattr__(self, name):
+        api = getattr(type(self._vehicle_client), name, None)
+        if name.startswith('_') or name.endswith('Async') or name in RpcBatch._unsupported or not inspect.isfunction(api):
+            raise AttributeError("'%s' can't be batched" % name)
+        signature = inspect.signature(api)
+        rpc_name = RpcBatch._rpc_names.get(name, name)
+
+        def queue(*args, **kwargs):
+            bound = signature.bind(self._vehicle_client, *args, **kwargs)
+            bound.apply_defaults()
+            if 'camera_name' in bound.arguments:
+                # TODO: below str() conversion is only needed for legacy reason and should be removed in future
+                bound.arguments['camera_name'] = str(bound.arguments['camera_name'])
+            return self.call(rpc_name, *bound.args[1:])
+        return queue
+
+    def execute(self):
+        """
+        Send all queued requests and wait for their responses
+
+        Returns:
+            list: Decoded result of each queued call, in order
+        """
+        calls, self._calls = self._calls, []
+        futures = [self._vehicle_client.client.call_async(method, *args) for method, args in calls]
+        for future in futures:
+            future.join()
+        self.results = []
+        for (method, args), future in zip(calls, futures):
+            self.results.append(_get_decoded(future, _rpc_result_decoders.get(method)))
+        return self.results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+
+class _ObservedFuture:
+    # future of an observed call, reports the call to the observer when its result is taken
+    def __init__(self, future, record, observer):
+        self._future = future
+        self._record = record
+        self._observer = observer
+        self._start = time.perf_counter()
+        self._received = None
+        getattr(future, '_future', future).attach_callback(self._on_done)
+
+    def _on_done(self, done):
+        self._received = time.perf_counter()
+
+    def join(self):
+        self._future.join()
+
+    def get(self, decoder = None):
+        """
+        Returns the result, decoded by `decoder` if given, whose time is recorded as the deserialize time
+        """
+        record = self._record
+        try:
+            result = self._future.get()
+        except Exception as e:
+            record.error = e
+            raise
+        else:
+            if decoder is not None:
+                start = time.perf_counter()
+                result = decoder(result)
+                record.deserialize_time = time.perf_counter() - start
+            return result
+        finally:
+            # sizes and packing time as measured by _MeteredClientSocket
+            transport_future = getattr(self._future, '_future', self._future)
+            record.bytes_sent = getattr(transport_future, 'bytes_sent', 0)
+            record.bytes_received = getattr(transport_future, 'bytes_received', 0)
+            record.serialize_time = getattr(transport_future, 'serialize_time', 0.0)
+            record.wire_time = (self._received or time.perf_counter()) - self._start
+            self._observer.on_rpc(record)
+
+class _ObservedClient:
+    # wraps the msgpack-rpc client to report each call to an observer, see VehicleClient.set_rpc_observer
+    def __init__(self, client, observer):
+        self.inner = client
+        self._observer = observer
+
+    def call(self, method, *args):
+        return self.call_async(method, *args).get()
+
+    def call_async(self, method, *args):
+        record = RpcCallRecord(method, RpcClientPool.vehicle_name_of(method, args))
+        return _ObservedFuture(self.inner.call_async(method, *args), record, self._observer)
+
+    def close(self):
+        self.inner.close()
 
 class VehicleClient:
-    def __init__(self, ip = "", port = 41451, timeout_value = 3600):
+    def __init__(self, ip = "", port = 41451, timeout_value = 3600, pool_size = 1):
+        """
+        Args:
+            ip (str, optional): Address of the AirSim server, localhost by default
+            port (int, optional): RPC port of the AirSim server
+            timeout_value (float, optional): Timeout of each call in seconds
+            pool_size (int, optional): Number of connections to keep to the server. With more than one, calls are routed per
+                                       vehicle_name (see `RpcClientPool`) and the client can be shared between threads
+        """
         if (ip == ""):
             ip = "127.0.0.1"
-        self.client = msgpackrpc.Client(msgpackrpc.Address(ip, port), timeout = timeout_value, pack_encoding = 'utf-8', unpack_encoding = 'utf-8')
+        if pool_size > 1:
+            self.client = RpcClientPool(ip, port, timeout_value, pool_size)
+        else:
+            self.client = msgpackrpc.Client(msgpackrpc.Address(ip, port), timeout = timeout_value, builder = _tcp_no_delay, pack_encoding = 'utf-8', unpack_encoding = 'utf-8')
+
+    def set_rpc_observer(self, observer):
+        """
+        Record every RPC of this client with an observer, e.g. `airsim.RpcStats`
+
+        The observer's `on_rpc(record)` is called with an `RpcCallRecord` holding method, vehicle_name, bytes sent and received,
+        serialize, wire and deserialize times and any exception. Sizes are those of the messages on the connection, the
+        deserialize time is the time the API spent decoding the result into its type.
+
+        Args:
+            observer: Object with an `on_rpc(record)` method, None to stop observing
+        """
+        inner = self.client.inner if isinstance(self.client, _ObservedClient) else self.client
+        for channel in (inner._channels if isinstance(inner, RpcClientPool) else [inner]):
+            channel._transport.metered = observer is not None
+        self.client = _ObservedClient(inner, observer) if observer is not None else inner
+
+    def _call_decoded(self, method, *args):
+        # calls a typed getter and decodes its result, an observer is told how long the decoding took
+        decoder = _rpc_result_decoders[method]
+        if isinstance(self.client, _ObservedClient):
+            return self.client.call_async(method, *args).get(decoder)
+        return decoder(self.client.call(method, *args))
+
+    def batch(self):
+        """
+        Pipeline many API calls over the connection instead of paying a full round trip for each
+
+        Example:
+            with client.batch() as b:
+                for name in vehicle_names:
+                    b.getMultirotorState(name)
+                b.simGetCollisionInfo('Drone1')
+            states, collision = b.results[:-1], b.results[-1]
+
+        Returns:
+            RpcBatch: Context manager queueing the calls, results are available in `results` after the `with` block
+        """
+        return RpcBatch(self)
 
     # -----------------------------------  Common vehicle APIs ---------------------------------------------
     def reset(self):
@@ -121,7 +468,7 @@ class VehicleClient:
         Returns:
             GeoPoint: Home location of the vehicle
         """
-        return GeoPoint.from_msgpack(self.client.call('getHomeGeoPoint', vehicle_name))
+        return self._call_decoded('getHomeGeoPoint', vehicle_name)
 
     def confirmConnection(self):
         """
@@ -230,11 +577,7 @@ class VehicleClient:
         # todo: in future remove below, it's only for compatibility to pre v1.2
         camera_name = str(camera_name)
 
-        # because this method returns std::vector<uint8>, msgpack decides to encode it as a string unfortunately.
-        result = self.client.call('simGetImage', camera_name, image_type, vehicle_name)
-        if (result == "" or result == "\0"):
-            return None
-        return result
+        return self._call_decoded('simGetImage', camera_name, image_type, vehicle_name)
 
     # camera control
     # simGetImage returns compressed png in array of bytes
@@ -252,8 +595,32 @@ class VehicleClient:
         Returns:
             list[ImageResponse]:
         """
-        responses_raw = self.client.call('simGetImages', requests, vehicle_name)
-        return [ImageResponse.from_msgpack(response_raw) for response_raw in responses_raw]
+        return self._call_decoded('simGetImages', requests, vehicle_name)
+
+    def stream_images(self, requests, vehicle_name = '', rate_hz = None, prefetch = 2, max_frames = None):
+        """
+        Get images continuously, keeping the next `simGetImages` calls in flight while the current frame is processed
+
+        Example:
+            stream = client.stream_images([airsim.ImageRequest("0", airsim.ImageType.Scene, False, False)], rate_hz = 20)
+            for frame in stream:
+                image = frame[0].as_array()
+                ...
+            print(stream.fps, stream.dropped_ticks)
+
+        Other APIs can be called on the client while iterating, the prefetched responses wait on the connection.
+
+        Args:
+            requests (list[ImageRequest]): Images required for each frame
+            vehicle_name (str, optional): Name of vehicle associated with the camera
+            rate_hz (float, optional): Requests per second, as fast as the frames are consumed if None
+            prefetch (int, optional): Number of requests kept in flight
+            max_frames (int, optional): Stop after this many frames, endless if None
+
+        Returns:
+            ImageStream: Iterator of `ImageFrame`, each a timestamped list of ImageResponse
+        """
+        return ImageStream(self.client, requests, vehicle_name, rate_hz, prefetch, max_frames)
 
     # gets the static meshes in the unreal scene
     def simGetMeshPositionVertexBuffers(self):
@@ -265,8 +632,7 @@ class VehicleClient:
         Returns:
             list[MeshPositionVertexBuffersResponse]:
         """
-        responses_raw = self.client.call('simGetMeshPositionVertexBuffers')
-        return [MeshPositionVertexBuffersResponse.from_msgpack(response_raw) for response_raw in responses_raw]
+        return self._call_decoded('simGetMeshPositionVertexBuffers')
 
     def simGetCollisionInfo(self, vehicle_name = ''):
         """
@@ -276,7 +642,7 @@ class VehicleClient:
         Returns:
             CollisionInfo:
         """
-        return CollisionInfo.from_msgpack(self.client.call('simGetCollisionInfo', vehicle_name))
+        return self._call_decoded('simGetCollisionInfo', vehicle_name)
 
     def simSetVehiclePose(self, pose, ignore_collison, vehicle_name = ''):
         """
@@ -299,8 +665,7 @@ class VehicleClient:
         Returns:
             Pose:
         """
-        pose = self.client.call('simGetVehiclePose', vehicle_name)
-        return Pose.from_msgpack(pose)
+        return self._call_decoded('simGetVehiclePose', vehicle_name)
 
     def simSetTraceLine(self, color_rgba, thickness=1.0, vehicle_name = ''):
         """
@@ -323,8 +688,7 @@ class VehicleClient:
         Returns:
             Pose:
         """
-        pose = self.client.call('simGetObjectPose', object_name)
-        return Pose.from_msgpack(pose)
+        return self._call_decoded('simGetObjectPose', object_name)
 
     def simSetObjectPose(self, object_name, pose, teleport = True):
         """
@@ -415,7 +779,7 @@ class VehicleClient:
             CameraInfo:
         """
         # TODO: below str() conversion is only needed for legacy reason and should be removed in future
-        return CameraInfo.from_msgpack(self.client.call('simGetCameraInfo', str(camera_name), vehicle_name))
+        return self._call_decoded('simGetCameraInfo', str(camera_name), vehicle_name)
 
     def simSetCameraOrientation(self, camera_name, orientation, vehicle_name = ''):
         """
@@ -451,8 +815,7 @@ class VehicleClient:
         Returns:
             KinematicsState: Ground truth of the vehicle
         """
-        kinematics_state = self.client.call('simGetGroundTruthKinematics', vehicle_name)
-        return KinematicsState.from_msgpack(kinematics_state)
+        return self._call_decoded('simGetGroundTruthKinematics', vehicle_name)
     simGetGroundTruthKinematics.__annotations__ = {'return': KinematicsState}
 
     def simGetGroundTruthEnvironment(self, vehicle_name = ''):
@@ -465,8 +828,7 @@ class VehicleClient:
         Returns:
             EnvironmentState: Ground truth environment state
         """
-        env_state = self.client.call('simGetGroundTruthEnvironment', vehicle_name)
-        return EnvironmentState.from_msgpack(env_state)
+        return self._call_decoded('simGetGroundTruthEnvironment', vehicle_name)
     simGetGroundTruthEnvironment.__annotations__ = {'return': EnvironmentState}
 
     # sensor APIs
@@ -479,7 +841,7 @@ class VehicleClient:
         Returns:
             ImuData:
         """
-        return ImuData.from_msgpack(self.client.call('getImuData', imu_name, vehicle_name))
+        return self._call_decoded('getImuData', imu_name, vehicle_name)
 
     def getBarometerData(self, barometer_name = '', vehicle_name = ''):
         """
@@ -490,7 +852,7 @@ class VehicleClient:
         Returns:
             BarometerData:
         """
-        return BarometerData.from_msgpack(self.client.call('getBarometerData', barometer_name, vehicle_name))
+        return self._call_decoded('getBarometerData', barometer_name, vehicle_name)
 
     def getMagnetometerData(self, magnetometer_name = '', vehicle_name = ''):
         """
@@ -501,7 +863,7 @@ class VehicleClient:
         Returns:
             MagnetometerData:
         """
-        return MagnetometerData.from_msgpack(self.client.call('getMagnetometerData', magnetometer_name, vehicle_name))
+        return self._call_decoded('getMagnetometerData', magnetometer_name, vehicle_name)
 
     def getGpsData(self, gps_name = '', vehicle_name = ''):
         """
@@ -512,7 +874,7 @@ class VehicleClient:
         Returns:
             GpsData:
         """
-        return GpsData.from_msgpack(self.client.call('getGpsData', gps_name, vehicle_name))
+        return self._call_decoded('getGpsData', gps_name, vehicle_name)
 
     def getDistanceSensorData(self, distance_sensor_name = '', vehicle_name = ''):
         """
@@ -523,7 +885,7 @@ class VehicleClient:
         Returns:
             DistanceSensorData:
         """
-        return DistanceSensorData.from_msgpack(self.client.call('getDistanceSensorData', distance_sensor_name, vehicle_name))
+        return self._call_decoded('getDistanceSensorData', distance_sensor_name, vehicle_name)
 
     def getLidarData(self, lidar_name = '', vehicle_name = ''):
         """
@@ -534,7 +896,7 @@ class VehicleClient:
         Returns:
             LidarData:
         """
-        return LidarData.from_msgpack(self.client.call('getLidarData', lidar_name, vehicle_name))
+        return self._call_decoded('getLidarData', lidar_name, vehicle_name)
 
     def simGetLidarSegmentation(self, lidar_name = '', vehicle_name = ''):
         """
@@ -549,6 +911,25 @@ class VehicleClient:
         """
         return self.client.call('simGetLidarSegmentation', lidar_name, vehicle_name)
 
+    def getLidarScan(self, lidar_name = '', vehicle_name = '', segmentation = True):
+        """
+        Point cloud and per-point segmentation IDs of the last Lidar update as numpy arrays
+
+        `getLidarData` and `simGetLidarSegmentation` are sent back-to-back on the same connection, so both cost one round trip.
+
+        Args:
+            lidar_name (str, optional): Name of Lidar to get data from, specified in settings.json
+            vehicle_name (str, optional): Name of vehicle to which the sensor corresponds to
+            segmentation (bool, optional): Whether to also get the segmentation IDs
+
+        Returns:
+            LidarScan:
+        """
+        data_future = self.client.call_async('getLidarData', lidar_name, vehicle_name)
+        segmentation_future = self.client.call_async('simGetLidarSegmentation', lidar_name, vehicle_name) if segmentation else None
+        lidar_data = LidarData.from_msgpack(data_future.get())
+        return LidarScan.from_lidar_data(lidar_data, segmentation_future.get() if segmentation else None)
+
     #  Plotting APIs
     def simFlushPersistentMarkers(self):
         """
@@ -677,8 +1058,8 @@ class VehicleClient:
 
 # -----------------------------------  Multirotor APIs ---------------------------------------------
 class MultirotorClient(VehicleClient, object):
-    def __init__(self, ip = "", port = 41451, timeout_value = 3600):
-        super(MultirotorClient, self).__init__(ip, port, timeout_value)
+    def __init__(self, ip = "", port = 41451, timeout_value = 3600, pool_size = 1):
+        super(MultirotorClient, self).__init__(ip, port, timeout_value, pool_size)
 
     def takeoffAsync(self, timeout_sec = 20, vehicle_name = ''):
         """
@@ -1085,14 +1466,14 @@ class MultirotorClient(VehicleClient, object):
         Returns:
             MultirotorState:
         """
-        return MultirotorState.from_msgpack(self.client.call('getMultirotorState', vehicle_name))
+        return self._call_decoded('getMultirotorState', vehicle_name)
     getMultirotorState.__annotations__ = {'return': MultirotorState}
 
 
 # -----------------------------------  Car APIs ---------------------------------------------
 class CarClient(VehicleClient, object):
-    def __init__(self, ip = "", port = 41451, timeout_value = 3600):
-        super(CarClient, self).__init__(ip, port, timeout_value)
+    def __init__(self, ip = "", port = 41451, timeout_value = 3600, pool_size = 1):
+        super(CarClient, self).__init__(ip, port, timeout_value, pool_size)
 
     def setCarControls(self, controls, vehicle_name = ''):
         """
@@ -1112,8 +1493,7 @@ class CarClient(VehicleClient, object):
         Returns:
             CarState:
         """
-        state_raw = self.client.call('getCarState', vehicle_name)
-        return CarState.from_msgpack(state_raw)
+        return self._call_decoded('getCarState', vehicle_name)
 
     def getCarControls(self, vehicle_name=''):
         """
@@ -1123,5 +1503,4 @@ class CarClient(VehicleClient, object):
         Returns:
             CarControls:
         """
-        controls_raw = self.client.call('getCarControls', vehicle_name)
-        return CarControls.from_msgpack(controls_raw)
+        return self._call_decoded('getCarControls', vehicle_name)
@@ -0,0 +1,427 @@
+import numpy as np
+
+import os
+import re
+import ast
+import json
+import time
+
+from .types import ImageResponse, KinematicsState, MultirotorState, CarState, Pose, CollisionInfo
+from .telemetry import STATE_DTYPE, state_row
+from .decode import decode_image
+
+# quaternions are stored (x, y, z, w) like Quaternionr.to_numpy_array()
+POSE_DTYPE = np.dtype([('position', np.float64, (3,)), ('orientation', np.float32, (4,))])
+COLLISION_DTYPE = np.dtype([('has_collided', np.bool_),
+                            ('normal', np.float32, (3,)),
+                            ('impact_point', np.float64, (3,)),
+                            ('position', np.float64, (3,)),
+                            ('penetration_depth', np.float32),
+                            ('time_stamp', np.uint64),
+                            ('object_id', np.int32)])
+
+_META_FILE = 'meta.json'
+_EPISODE_NAME = re.compile(r'^episode_(\d+)(\.h5)?$')
+
+def _vector(v):
+    return (v.x_val, v.y_val, v.z_val)
+
+def frame_value(value):
+    """
+    Array stored for a value passed to `EpisodeWriter.append`, with the timestamp it carries
+
+    Images become their pixels, compressed images are decoded, see `decode_image`. States become a `STATE_DTYPE` record,
+    poses a `POSE_DTYPE` record and collisions a `COLLISION_DTYPE` record. Anything else is converted with np.asarray.
+
+    Returns:
+        tuple: (numpy.ndarray, timestamp in nanoseconds or None)
+    """
+    if isinstance(value, ImageResponse):
+        if value.pixels_as_float:
+            pixels = value.depth_array()
+        elif value.compress:
+            pixels = decode_image(value.image_data_uint8)
+        else:
+            pixels = value.as_array()
+        return pixels, int(value.time_stamp)
+    if isinstance(value, (MultirotorState, CarState, KinematicsState)):
+        row = state_row(value)
+        return np.array(row, STATE_DTYPE), (row[0] or None)
+    if isinstance(value, Pose):
+        o = value.orientation
+        return np.array((_vector(value.position), (o.x_val, o.y_val, o.z_val, o.w_val)), POSE_DTYPE), None
+    if isinstance(value, CollisionInfo):
+        row = (value.has_collided, _vector(value.normal), _vector(value.impact_point), _vector(value.position),
+               value.penetration_depth, int(value.time_stamp), value.object_id)
+        return np.array(row, COLLISION_DTYPE), None
+    return np.asarray(value), None
+
+
+class _NpyChunks:
+    # one directory per column holding a .npy (or compressed .npz) file per chunk, each written to a temporary file
+    # and renamed, so a crash leaves every chunk either complete or absent
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self.extension = '.npz' if meta['compression'] else '.npy'
+
+    @staticmethod
+    def create(path, meta):
+        os.makedirs(path, exist_ok = True)
+        for name in meta['columns']:
+            os.makedirs(os.path.join(path, name), exist_ok = True)
+        _replace_file(os.path.join(path, _META_FILE), json.dumps(meta, indent = 2).encode('utf-8'))
+        return _NpyChunks(path, meta)
+
+    @staticmethod
+    def open(path):
+        with open(os.path.join(path, _META_FILE), 'rb') as f:
+            return _NpyChunks(path, json.loads(f.read().decode('utf-8')))
+
+    def _chunk_file(self, name, index):
+        return os.path.join(self.path, name, '%06d%s' % (index, self.extension))
+
+    def write_chunk(self, name, index, rows):
+        filename = self._chunk_file(name, index)
+        with open(filename + '.tmp', 'wb') as f:
+            if self.meta['compression']:
+                np.savez_compressed(f, rows = rows)
+            else:
+                np.save(f, rows)
+        os.replace(filename + '.tmp', filename)
+
+    def read_chunk(self, name, index):
+        if self.meta['compression']:
+            with np.load(self._chunk_file(name, index)) as chunk:
+                return chunk['rows']
+        return np.load(self._chunk_file(name, index), mmap_mode = 'r')
+
+    def length(self, name):
+        chunks = sorted(f for f in os.listdir(os.path.join(self.path, name)) if f.endswith(self.extension))
+        if not chunks:
+            return 0
+        return (len(chunks) - 1) * self.meta['chunk_size'] + len(self.read_chunk(name, len(chunks) - 1))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class _Hdf5Chunks:
+    # one resizable chunked dataset per column in a single file, the frame count is updated on every flush
+    def __init__(self, file, meta):
+        self.file = file
+        self.meta = meta
+
+    @staticmethod
+    def create(path, meta):
+        import h5py # optional, pip install h5py
+        compression = meta['compression']
+        if compression is True:
+            compression = 'gzip'
+        file = h5py.File(path, 'w')
+        file.attrs['meta'] = json.dumps(meta)
+        file.attrs['frames'] = 0
+        for name, column in meta['columns'].items():
+            shape = tuple(column['shape'])
+            file.create_dataset(name, (0,) + shape, _dtype(column['descr']),
+                                maxshape = (None,) + shape, chunks = (meta['chunk_size'],) + shape, compression = compression or None)
+        return _Hdf5Chunks(file, meta)
+
+    @staticmethod
+    def open(path):
+        import h5py
+        file = h5py.File(path, 'r')
+        return _Hdf5Chunks(file, json.loads(file.attrs['meta']))
+
+    def write_chunk(self, name, index, rows):
+        dataset = self.file[name]
+        start = index * self.meta['chunk_size']
+        if dataset.shape[0] < start + len(rows):
+            dataset.resize(start + len(rows), axis = 0)
+        dataset[start:start + len(rows)] = rows
+
+    def read_chunk(self, name, index):
+        start = index * self.meta['chunk_size']
+        return self.file[name][start:start + self.meta['chunk_size']]
+
+    def length(self, name):
+        return min(self.file[name].shape[0], int(self.file.attrs['frames']))
+
+    def flush(self):
+        self.file.attrs['frames'] = min(self.file[name].shape[0] for name in self.meta['columns'])
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def _replace_file(filename, data):
+    with open(filename + '.tmp', 'wb') as f:
+        f.write(data)
+    os.replace(filename + '.tmp', filename)
+
+def _dtype(descr):
+    # dtypes are kept in the meta data as the repr of their description, like in .npy headers
+    return np.lib.format.descr_to_dtype(ast.literal_eval(descr))
+
+
+class EpisodeWriter:
+    """
+    Append-only writer of one episode, frames are buffered and written a chunk at a time
+
+    Every `append` adds one row to each column. The columns and their shapes are fixed by the first frame. A chunk is
+    written when it holds `chunk_size` frames, and `flush` writes the partial chunk of the frames appended since.
+    With the default 'npy' backend chunks are written to a temporary file and renamed, so after a crash an episode
+    holds every frame up to the last full chunk or flush. The 'hdf5' backend stores the episode in one file and needs h5py.
+
+    Example:
+        with airsim.Dataset('captures').new_episode() as episode:
+            for _ in range(1000):
+                responses = client.simGetImages([airsim.ImageRequest("0", airsim.ImageType.Scene, False, False)])
+                episode.append(scene = responses[0], state = client.getCarState(), collision = client.simGetCollisionInfo())
+
+    Args:
+        path (str): Directory of the episode for the 'npy' backend, file for 'hdf5'
+        chunk_size (int, optional): Frames per chunk
+        compression (bool or str, optional): Compress the chunks, np.savez_compressed for 'npy', gzip or the given
+            h5py filter such as 'lzf' for 'hdf5'
+        backend (str, optional): 'npy' or 'hdf5'
+    """
+    def __init__(self, path, chunk_size = 256, compression = None, backend = 'npy'):
+        if backend not in ('npy', 'hdf5'):
+            raise ValueError("backend must be 'npy' or 'hdf5', got %r" % backend)
+        if os.path.exists(path):
+            raise ValueError('%s already exists, episodes are append-only' % path)
+        self.path = path
+        self.chunk_size = int(chunk_size)
+        self.compression = compression
+        self.backend = backend
+        self.frames = 0
+        self._store = None
+        self._buffers = None
+        self._chunk_start = 0
+
+    def __len__(self):
+        return self.frames
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _create(self, values):
+        columns = dict((name, {'descr': repr(np.lib.format.dtype_to_descr(value.dtype)), 'shape': list(value.shape)})
+                       for name, value in values.items())
+        meta = {'version': 1, 'chunk_size': self.chunk_size, 'compression': self.compression, 'columns': columns}
+        store = _Hdf5Chunks if self.backend == 'hdf5' else _NpyChunks
+        self._store = store.create(self.path, meta)
+        self._buffers = dict((name, np.empty((self.chunk_size,) + value.shape, value.dtype)) for name, value in values.items())
+
+    def append(self, timestamp = None, **columns):
+        """
+        Append one frame
+
+        Args:
+            timestamp (int, optional): Time of the frame in nanoseconds, by default the timestamp of the first column
+                which has one, e.g. a state or image, else the current time
+            **columns: Value of each column, e.g. ImageResponse, MultirotorState, CarState, Pose, CollisionInfo or arrays
+        """
+        values = {}
+        for name, value in columns.items():
+            values[name], value_timestamp = frame_value(value)
+            if timestamp is None and value_timestamp:
+                timestamp = value_timestamp
+        values['timestamp'] = np.array(timestamp if timestamp is not None else int(time.time() * 1e9), np.uint64)
+
+        if self._store is None:
+            self._create(values)
+        if set(values) != set(self._buffers):
+            raise ValueError('Frame has columns %s, the episode has %s' % (sorted(values), sorted(self._buffers)))
+        row = self.frames - self._chunk_start
+        for name, value in values.items():
+            buffer = self._buffers[name]
+            if value.shape != buffer.shape[1:]:
+                raise ValueError('Column %s has shape %s, the episode has %s' % (name, value.shape, buffer.shape[1:]))
+            buffer[row] = value
+        self.frames += 1
+        if self.frames - self._chunk_start == self.chunk_size:
+            self._write_chunk()
+            self._chunk_start = self.frames
+
+    def _write_chunk(self):
+        rows = self.frames - self._chunk_start
+        if self._store is None or rows == 0:
+            return
+        index = self._chunk_start // self.chunk_size
+        for name, buffer in self._buffers.items():
+            self._store.write_chunk(name, index, buffer[:rows])
+        self._store.flush()
+
+    def flush(self):
+        """
+        Write the frames of the partial chunk, the chunk is rewritten when more frames are appended
+        """
+        self._write_chunk()
+
+    def close(self):
+        self.flush()
+        if self._store is not None:
+            self._store.close()
+
+
+class Episode:
+    """
+    Reader of an episode written by `EpisodeWriter`
+
+    Chunks are read when needed, uncompressed 'npy' chunks are memory mapped. The frame count is that of the shortest
+    column, which skips a frame written to some columns only before a crash.
+
+    Example:
+        episode = airsim.Episode('captures/episode_00000')
+        frame = episode[100]   # dict of column values
+        for chunk in episode.chunks(columns = ['scene', 'state']):
+            train(chunk['scene'], chunk['state']['linear_velocity'])
+
+    Args:
+        path (str): Directory of a 'npy' episode or file of a 'hdf5' episode
+    """
+    def __init__(self, path):
+        self.path = path
+        self._store = _Hdf5Chunks.open(path) if os.path.isfile(path) else _NpyChunks.open(path)
+        meta = self._store.meta
+        self.chunk_size = meta['chunk_size']
+        self.columns = dict((name, (_dtype(column['descr']), tuple(column['shape'])))
+                            for name, column in meta['columns'].items())
+        self._length = min(self._store.length(name) for name in self.columns)
+        self._cached = {}
+
+    def __len__(self):
+        return self._length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._cached = {}
+        self._store.close()
+
+    def _chunk(self, name, index):
+        cached = self._cached.get(name)
+        if cached is None or cached[0] != index:
+            cached = self._cached[name] = (index, self._store.read_chunk(name, index))
+        return cached[1]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('frame %d of an episode with %d frames' % (index, self._length))
+        chunk, row = divmod(index, self.chunk_size)
+        return dict((name, self._chunk(name, chunk)[row]) for name in self.columns)
+
+    def chunks(self, start = 0, stop = None, columns = None):
+        """
+        Stream frames chunk by chunk
+
+        Args:
+            start (int, optional): First frame
+            stop (int, optional): Frame after the last one, the end of the episode if None
+            columns (list[str], optional): Columns to read, all if None
+
+        Returns:
+            generator: dict of arrays per chunk, each with the rows of up to `chunk_size` frames
+        """
+        stop = self._length if stop is None else min(stop, self._length)
+        columns = list(self.columns) if columns is None else columns
+        while start < stop:
+            index, row = divmod(start, self.chunk_size)
+            rows = min(self.chunk_size - row, stop - start)
+            yield dict((name, self._store.read_chunk(name, index)[row:row + rows]) for name in columns)
+            start += rows
+
+    def column(self, name, start = 0, stop = None):
+        """
+        Returns:
+            numpy.ndarray: Rows of one column for frames start to stop
+        """
+        parts = [chunk[name] for chunk in self.chunks(start, stop, [name])]
+        return np.concatenate(parts) if parts else np.empty((0,) + self.columns[name][1], self.columns[name][0])
+
+    def index_range(self, start_time = None, end_time = None):
+        """
+        Frames with start_time <= timestamp < end_time, assuming frames were appended in time order
+
+        Returns:
+            tuple: (start, stop) frame indices
+        """
+        timestamps = self.column('timestamp')
+        start = 0 if start_time is None else int(np.searchsorted(timestamps, start_time, 'left'))
+        stop = len(timestamps) if end_time is None else int(np.searchsorted(timestamps, end_time, 'left'))
+        return start, max(start, stop)
+
+    def time_range(self, start_time = None, end_time = None, columns = None):
+        """
+        Stream the frames of a time range chunk by chunk, see `chunks` and `index_range`
+        """
+        start, stop = self.index_range(start_time, end_time)
+        return self.chunks(start, stop, columns)
+
+
+class Dataset:
+    """
+    Directory of episodes, each written by an `EpisodeWriter` and read as an `Episode`
+
+    Args:
+        path (str): Directory of the dataset, created when needed
+    """
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok = True)
+
+    @property
+    def episodes(self):
+        """
+        list[str]: Names of the episodes in order
+        """
+        names = [name for name in os.listdir(self.path) if _EPISODE_NAME.match(name)]
+        return sorted(names, key = lambda name: int(_EPISODE_NAME.match(name).group(1)))
+
+    def new_episode(self, chunk_size = 256, compression = None, backend = 'npy'):
+        """
+        Start the next episode, see `EpisodeWriter` for the arguments
+
+        Returns:
+            EpisodeWriter:
+        """
+        episodes = self.episodes
+        number = int(_EPISODE_NAME.match(episodes[-1]).group(1)) + 1 if episodes else 0
+        name = 'episode_%05d%s' % (number, '.h5' if backend == 'hdf5' else '')
+        return EpisodeWriter(os.path.join(self.path, name), chunk_size, compression, backend)
+
+    def episode(self, key):
+        """
+        Args:
+            key (int or str): Index in `episodes` or name of the episode
+
+        Returns:
+            Episode:
+        """
+        name = self.episodes[key] if isinstance(key, int) else key
+        return Episode(os.path.join(self.path, name))
+
+    def stream(self, start_time = None, end_time = None, columns = None):
+        """
+        Stream the frames of all episodes in a time range, episode by episode and chunk by chunk
+
+        Returns:
+            generator: (episode name, dict of arrays) per chunk
+        """
+        for name in self.episodes:
+            with self.episode(name) as episode:
+                for chunk in episode.time_range(start_time, end_time, columns):
+                    yield name, chunk
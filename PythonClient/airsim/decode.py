@@ -0,0 +1,146 @@
+import numpy as np
+
+import time
+import concurrent.futures
+from io import BytesIO
+
+from .instrumentation import Histogram, TIME_BUCKETS
+from .utils import _read_pfm_header
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def _decode_png(data):
+    import cv2 # optional, pip install opencv-python
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED)
+    if image is None:
+        raise ValueError('cv2 could not decode the %d byte image' % len(data))
+    return image
+
+def _decode_pfm(data):
+    # AirSim writes the top row first, like utils.write_pfm, so the rows are not flipped
+    info = _read_pfm_header(BytesIO(bytes(data[:64])))
+    return np.frombuffer(data, info.dtype, int(np.prod(info.shape)), info.offset).reshape(info.shape)
+
+def decode_image(data):
+    """
+    Decode compressed image bytes, PNG with cv2 or PFM
+
+    Args:
+        data (bytes): `image_data_uint8` of a compressed response
+
+    Returns:
+        numpy.ndarray: BGR(A) or single channel pixels for PNG, float32 (H, W) or (H, W, 3) for PFM
+    """
+    if data[:3] in (b'Pf\n', b'PF\n'):
+        return _decode_pfm(data)
+    if data[:8] == _PNG_SIGNATURE:
+        return _decode_png(data)
+    raise ValueError('Unknown image format, expected PNG or PFM data')
+
+class DecodePool:
+    """
+    Decodes the images of `simGetImages` responses in parallel into buffers reused from frame to frame
+
+    cv2 releases the GIL while decoding, so a thread pool decodes the PNGs of several cameras at once. Each image ends up
+    in a buffer kept per camera and image type, so the results don't need new memory after the first frame. Compressed
+    PNG and PFM data, float images and uncompressed images are all handled, the latter two only need a conversion.
+
+    Example:
+        pool = airsim.DecodePool(workers = 4)
+        requests = [airsim.ImageRequest(str(camera), airsim.ImageType.Scene) for camera in range(4)]
+        images = pool.decode(client.simGetImages(requests), requests)
+        scene0 = images[('0', airsim.ImageType.Scene)]
+        print(pool.last_frame_time)
+
+    The returned arrays are overwritten by the next `decode` of the same camera, copy them to keep them longer.
+
+    Args:
+        workers (int, optional): Number of decoding threads or processes
+        processes (bool, optional): Decode in a process pool instead, only useful for decoders which hold the GIL.
+            Decoded images are copied back from the worker processes.
+    """
+    def __init__(self, workers = 4, processes = False):
+        executor = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+        self._executor = executor(workers)
+        self._processes = processes
+        self._buffers = {}
+        self.frame_times = Histogram(TIME_BUCKETS)
+        self.last_frame_time = 0.0
+        self.last_image_times = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown()
+
+    def _buffer(self, key, shape, dtype):
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self._buffers[key] = np.empty(shape, dtype)
+        return buffer
+
+    def _decode_into(self, key, response, decoded = None):
+        # decoded is the future of a decode running in a worker process
+        start = time.perf_counter()
+        if response.pixels_as_float:
+            depth = response.depth_array()
+            buffer = self._buffer(key, depth.shape, depth.dtype)
+            np.copyto(buffer, depth)
+        elif response.compress:
+            image = decode_image(response.image_data_uint8) if decoded is None else decoded.result()
+            buffer = self._buffer(key, image.shape, image.dtype)
+            np.copyto(buffer, image)
+        else:
+            buffer = response.as_array()
+        return buffer, time.perf_counter() - start
+
+    def decode(self, responses, requests = None):
+        """
+        Decode all images of a frame in parallel
+
+        Args:
+            responses (list[ImageResponse]): Result of `simGetImages`
+            requests (list[ImageRequest], optional): The requests of the responses, used to key the results by
+                (camera_name, image_type), which must be unique. Without them results are keyed by index.
+
+        Returns:
+            dict: Pixels of each response, BGR(A) uint8 for Scene, Segmentation and other PNGs and for uncompressed
+            images, float32 (H, W) for float images
+        """
+        start = time.perf_counter()
+        if requests is not None:
+            if len(requests) != len(responses):
+                raise ValueError('%d requests for %d responses' % (len(requests), len(responses)))
+            keys = [(str(request.camera_name), request.image_type) for request in requests]
+            if len(set(keys)) != len(keys):
+                # the images would be decoded into the same buffer at the same time
+                raise ValueError('Each (camera_name, image_type) can be requested once per frame, got %s' % keys)
+        else:
+            keys = list(range(len(responses)))
+
+        if self._processes:
+            # only compressed bytes are sent to the worker processes, the other images are converted here
+            decoded = [self._executor.submit(decode_image, response.image_data_uint8)
+                       if response.compress and not response.pixels_as_float else None for response in responses]
+            results = [self._decode_into(key, response, future) for key, response, future in zip(keys, responses, decoded)]
+        else:
+            futures = [self._executor.submit(self._decode_into, key, response) for key, response in zip(keys, responses)]
+            results = [future.result() for future in futures]
+
+        self.last_image_times = dict((key, duration) for key, (_, duration) in zip(keys, results))
+        self.last_frame_time = time.perf_counter() - start
+        self.frame_times.observe(self.last_frame_time)
+        return dict((key, buffer) for key, (buffer, _) in zip(keys, results))
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of frames decoded and the mean, p50 and p99 seconds per frame
+        """
+        count = self.frame_times.count
+        return {'frames': count, 'mean': self.frame_times.sum / count if count else 0.0,
+                'p50': self.frame_times.percentile(50), 'p99': self.frame_times.percentile(99)}
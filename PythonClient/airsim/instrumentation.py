@@ -0,0 +1,149 @@
+import bisect
+import threading
+
+class RpcCallRecord:
+    """
+    Measurements of one RPC, passed to the observer set with `VehicleClient.set_rpc_observer`
+
+    Attributes:
+        method (str): RPC method name
+        vehicle_name (str): Vehicle the call was for, None for calls not bound to a vehicle
+        bytes_sent (int): Size of the msgpack request
+        bytes_received (int): Size of the msgpack result
+        serialize_time (float): Seconds spent packing the request
+        wire_time (float): Seconds from sending the request to receiving the unpacked result
+        deserialize_time (float): Seconds spent decoding the result into its API type, e.g. `MultirotorState`
+        error (Exception): Exception raised by the call, None if it succeeded
+    """
+    __slots__ = ('method', 'vehicle_name', 'bytes_sent', 'bytes_received', 'serialize_time', 'wire_time', 'deserialize_time', 'error')
+
+    def __init__(self, method, vehicle_name, bytes_sent = 0, bytes_received = 0, serialize_time = 0.0, wire_time = 0.0,
+                 deserialize_time = 0.0, error = None):
+        self.method = method
+        self.vehicle_name = vehicle_name
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.serialize_time = serialize_time
+        self.wire_time = wire_time
+        self.deserialize_time = deserialize_time
+        self.error = error
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram, `counts[i]` holds the observations <= `bounds[i]` and above the previous bound, the last count holds the rest
+    """
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def percentile(self, q):
+        """
+        Upper bound of the bucket containing the q-th percentile (0-100), inf if it lies beyond the last bound
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def to_dict(self):
+        return {'bounds': list(self.bounds), 'counts': list(self.counts), 'sum': self.sum, 'count': self.count,
+                'p50': self.percentile(50), 'p99': self.percentile(99)}
+
+
+TIME_BUCKETS = [1e-5 * 2 ** i for i in range(21)]            # 10 us to ~10 s
+SIZE_BUCKETS = [64 * 4 ** i for i in range(13)]              # 64 B to 1 GB
+
+class RpcStats:
+    """
+    RPC observer keeping in-process histograms per method and vehicle
+
+    Example:
+        stats = RpcStats()
+        client.set_rpc_observer(stats)
+        ...
+        print(stats.to_prometheus())
+
+    Tracks call and error counts, request and response sizes and serialize, wire and deserialize times.
+    Safe to share between threads and clients.
+    """
+    _histograms = ('bytes_sent', 'bytes_received', 'serialize_time', 'wire_time', 'deserialize_time')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def on_rpc(self, record):
+        key = (record.method, record.vehicle_name)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'calls': 0, 'errors': 0, 'last_error': None,
+                                              'bytes_sent': Histogram(SIZE_BUCKETS), 'bytes_received': Histogram(SIZE_BUCKETS),
+                                              'serialize_time': Histogram(TIME_BUCKETS), 'wire_time': Histogram(TIME_BUCKETS),
+                                              'deserialize_time': Histogram(TIME_BUCKETS)}
+            series['calls'] += 1
+            if record.error is not None:
+                series['errors'] += 1
+                series['last_error'] = repr(record.error)
+            for name in RpcStats._histograms:
+                series[name].observe(getattr(record, name))
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: {method: {vehicle_name: {'calls', 'errors', 'last_error', 'bytes_sent', ...}}} with histograms as dicts
+        """
+        result = {}
+        with self._lock:
+            for (method, vehicle_name), series in self._series.items():
+                result.setdefault(method, {})[vehicle_name] = {name: (value.to_dict() if isinstance(value, Histogram) else value)
+                                                               for name, value in series.items()}
+        return result
+
+    def to_prometheus(self, prefix = 'airsim_rpc'):
+        """
+        Returns:
+            str: Metrics in the Prometheus text exposition format
+        """
+        def labels(method, vehicle_name, extra = ''):
+            vehicle = '' if vehicle_name is None else vehicle_name.replace('\\', '\\\\').replace('"', '\\"')
+            return '{method="%s",vehicle="%s"%s}' % (method, vehicle, extra)
+
+        with self._lock:
+            series = sorted(self._series.items(), key = lambda item: (item[0][0], item[0][1] or ''))
+            lines = []
+            for counter in ('calls', 'errors'):
+                name = '%s_%s_total' % (prefix, counter)
+                lines.append('# TYPE %s counter' % name)
+                for (method, vehicle_name), values in series:
+                    lines.append('%s%s %d' % (name, labels(method, vehicle_name), values[counter]))
+            for histogram in RpcStats._histograms:
+                name = '%s_%s' % (prefix, histogram.replace('_time', '_seconds'))
+                lines.append('# TYPE %s histogram' % name)
+                for (method, vehicle_name), values in series:
+                    h = values[histogram]
+                    cumulative = 0
+                    for bound, count in zip(h.bounds, h.counts):
+                        cumulative += count
+                        lines.append('%s_bucket%s %d' % (name, labels(method, vehicle_name, ',le="%g"' % bound), cumulative))
+                    lines.append('%s_bucket%s %d' % (name, labels(method, vehicle_name, ',le="+Inf"'), h.count))
+                    lines.append('%s_sum%s %r' % (name, labels(method, vehicle_name), h.sum))
+                    lines.append('%s_count%s %d' % (name, labels(method, vehicle_name), h.count))
+        return '\n'.join(lines) + '\n'
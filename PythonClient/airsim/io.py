@@ -0,0 +1,286 @@
+import numpy as np
+
+import os
+import sys
+import queue
+import threading
+import concurrent.futures
+from io import BytesIO
+
+from .types import ImageResponse
+from .utils import encode_png
+
+_POLICIES = ('block', 'drop', 'drop_oldest')
+
+def _encode_pfm(image):
+    # same layout as utils.write_pfm
+    image = np.asarray(image, np.float32)
+    if image.ndim == 3 and image.shape[2] == 3:
+        header = 'PF\n'
+    elif image.ndim == 2 or image.ndim == 3 and image.shape[2] == 1:
+        header = 'Pf\n'
+    else:
+        raise ValueError('Image must have H x W x 3, H x W x 1 or H x W dimensions, got %s' % (image.shape,))
+    scale = -1 if image.dtype.byteorder == '<' or image.dtype.byteorder == '=' and sys.byteorder == 'little' else 1
+    header += '%d %d\n%f\n' % (image.shape[1], image.shape[0], scale)
+    return header.encode('utf-8') + image.tobytes()
+
+def _encode_jpeg(image, quality):
+    import cv2 # optional, only needed for .jpg
+    if image.ndim == 3 and image.shape[2] >= 3:
+        image = image[..., 2::-1]   # RGB(A) to cv2's BGR, alpha is dropped
+    ok, encoded = cv2.imencode('.jpg', np.ascontiguousarray(image), [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError('cv2 failed to encode a %s image as JPEG' % (image.shape,))
+    return encoded.tobytes()
+
+def encode_frame(extension, image, png_compression_level = 3, jpeg_quality = 95):
+    """
+    Encode an image array for the given file extension
+
+    Args:
+        extension (str): '.png', '.jpg', '.jpeg', '.pfm' or '.npy'
+        image (numpy.ndarray): Image to encode, color channels in RGB(A) order
+        png_compression_level (int, optional): zlib level for PNG, see `encode_png`
+        jpeg_quality (int, optional): JPEG quality from 0 to 100, JPEG needs cv2
+
+    Returns:
+        bytes: The file contents
+    """
+    extension = extension.lower()
+    if extension == '.png':
+        return encode_png(image, png_compression_level)
+    if extension in ('.jpg', '.jpeg'):
+        return _encode_jpeg(image, jpeg_quality)
+    if extension == '.pfm':
+        return _encode_pfm(image)
+    if extension == '.npy':
+        buffer = BytesIO()
+        np.save(buffer, image)
+        return buffer.getvalue()
+    raise ValueError("Cannot encode an array as %r, use .png, .jpg, .pfm or .npy" % extension)
+
+def _response_data(response):
+    # bytes as received for compressed images, else an array in the order encode_frame expects
+    if response.pixels_as_float:
+        return response.depth_array()
+    if response.compress:
+        return response.image_data_uint8
+    image = response.as_array()
+    if image.shape[2] >= 3:
+        image = image[..., [2, 1, 0] + list(range(3, image.shape[2]))]  # BGR(A) to RGB(A)
+    return image
+
+def _fsync_paths(paths):
+    for path in paths:
+        fd = os.open(path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+class AsyncFrameWriter:
+    """
+    Writes frames to disk from a pool of worker threads, so disk latency and encoding don't stall the capture loop
+
+    Example:
+        with airsim.io.AsyncFrameWriter(policy = 'drop') as writer:
+            for i in range(1000):
+                responses = client.simGetImages(requests)
+                writer.write('scene_%05d.png' % i, responses[0])
+                writer.write('depth_%05d.pfm' % i, responses[1])
+        print(writer.stats())
+
+    Frames wait in a queue of at most `max_queue` entries. When it is full, the 'block' policy waits for a free entry,
+    'drop' discards the new frame and 'drop_oldest' discards the oldest queued frame to make room. Dropped frames are
+    counted in `stats()`.
+
+    Arrays are encoded by the workers, by file extension, see `encode_frame`. With `processes` set, encoding runs in a
+    process pool instead, which helps when PNG or JPEG encoding of large frames is the bottleneck. Bytes are written as
+    they are, and an `ImageResponse` is written as received if compressed, else encoded like an array.
+
+    Args:
+        workers (int, optional): Number of writer threads
+        max_queue (int, optional): Number of frames that can wait to be written
+        policy (str, optional): 'block', 'drop' or 'drop_oldest', what `write` does when the queue is full
+        processes (int, optional): Size of a process pool for encoding arrays, 0 to encode in the writer threads
+        fsync_every (int, optional): fsync the written files in batches of this many frames, 0 leaves flushing to the OS
+        png_compression_level (int, optional): zlib level used for .png arrays
+        jpeg_quality (int, optional): Quality used for .jpg arrays
+    """
+    def __init__(self, workers = 2, max_queue = 64, policy = 'block', processes = 0, fsync_every = 0,
+                 png_compression_level = 3, jpeg_quality = 95):
+        if policy not in _POLICIES:
+            raise ValueError("policy must be one of %s, got %r" % (_POLICIES, policy))
+        self.policy = policy
+        self.fsync_every = int(fsync_every)
+        self.png_compression_level = png_compression_level
+        self.jpeg_quality = jpeg_quality
+
+        self._queue = queue.Queue(max(int(max_queue), 1))
+        self._lock = threading.Lock()
+        self._unsynced = []
+        self._error = None
+        self._counters = dict(queued = 0, written = 0, dropped = 0, errors = 0, bytes_written = 0, fsyncs = 0, max_queue_depth = 0)
+        self._encoder = concurrent.futures.ProcessPoolExecutor(processes) if processes else None
+        self._closed = False
+        self._workers = [threading.Thread(target = self._run, name = 'AsyncFrameWriter-%d' % i, daemon = True)
+                         for i in range(max(int(workers), 1))]
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def queue_depth(self):
+        """
+        int: Number of frames waiting to be written
+        """
+        return self._queue.qsize()
+
+    @property
+    def dropped(self):
+        """
+        int: Number of frames discarded because the queue was full
+        """
+        return self._counters['dropped']
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counters for queued, written, dropped and failed frames, bytes written, fsync batches, the current and
+            the largest queue depth
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats['queue_depth'] = self._queue.qsize()
+        return stats
+
+    def write(self, filename, data, timeout = None):
+        """
+        Queue a frame to be written
+
+        Args:
+            filename (str): Path of the file, its extension selects the encoding of arrays
+            data (bytes, numpy.ndarray or ImageResponse): Frame to write, arrays must be uint8 or uint16 RGB(A) for PNG,
+                float32 for PFM. A writable array is copied, so the caller may reuse it.
+            timeout (float, optional): Longest wait for a free queue entry with the 'block' policy, forever if None
+
+        Returns:
+            bool: True if the frame was queued, False if it was dropped
+        """
+        if self._closed:
+            raise RuntimeError('AsyncFrameWriter is closed')
+        if isinstance(data, np.ndarray) and data.flags.writeable:
+            data = data.copy()
+        item = (filename, data)
+
+        if self.policy == 'block':
+            try:
+                self._queue.put(item, timeout = timeout)
+            except queue.Full:
+                return self._count_drop()
+        else:
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    if self.policy == 'drop':
+                        return self._count_drop()
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self._count_drop()
+                except queue.Empty:
+                    pass
+
+        depth = self._queue.qsize()
+        with self._lock:
+            self._counters['queued'] += 1
+            self._counters['max_queue_depth'] = max(self._counters['max_queue_depth'], depth)
+        return True
+
+    def _count_drop(self):
+        with self._lock:
+            self._counters['dropped'] += 1
+        return False
+
+    def _encode(self, filename, data):
+        if isinstance(data, ImageResponse):
+            data = _response_data(data)
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return data
+        args = (os.path.splitext(filename)[1], data, self.png_compression_level, self.jpeg_quality)
+        if self._encoder is not None:
+            return self._encoder.submit(encode_frame, *args).result()
+        return encode_frame(*args)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                filename, data = item
+                encoded = self._encode(filename, data)
+                with open(filename, 'wb') as f:
+                    f.write(encoded)
+                self._written(filename, len(encoded))
+            except Exception as error:
+                with self._lock:
+                    self._counters['errors'] += 1
+                    self._error = self._error or error
+            finally:
+                self._queue.task_done()
+
+    def _written(self, filename, size):
+        batch = None
+        with self._lock:
+            self._counters['written'] += 1
+            self._counters['bytes_written'] += size
+            if self.fsync_every > 0:
+                self._unsynced.append(filename)
+                if len(self._unsynced) >= self.fsync_every:
+                    batch, self._unsynced = self._unsynced, []
+                    self._counters['fsyncs'] += 1
+        if batch:
+            _fsync_paths(batch)
+
+    def flush(self):
+        """
+        Wait until all queued frames are written and synced to disk if `fsync_every` is set
+
+        Raises the first error a worker ran into since the last flush, e.g. an unsupported extension or a missing folder.
+        """
+        self._queue.join()
+        with self._lock:
+            batch, self._unsynced = self._unsynced, []
+            error, self._error = self._error, None
+            if batch:
+                self._counters['fsyncs'] += 1
+        if batch:
+            _fsync_paths(batch)
+        if error is not None:
+            raise error
+
+    def close(self):
+        """
+        Write the queued frames and stop the workers, see `flush`
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.flush()
+        finally:
+            for _ in self._workers:
+                self._queue.put(None)
+            for worker in self._workers:
+                worker.join()
+            if self._encoder is not None:
+                self._encoder.shutdown()
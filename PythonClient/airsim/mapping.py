@@ -0,0 +1,213 @@
+import numpy as np
+
+from .types import LidarData, LidarScan
+from .utils import quaternion_to_rotation_matrix_batch
+
+# voxel indices are packed into one int64 key, 21 bits per axis centred on the origin
+_KEY_BITS = 21
+_KEY_OFFSET = 1 << (_KEY_BITS - 1)
+_KEY_MASK = (1 << _KEY_BITS) - 1
+_EMPTY = -1
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+class LidarAccumulator:
+    """
+    Merges successive lidar scans into a voxel grid in world NED coordinates
+
+    Example:
+        accumulator = LidarAccumulator(resolution = 0.2)
+        while mapping:
+            accumulator.add(client.getLidarData())
+        accumulator.save_ply('map.ply')
+
+    Voxels are found through an open addressing hash table probed with numpy for all points of a scan at once, so adding a
+    scan costs time proportional to the scan, not to the map. Each voxel stores the first `max_points_per_voxel` points that
+    fell in it. With `max_voxels` set, the voxels farthest from the latest lidar position are dropped whenever the grid grows
+    beyond it, bounding memory.
+
+    Args:
+        resolution (float, optional): Edge length of a voxel in meters
+        max_points_per_voxel (int, optional): Points kept in each voxel
+        max_voxels (int, optional): Number of voxels to keep, unbounded if None
+        transform (bool, optional): Transform the points with the lidar pose, for lidars using `"DataFrame": "SensorLocalFrame"`.
+            Set to False for lidars reporting points in VehicleInertialFrame.
+    """
+    def __init__(self, resolution = 0.1, max_points_per_voxel = 1, max_voxels = None, transform = True):
+        self.resolution = float(resolution)
+        self.max_points_per_voxel = int(max_points_per_voxel)
+        self.max_voxels = max_voxels
+        self.transform = transform
+        self.clear()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def point_count(self):
+        return int(self._counts[:self._size].sum())
+
+    def clear(self):
+        self.scan_count = 0
+        self._size = 0
+        self._keys = np.zeros(1024, np.int64)
+        self._counts = np.zeros(1024, np.int32)
+        self._points = np.zeros((1024, self.max_points_per_voxel, 3), np.float32)
+        self._table_keys = np.full(4096, _EMPTY, np.int64)
+        self._table_voxels = np.zeros(4096, np.int64)
+        self._origin = np.zeros(3)
+
+    def add(self, scan, pose = None):
+        """
+        Args:
+            scan (LidarData, LidarScan or numpy.ndarray): Scan to merge, an array is taken as (N, 3) points
+            pose (Pose, optional): Lidar pose for an array, LidarData and LidarScan carry their own
+        """
+        if isinstance(scan, LidarData):
+            points, pose = scan.point_array(), scan.pose
+        elif isinstance(scan, LidarScan):
+            points, pose = scan.points, scan.pose
+        else:
+            points = np.asarray(scan, np.float32).reshape(-1, 3)
+
+        if pose is not None:
+            position = pose.position
+            self._origin = np.array([position.x_val, position.y_val, position.z_val])
+            if self.transform:
+                orientation = pose.orientation
+                q = np.array([orientation.x_val, orientation.y_val, orientation.z_val, orientation.w_val], np.float32)
+                points = points @ quaternion_to_rotation_matrix_batch(q).T + self._origin.astype(np.float32)
+        points = np.asarray(points, np.float32)
+
+        cells = np.floor(points / self.resolution).astype(np.int64) + _KEY_OFFSET
+        valid = np.isfinite(points).all(axis = 1) & ((cells >= 0) & (cells <= _KEY_MASK)).all(axis = 1)
+        points, cells = points[valid], cells[valid]
+        self.scan_count += 1
+        if len(points) == 0:
+            return
+
+        keys = (cells[:, 0] << (2 * _KEY_BITS)) | (cells[:, 1] << _KEY_BITS) | cells[:, 2]
+        order = np.argsort(keys, kind = 'stable')
+        keys, points = keys[order], points[order]
+
+        # group the sorted points by voxel, rank is the position of a point within its voxel
+        starts = np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+        group_counts = np.diff(np.append(starts, len(keys)))
+        rank = np.arange(len(keys)) - np.repeat(starts, group_counts)
+
+        voxels = self._find_or_insert(keys[starts])
+        stored = self._counts[voxels]
+        slot = np.repeat(stored, group_counts) + rank
+        keep = slot < self.max_points_per_voxel
+        self._points[np.repeat(voxels, group_counts)[keep], slot[keep]] = points[keep]
+        self._counts[voxels] = np.minimum(stored + group_counts, self.max_points_per_voxel)
+
+        if self.max_voxels is not None and self._size > self.max_voxels:
+            # shrink below the limit so eviction doesn't run on every scan
+            self._evict(max(self.max_voxels * 3 // 4, 1))
+
+    def _buckets(self, keys):
+        # Fibonacci hashing of the keys into the table
+        shift = np.uint64(64 - (len(self._table_keys) - 1).bit_length())
+        return ((keys.astype(np.uint64) * _HASH_MULTIPLIER) >> shift).astype(np.int64)
+
+    def _find_or_insert(self, keys):
+        # returns the voxel index of each of the unique keys, appending voxels for keys not in the table yet
+        if 2 * (self._size + len(keys)) > len(self._table_keys):
+            self._rehash(2 * (self._size + len(keys)))
+        if self._size + len(keys) > len(self._keys):
+            self._grow(self._size + len(keys))
+
+        mask = len(self._table_keys) - 1
+        buckets = self._buckets(keys)
+        voxels = np.empty(len(keys), np.int64)
+        pending = np.arange(len(keys))
+        while len(pending):
+            pending_keys, pending_buckets = keys[pending], buckets[pending]
+            current = self._table_keys[pending_buckets]
+            found = current == pending_keys
+            voxels[pending[found]] = self._table_voxels[pending_buckets[found]]
+
+            # claim empty buckets, when several keys race for one bucket the last write wins and the others probe again
+            empty = current == _EMPTY
+            self._table_keys[pending_buckets[empty]] = pending_keys[empty]
+            won = np.zeros(len(pending), bool)
+            won[empty] = self._table_keys[pending_buckets[empty]] == pending_keys[empty]
+            new_voxels = np.arange(self._size, self._size + np.count_nonzero(won))
+            self._size += len(new_voxels)
+            self._table_voxels[pending_buckets[won]] = new_voxels
+            self._keys[new_voxels] = pending_keys[won]
+            self._counts[new_voxels] = 0
+            voxels[pending[won]] = new_voxels
+
+            occupied = ~found & ~empty
+            buckets[pending[occupied]] = (pending_buckets[occupied] + 1) & mask
+            pending = pending[occupied | (empty & ~won)]
+        return voxels
+
+    def _rehash(self, size):
+        # rebuilds the table with at least `size` buckets for the current voxels
+        self._table_keys = np.full(1 << max(int(size) - 1, 1).bit_length(), _EMPTY, np.int64)
+        self._table_voxels = np.zeros(len(self._table_keys), np.int64)
+        mask = len(self._table_keys) - 1
+        keys = self._keys[:self._size]
+        buckets = self._buckets(keys)
+        pending = np.arange(self._size)
+        while len(pending):
+            pending_buckets = buckets[pending]
+            empty = self._table_keys[pending_buckets] == _EMPTY
+            claimed = pending[empty]
+            self._table_keys[pending_buckets[empty]] = keys[claimed]
+            won = self._table_keys[pending_buckets[empty]] == keys[claimed]
+            self._table_voxels[pending_buckets[empty][won]] = claimed[won]
+            buckets[pending[~empty]] = (pending_buckets[~empty] + 1) & mask
+            pending = np.concatenate((pending[~empty], claimed[~won]))
+
+    def _grow(self, size):
+        capacity = max(2 * len(self._keys), size)
+        for name in ('_keys', '_counts', '_points'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _evict(self, max_voxels):
+        distance = np.linalg.norm(self.voxel_centers() - self._origin, axis = 1)
+        keep = np.sort(np.argpartition(distance, max_voxels - 1)[:max_voxels])
+        self._size = len(keep)
+        self._keys[:self._size] = self._keys[keep]
+        self._counts[:self._size] = self._counts[keep]
+        self._points[:self._size] = self._points[keep]
+        self._rehash(len(self._table_keys))
+
+    def voxel_centers(self):
+        """
+        Returns:
+            numpy.ndarray: (M, 3) center of each occupied voxel
+        """
+        keys = self._keys[:self._size]
+        cells = np.stack(((keys >> (2 * _KEY_BITS)) & _KEY_MASK, (keys >> _KEY_BITS) & _KEY_MASK, keys & _KEY_MASK), axis = 1)
+        return (cells - _KEY_OFFSET + 0.5) * self.resolution
+
+    def points(self):
+        """
+        Returns:
+            numpy.ndarray: (P, 3) float32 points stored in the grid
+        """
+        return self._points[:self._size][np.arange(self.max_points_per_voxel) < self._counts[:self._size, None]]
+
+    def save_ply(self, filename):
+        """
+        Writes the stored points as a binary little endian PLY file
+        """
+        points = self.points().astype('<f4', copy = False)
+        header = ("ply\nformat binary_little_endian 1.0\nelement vertex %d\n"
+                  "property float x\nproperty float y\nproperty float z\nend_header\n") % len(points)
+        with open(filename, 'wb') as f:
+            f.write(header.encode('ascii'))
+            f.write(points.tobytes())
+
+    def save_npz(self, filename):
+        """
+        Writes the stored points, the voxel centers and the grid resolution
+        """
+        np.savez(filename, points = self.points(), voxel_centers = self.voxel_centers(), resolution = self.resolution)
@@ -0,0 +1,154 @@
+import numpy as np
+
+from .types import ImageType
+from .utils import quaternion_to_rotation_matrix_batch
+
+# unit rays of every pixel, keyed by (width, height, fx, fy, image_type)
+_ray_cache = {}
+
+def camera_intrinsics(width, height, camera_info = None, fov = 90.0):
+    """
+    Focal lengths and principal point in pixels
+
+    Args:
+        width (int): Image width
+        height (int): Image height
+        camera_info (CameraInfo, optional): Result of `simGetCameraInfo`, its projection matrix is used when valid, else its fov
+        fov (float, optional): Horizontal field of view in degrees, used without camera_info
+
+    Returns:
+        tuple: (fx, fy, cx, cy)
+    """
+    matrix = np.asarray(camera_info.proj_mat.matrix, np.float64) if camera_info is not None else None
+    if matrix is not None and matrix.shape == (4, 4) and matrix[0, 0] != 0 and matrix[1, 1] != 0:
+        # the perspective matrix holds 1 / tan(fov / 2), scaled by the aspect ratio for the vertical axis
+        fx = abs(matrix[0, 0]) * width / 2.0
+        fy = abs(matrix[1, 1]) * height / 2.0
+    else:
+        if camera_info is not None and camera_info.fov > 0:
+            fov = camera_info.fov
+        fx = fy = width / (2.0 * np.tan(np.radians(fov) / 2.0))
+    return fx, fy, width / 2.0, height / 2.0
+
+def _rays(width, height, fx, fy, image_type):
+    key = (width, height, fx, fy, image_type)
+    rays = _ray_cache.get(key)
+    if rays is None:
+        # camera frame is x forward, y right, z down
+        rays = np.empty((height, width, 3), np.float32)
+        rays[..., 0] = 1.0
+        rays[..., 1] = ((np.arange(width, dtype = np.float32) + 0.5 - width / 2.0) / fx)[None, :]
+        rays[..., 2] = ((np.arange(height, dtype = np.float32) + 0.5 - height / 2.0) / fy)[:, None]
+        if image_type != ImageType.DepthPlanner:
+            # DepthPerspective is the distance to the camera, DepthPlanner the distance along the camera axis
+            rays /= np.linalg.norm(rays, axis = 2, keepdims = True)
+        _ray_cache[key] = rays
+    return rays
+
+def depth_to_points(depth_response, camera_info = None, fov = 90.0, frame = 'camera', max_depth = None, return_mask = False):
+    """
+    Point cloud of a float depth image
+
+    Args:
+        depth_response (ImageResponse): DepthPerspective or DepthPlanner image requested with pixels_as_float = True
+        camera_info (CameraInfo, optional): Result of `simGetCameraInfo` for the same camera
+        fov (float, optional): Horizontal field of view in degrees, used without camera_info
+        frame (str, optional): 'camera' for x forward, y right, z down camera coordinates, 'world' for world NED coordinates
+            using the camera pose of the response
+        max_depth (float, optional): Drop pixels farther than this, e.g. the sky
+        return_mask (bool, optional): Also return the (H, W) mask of the pixels kept
+
+    Returns:
+        numpy.ndarray: (N, 3) float32 points, with the mask if return_mask is set
+    """
+    depth = depth_response.depth_array()
+    fx, fy, _, _ = camera_intrinsics(depth_response.width, depth_response.height, camera_info, fov)
+    rays = _rays(depth_response.width, depth_response.height, fx, fy, depth_response.image_type)
+
+    mask = depth < np.inf if max_depth is None else depth <= max_depth   # also drops NaN
+    points = np.multiply(rays, depth[..., None]).reshape(-1, 3)
+    if not mask.all():
+        points = points[mask.ravel()]
+
+    if frame == 'world':
+        orientation, position = depth_response.camera_orientation, depth_response.camera_position
+        q = np.array([orientation.x_val, orientation.y_val, orientation.z_val, orientation.w_val], np.float32)
+        points = points @ quaternion_to_rotation_matrix_batch(q).T
+        points += np.array([position.x_val, position.y_val, position.z_val], np.float32)
+    elif frame != 'camera':
+        raise ValueError("frame must be 'camera' or 'world', got %r" % frame)
+    return (points, mask) if return_mask else points
+
+
+class PointCloud:
+    """
+    Points with optional colors, written as binary PLY or PCD
+
+    Attributes:
+        points (numpy.ndarray): (N, 3) float32 points
+        colors (numpy.ndarray): (N, 3) uint8 RGB colors, None if uncolored
+    """
+    def __init__(self, points, colors = None):
+        self.points = np.asarray(points, np.float32)
+        self.colors = np.asarray(colors, np.uint8) if colors is not None else None
+
+    def __len__(self):
+        return len(self.points)
+
+    @staticmethod
+    def from_depth(depth_response, camera_info = None, scene_response = None, fov = 90.0, frame = 'camera', max_depth = None):
+        """
+        Args:
+            depth_response (ImageResponse): See `depth_to_points`
+            camera_info (CameraInfo, optional): See `depth_to_points`
+            scene_response (ImageResponse, optional): Uncompressed Scene image of the same size to color the points with
+            fov (float, optional): See `depth_to_points`
+            frame (str, optional): See `depth_to_points`
+            max_depth (float, optional): See `depth_to_points`
+        """
+        points, mask = depth_to_points(depth_response, camera_info, fov, frame, max_depth, return_mask = True)
+        colors = None
+        if scene_response is not None:
+            scene = scene_response.as_array()
+            if scene.shape[:2] != mask.shape:
+                raise ValueError("scene image is %dx%d, depth image is %dx%d" % (scene.shape[1], scene.shape[0], mask.shape[1], mask.shape[0]))
+            colors = scene[mask][:, 2::-1]  # BGR(A) to RGB
+        return PointCloud(points, colors)
+
+    def _vertices(self, color_field):
+        fields = [('x', '<f4'), ('y', '<f4'), ('z', '<f4')]
+        if self.colors is not None:
+            fields += color_field
+        vertices = np.empty(len(self.points), fields)
+        vertices['x'], vertices['y'], vertices['z'] = self.points[:, 0], self.points[:, 1], self.points[:, 2]
+        return vertices
+
+    def save_ply(self, filename):
+        """
+        Writes a binary little endian PLY file
+        """
+        vertices = self._vertices([('red', 'u1'), ('green', 'u1'), ('blue', 'u1')])
+        header = "ply\nformat binary_little_endian 1.0\nelement vertex %d\nproperty float x\nproperty float y\nproperty float z\n" % len(vertices)
+        if self.colors is not None:
+            vertices['red'], vertices['green'], vertices['blue'] = self.colors[:, 0], self.colors[:, 1], self.colors[:, 2]
+            header += "property uchar red\nproperty uchar green\nproperty uchar blue\n"
+        with open(filename, 'wb') as f:
+            f.write((header + "end_header\n").encode('ascii'))
+            f.write(vertices.tobytes())
+
+    def save_pcd(self, filename):
+        """
+        Writes a binary PCD file, colors are packed into the rgb field as PCL does
+        """
+        vertices = self._vertices([('rgb', '<u4')])
+        fields, sizes, types = "x y z", "4 4 4", "F F F"
+        if self.colors is not None:
+            colors = self.colors.astype(np.uint32)
+            vertices['rgb'] = (colors[:, 0] << 16) | (colors[:, 1] << 8) | colors[:, 2]
+            fields, sizes, types = fields + " rgb", sizes + " 4", types + " U"
+        header = ("# .PCD v0.7 - Point Cloud Data file format\nVERSION 0.7\nFIELDS %s\nSIZE %s\nTYPE %s\nCOUNT %s\n"
+                  "WIDTH %d\nHEIGHT 1\nVIEWPOINT 0 0 0 1 0 0 0\nPOINTS %d\nDATA binary\n") % (
+                  fields, sizes, types, " ".join(["1"] * len(fields.split())), len(vertices), len(vertices))
+        with open(filename, 'wb') as f:
+            f.write(header.encode('ascii'))
+            f.write(vertices.tobytes())
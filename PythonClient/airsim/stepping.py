@@ -0,0 +1,128 @@
+import time
+
+from .instrumentation import Histogram, TIME_BUCKETS
+
+class SimStepper:
+    """
+    Advances a paused simulation in fixed steps and gets the registered sensors and images after each step
+
+    Each `step()` runs `simContinueForTime(dt)`, polls `simIsPause` until the simulator paused again, then sends all
+    registered calls back-to-back through `VehicleClient.batch()` so they cost one round trip together. The simulation
+    stays paused while the caller computes and sends its commands, so runs are repeatable and go as fast as the simulator
+    can render, faster than real time when it allows.
+
+    Example:
+        stepper = SimStepper(client, dt = 0.05)
+        stepper.add('state', 'getCarState', vehicle_name = 'Car1')
+        stepper.add('images', 'simGetImages', [airsim.ImageRequest("0", airsim.ImageType.Scene)], vehicle_name = 'Car1')
+        with stepper:
+            for _ in range(1000):
+                observation = stepper.step()
+                client.setCarControls(policy(observation['state'], observation['images']), 'Car1')
+        print(stepper.stats())
+
+    Args:
+        client (VehicleClient): Client of the simulation
+        dt (float): Simulated seconds per step
+        poll_interval (float, optional): Seconds between `simIsPause` checks
+        timeout (float, optional): Seconds to wait for the simulator to pause after a step before raising TimeoutError
+    """
+    PHASES = ('continue', 'wait', 'capture')
+
+    def __init__(self, client, dt, poll_interval = 0.001, timeout = 60.0):
+        self.client = client
+        self.dt = float(dt)
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._calls = []
+        self.reset_stats()
+
+    def add(self, name, method, *args, **kwargs):
+        """
+        Register a client API called after every step, e.g. `add('pose1', 'simGetVehiclePose', vehicle_name = 'Drone1')`
+
+        Args:
+            name (str): Key of the result in the dict returned by `step()`
+            method (str): Name of a `VehicleClient` API which can be batched, see `RpcBatch`
+            *args: Arguments of the API
+            **kwargs: Keyword arguments of the API
+        """
+        self._calls.append((name, method, args, kwargs))
+
+    def reset_stats(self):
+        self.steps = 0
+        self.sim_time = 0.0
+        self.wall_time = 0.0
+        self.timings = dict((phase, Histogram(TIME_BUCKETS)) for phase in SimStepper.PHASES)
+        self.last_timings = dict((phase, 0.0) for phase in SimStepper.PHASES)
+        self._last_step_end = None
+
+    def __enter__(self):
+        self.client.simPause(True)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.client.simPause(False)
+
+    def observe(self):
+        """
+        Get the registered calls without advancing the simulation, e.g. for the first observation
+
+        Returns:
+            dict: Result of each registered call by name
+        """
+        if not self._calls:
+            return {}
+        with self.client.batch() as batch:
+            for name, method, args, kwargs in self._calls:
+                getattr(batch, method)(*args, **kwargs)
+        return dict(zip((call[0] for call in self._calls), batch.results))
+
+    def step(self):
+        """
+        Run the simulation for `dt` seconds, then get the registered calls
+
+        Returns:
+            dict: Result of each registered call by name
+        """
+        start = time.perf_counter()
+        self.client.simContinueForTime(self.dt)
+        continued = time.perf_counter()
+
+        deadline = continued + self.timeout
+        while not self.client.simIsPause():
+            if time.perf_counter() > deadline:
+                raise TimeoutError('Simulation did not pause within %.1f seconds after simContinueForTime(%g)' % (self.timeout, self.dt))
+            time.sleep(self.poll_interval)
+        paused = time.perf_counter()
+
+        observation = self.observe()
+        end = time.perf_counter()
+
+        for phase, duration in zip(SimStepper.PHASES, (continued - start, paused - continued, end - paused)):
+            self.timings[phase].observe(duration)
+            self.last_timings[phase] = duration
+        # wall time includes the caller's work between steps
+        self.wall_time += end - (self._last_step_end if self._last_step_end is not None else start)
+        self._last_step_end = end
+        self.steps += 1
+        self.sim_time = self.steps * self.dt
+        return observation
+
+    @property
+    def realtime_factor(self):
+        """
+        float: Simulated seconds per wall clock second, above 1 when running faster than real time
+        """
+        return self.sim_time / self.wall_time if self.wall_time > 0 else 0.0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Steps, simulated and wall clock seconds, their ratio and the mean, p50 and p99 seconds of each phase
+        """
+        stats = {'steps': self.steps, 'sim_time': self.sim_time, 'wall_time': self.wall_time, 'realtime_factor': self.realtime_factor}
+        for phase, histogram in self.timings.items():
+            stats[phase] = {'mean': histogram.sum / histogram.count if histogram.count else 0.0,
+                            'p50': histogram.percentile(50), 'p99': histogram.percentile(99)}
+        return stats
@@ -0,0 +1,132 @@
+import collections
+import time
+
+from .types import ImageResponse
+
+class ImageFrame:
+    """
+    One `simGetImages` result of an `ImageStream`
+
+    Attributes:
+        responses (list[ImageResponse]): One response per request, in request order
+        index (int): Number of the frame in the stream, starting at 0
+        timestamp (float): `time.time()` when the request was sent
+        latency (float): Seconds from sending the request to decoding its response
+    """
+    __slots__ = ('responses', 'index', 'timestamp', 'latency')
+
+    def __init__(self, responses, index, timestamp, latency):
+        self.responses = responses
+        self.index = index
+        self.timestamp = timestamp
+        self.latency = latency
+
+    def __len__(self):
+        return len(self.responses)
+
+    def __iter__(self):
+        return iter(self.responses)
+
+    def __getitem__(self, key):
+        return self.responses[key]
+
+class ImageStream:
+    """
+    Iterator over `simGetImages` results which keeps the next requests in flight while the caller processes a frame,
+    created by `VehicleClient.stream_images`
+
+    While a frame is processed the simulator is already rendering the next ones, so a loop which used to fetch, then
+    process, then sleep runs at the rate of the slower of the two instead of their sum. With `rate_hz` set, requests
+    are sent on a fixed schedule. Ticks which pass while `prefetch` requests are already waiting are skipped and counted
+    in `dropped_ticks`, so frames don't pile up behind a slow consumer.
+
+    Args:
+        rpc_client: Connection of a VehicleClient
+        requests (list[ImageRequest]): Images to get for each frame
+        vehicle_name (str, optional): Name of the vehicle with the cameras
+        rate_hz (float, optional): Requests per second, as fast as the frames are consumed if None
+        prefetch (int, optional): Number of requests kept in flight
+        max_frames (int, optional): Stop after this many frames, endless if None
+    """
+    def __init__(self, rpc_client, requests, vehicle_name = '', rate_hz = None, prefetch = 2, max_frames = None):
+        self._client = rpc_client
+        self.requests = list(requests)
+        self.vehicle_name = vehicle_name
+        self.period = 1.0 / rate_hz if rate_hz else None
+        self.prefetch = max(int(prefetch), 1)
+        self.max_frames = max_frames
+
+        self.frames = 0
+        self.dropped_ticks = 0
+        self._pending = collections.deque()
+        self._sent = 0
+        self._next_tick = time.time()
+        self._first_time = None
+        self._last_time = None
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def fps(self):
+        """
+        float: Average rate at which frames were delivered so far
+        """
+        if self.frames < 2 or self._last_time == self._first_time:
+            return 0.0
+        return (self.frames - 1) / (self._last_time - self._first_time)
+
+    def _send_due(self):
+        # keep up to `prefetch` requests in flight, sending only those whose tick has come
+        while len(self._pending) < self.prefetch and (self.max_frames is None or self._sent < self.max_frames):
+            now = time.time()
+            if self.period is not None:
+                if now < self._next_tick:
+                    return
+                missed = int((now - self._next_tick) / self.period)
+                self.dropped_ticks += missed
+                self._next_tick += (missed + 1) * self.period
+            self._pending.append((now, self._client.call_async('simGetImages', self.requests, self.vehicle_name)))
+            self._sent += 1
+
+    def __next__(self):
+        if self._closed or (self.max_frames is not None and self.frames >= self.max_frames):
+            raise StopIteration
+        self._send_due()
+        if not self._pending:
+            time.sleep(max(self._next_tick - time.time(), 0))
+            self._send_due()
+
+        sent_time, future = self._pending.popleft()
+        responses = [ImageResponse.from_msgpack(response) for response in future.get()]
+        self._send_due()
+
+        now = time.time()
+        if self._first_time is None:
+            self._first_time = now
+        self._last_time = now
+        frame = ImageFrame(responses, self.frames, sent_time, now - sent_time)
+        self.frames += 1
+        return frame
+
+    def stats(self):
+        """
+        Returns:
+            dict: Frames delivered, average fps, dropped ticks and requests in flight
+        """
+        return {'frames': self.frames, 'fps': self.fps, 'dropped_ticks': self.dropped_ticks, 'in_flight': len(self._pending)}
+
+    def close(self):
+        """
+        Stop the stream and wait for the requests in flight, so their responses don't linger on the connection
+        """
+        self._closed = True
+        while self._pending:
+            self._pending.popleft()[1].join()
@@ -0,0 +1,149 @@
+import numpy as np
+
+from .types import KinematicsState
+
+# one row per logged state, quaternions are stored (x, y, z, w) like Quaternionr.to_numpy_array()
+STATE_DTYPE = np.dtype([('timestamp', np.uint64),
+                        ('position', np.float64, (3,)),
+                        ('orientation', np.float32, (4,)),
+                        ('linear_velocity', np.float32, (3,)),
+                        ('angular_velocity', np.float32, (3,)),
+                        ('linear_acceleration', np.float32, (3,)),
+                        ('angular_acceleration', np.float32, (3,)),
+                        ('landed_state', np.int8)])
+
+def state_row(state, timestamp = None):
+    """
+    Fields of a `STATE_DTYPE` row as a tuple, which can be assigned to a row of a structured array
+
+    Args:
+        state (MultirotorState, CarState or KinematicsState): State to convert
+        timestamp (int, optional): Overrides the timestamp of the state, needed for a KinematicsState which has none
+    """
+    if isinstance(state, KinematicsState):
+        kinematics, landed_state, default_timestamp = state, -1, 0
+    else:
+        kinematics = state.kinematics_estimated
+        landed_state = getattr(state, 'landed_state', -1)
+        default_timestamp = state.timestamp
+
+    p, q = kinematics.position, kinematics.orientation
+    v, w = kinematics.linear_velocity, kinematics.angular_velocity
+    a, b = kinematics.linear_acceleration, kinematics.angular_acceleration
+    return (default_timestamp if timestamp is None else timestamp,
+            (p.x_val, p.y_val, p.z_val), (q.x_val, q.y_val, q.z_val, q.w_val),
+            (v.x_val, v.y_val, v.z_val), (w.x_val, w.y_val, w.z_val),
+            (a.x_val, a.y_val, a.z_val), (b.x_val, b.y_val, b.z_val), landed_state)
+
+class StateLog:
+    """
+    Growable log of vehicle states kept as a numpy structured array with `STATE_DTYPE` rows
+
+    Example:
+        log = StateLog()
+        for _ in range(1000):
+            log.append(client.getMultirotorState())
+        print(log.distance_travelled(), log.speeds().max())
+        log.save('flight.npy')
+
+    Args:
+        capacity (int, optional): Number of rows to preallocate, the storage doubles whenever it is full
+    """
+    def __init__(self, capacity = 1024):
+        self._rows = np.zeros(max(int(capacity), 1), STATE_DTYPE)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    @property
+    def data(self):
+        """
+        numpy.ndarray: View of the logged rows, fields can be selected by name, e.g. `log.data['position']` is (N, 3)
+        """
+        return self._rows[:self._size]
+
+    def _reserve(self, count):
+        if self._size + count > len(self._rows):
+            rows = np.zeros(max(2 * len(self._rows), self._size + count), STATE_DTYPE)
+            rows[:self._size] = self._rows[:self._size]
+            self._rows = rows
+
+    def append(self, state, timestamp = None):
+        """
+        Args:
+            state (MultirotorState, CarState or KinematicsState): State to log
+            timestamp (int, optional): Overrides the timestamp of the state, needed for a KinematicsState which has none
+        """
+        self._reserve(1)
+        self._rows[self._size] = state_row(state, timestamp)
+        self._size += 1
+
+    def extend(self, states):
+        for state in states:
+            self.append(state)
+
+    def clear(self):
+        self._size = 0
+
+    def time_slice(self, start = None, end = None):
+        """
+        Rows with start <= timestamp < end, assuming states were appended in time order
+
+        Args:
+            start (int, optional): First timestamp in nanoseconds, same unit as `MultirotorState.timestamp`
+            end (int, optional): Timestamp after the last row
+
+        Returns:
+            numpy.ndarray: View of the matching rows
+        """
+        timestamps = self.data['timestamp']
+        first = 0 if start is None else np.searchsorted(timestamps, np.uint64(start), 'left')
+        last = self._size if end is None else np.searchsorted(timestamps, np.uint64(end), 'left')
+        return self.data[first:last]
+
+    def speeds(self):
+        """
+        Returns:
+            numpy.ndarray: Norm of the linear velocity of every row
+        """
+        return np.linalg.norm(self.data['linear_velocity'], axis = 1)
+
+    def angular_speeds(self):
+        return np.linalg.norm(self.data['angular_velocity'], axis = 1)
+
+    def distance_travelled(self):
+        """
+        Returns:
+            float: Length in meters of the path through the logged positions
+        """
+        if self._size < 2:
+            return 0.0
+        return float(np.linalg.norm(np.diff(self.data['position'], axis = 0), axis = 1).sum())
+
+    def save(self, path):
+        """
+        Writes the logged rows without copying them, as `.npz` if the path ends with it, else as `.npy`
+        """
+        if str(path).endswith('.npz'):
+            np.savez(path, states = self.data)
+        else:
+            np.save(path, self.data)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a log written by `save`
+        """
+        rows = np.load(path)
+        if isinstance(rows, np.lib.npyio.NpzFile):
+            rows = rows['states']
+        if rows.dtype != STATE_DTYPE:
+            raise ValueError("%s does not contain StateLog rows" % path)
+        log = cls(len(rows))
+        log._rows[:len(rows)] = rows
+        log._size = len(rows)
+        return log
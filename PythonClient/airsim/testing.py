@@ -0,0 +1,525 @@
+from .types import *
+
+import msgpack
+import numpy as np
+import collections
+import socket
+import threading
+import heapq
+import struct
+import time
+import zlib
+
+def _vector(x = 0.0, y = 0.0, z = 0.0):
+    return {'x_val': x, 'y_val': y, 'z_val': z}
+
+def _quaternion(w = 1.0, x = 0.0, y = 0.0, z = 0.0):
+    return {'w_val': w, 'x_val': x, 'y_val': y, 'z_val': z}
+
+def _pose(position = None, orientation = None):
+    return {'position': position or _vector(), 'orientation': orientation or _quaternion()}
+
+def _geo_point():
+    return {'latitude': 47.641468, 'longitude': -122.140165, 'altitude': 122.0}
+
+def _png(width, height, channels):
+    # synthetic gradient image encoded as PNG
+    row = (np.arange(width * channels, dtype = np.uint32) % 256).astype(np.uint8).tobytes()
+    raw = b''.join(b'\x00' + row for _ in range(height))
+
+    def chunk(tag, data):
+        return struct.pack("!I", len(data)) + tag + data + struct.pack("!I", 0xFFFFFFFF & zlib.crc32(tag + data))
+
+    color_type = {1: 0, 3: 2, 4: 6}[channels]
+    return b''.join([b'\x89PNG\r\n\x1a\n',
+                     chunk(b'IHDR', struct.pack("!2I5B", width, height, 8, color_type, 0, 0, 0)),
+                     chunk(b'IDAT', zlib.compress(raw, 1)),
+                     chunk(b'IEND', b'')])
+
+class FakeAirSimApi(object):
+    """
+    Handlers for the AirSim RPC methods used by `VehicleClient`, `MultirotorClient` and `CarClient`
+
+    Payloads are synthetic but shaped like the simulator's: images have the configured size, lidar returns the configured
+    number of points and the scene has the configured number of meshes. Payloads are built once and cached, so the server's
+    own cost stays small next to the client's. Subclass and override a method to customize its response.
+
+    Args:
+        image_width (int): Width of images returned by `simGetImage` and `simGetImages`
+        image_height (int): Height of images returned by `simGetImage` and `simGetImages`
+        lidar_points (int): Number of points in each `getLidarData` point cloud
+        mesh_count (int): Number of meshes returned by `simGetMeshPositionVertexBuffers`
+        mesh_vertices (int): Number of vertices in each mesh
+    """
+    def __init__(self, image_width = 256, image_height = 144, lidar_points = 1000, mesh_count = 10, mesh_vertices = 1000):
+        self.image_width = image_width
+        self.image_height = image_height
+        self.lidar_points = lidar_points
+        self.mesh_count = mesh_count
+        self.mesh_vertices = mesh_vertices
+
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._paused = False
+        self._sim_time = 0.0
+        self._api_control = {}
+        self._armed = {}
+        self._poses = {}
+        self._object_poses = {}
+        self._segmentation_ids = {}
+        self._car_controls = {}
+
+    def _cached(self, key, build):
+        value = self._cache.get(key)
+        if value is None:
+            value = self._cache[key] = build()
+        return value
+
+    def _time_stamp(self):
+        return int(time.time() * 1e9)
+
+    def _kinematics(self, vehicle_name):
+        pose = self._poses.get(vehicle_name, _pose())
+        return {'position': pose['position'], 'orientation': pose['orientation'],
+                'linear_velocity': _vector(), 'angular_velocity': _vector(),
+                'linear_acceleration': _vector(), 'angular_acceleration': _vector()}
+
+    def _collision(self):
+        return {'has_collided': False, 'normal': _vector(), 'impact_point': _vector(), 'position': _vector(),
+                'penetration_depth': 0.0, 'time_stamp': self._time_stamp(), 'object_name': '', 'object_id': -1}
+
+    def _image(self, request):
+        image_type = request['image_type']
+        pixels_as_float, compress = request['pixels_as_float'], request['compress']
+        width, height = self.image_width, self.image_height
+        if pixels_as_float:
+            image_data_float = self._cached(('float', width, height), lambda: np.linspace(1.0, 100.0, width * height, dtype = np.float32).tolist())
+            image_data_uint8 = b''
+        else:
+            image_data_float = []
+            if compress:
+                image_data_uint8 = self._cached(('png', width, height), lambda: _png(width, height, 3))
+            else:
+                image_data_uint8 = self._cached(('raw', width, height), lambda: (np.arange(width * height * 3) % 256).astype(np.uint8).tobytes())
+        return {'image_data_uint8': image_data_uint8, 'image_data_float': image_data_float,
+                'camera_position': _vector(), 'camera_orientation': _quaternion(), 'time_stamp': self._time_stamp(),
+                'message': '', 'pixels_as_float': pixels_as_float, 'compress': compress,
+                'width': width, 'height': height, 'image_type': image_type}
+
+    # -----------------------------------  Common vehicle APIs ---------------------------------------------
+    def ping(self):
+        return True
+
+    def reset(self):
+        with self._lock:
+            self._poses.clear()
+            self._armed.clear()
+            self._api_control.clear()
+
+    def getServerVersion(self):
+        return 1
+
+    def getMinRequiredClientVersion(self):
+        return 1
+
+    def enableApiControl(self, is_enabled, vehicle_name):
+        self._api_control[vehicle_name] = is_enabled
+
+    def isApiControlEnabled(self, vehicle_name):
+        return self._api_control.get(vehicle_name, False)
+
+    def armDisarm(self, arm, vehicle_name):
+        self._armed[vehicle_name] = arm
+        return True
+
+    def simPause(self, is_paused):
+        self._paused = is_paused
+
+    def simIsPaused(self):
+        return self._paused
+
+    def simContinueForTime(self, seconds):
+        # the simulator runs for the given time and pauses again
+        with self._lock:
+            self._sim_time += seconds
+            self._paused = True
+
+    def getHomeGeoPoint(self, vehicle_name):
+        return _geo_point()
+
+    def simSwapTextures(self, tags, tex_id, component_id, material_id):
+        return []
+
+    def simSetTimeOfDay(self, is_enabled, start_datetime, is_start_datetime_dst, celestial_clock_speed, update_interval_secs, move_sun):
+        pass
+
+    def simEnableWeather(self, enable):
+        pass
+
+    def simSetWeatherParameter(self, param, val):
+        pass
+
+    def simGetImage(self, camera_name, image_type, vehicle_name):
+        width, height = self.image_width, self.image_height
+        return self._cached(('png', width, height), lambda: _png(width, height, 3))
+
+    def simGetImages(self, requests, vehicle_name):
+        return [self._image(request) for request in requests]
+
+    def simGetMeshPositionVertexBuffers(self):
+        def build():
+            vertices = np.random.RandomState(0).uniform(-1, 1, self.mesh_vertices * 3).astype(np.float32).tolist()
+            indices = list(range(self.mesh_vertices - self.mesh_vertices % 3))
+            return [{'position': _vector(float(i), 0.0, 0.0), 'orientation': _quaternion(), 'vertices': vertices,
+                     'indices': indices, 'name': 'Mesh%d' % i} for i in range(self.mesh_count)]
+        return self._cached(('meshes', self.mesh_count, self.mesh_vertices), build)
+
+    def simGetCollisionInfo(self, vehicle_name):
+        return self._collision()
+
+    def simSetVehiclePose(self, pose, ignore_collison, vehicle_name):
+        self._poses[vehicle_name] = pose
+
+    def simGetVehiclePose(self, vehicle_name):
+        return self._poses.get(vehicle_name, _pose())
+
+    def simSetTraceLine(self, color_rgba, thickness, vehicle_name):
+        pass
+
+    def simGetObjectPose(self, object_name):
+        return self._object_poses.get(object_name, _pose())
+
+    def simSetObjectPose(self, object_name, pose, teleport):
+        self._object_poses[object_name] = pose
+        return True
+
+    def simListSceneObjects(self, name_regex):
+        return ['Mesh%d' % i for i in range(self.mesh_count)]
+
+    def simSetSegmentationObjectID(self, mesh_name, object_id, is_name_regex):
+        self._segmentation_ids[mesh_name] = object_id
+        return True
+
+    def simGetSegmentationObjectID(self, mesh_name):
+        return self._segmentation_ids.get(mesh_name, -1)
+
+    def simPrintLogMessage(self, message, message_param, severity):
+        pass
+
+    def simGetCameraInfo(self, camera_name, vehicle_name):
+        fov = 90.0
+        focal = 1 / np.tan(np.radians(fov) / 2)
+        matrix = [[focal, 0.0, 0.0, 0.0], [0.0, focal * self.image_width / self.image_height, 0.0, 0.0],
+                  [0.0, 0.0, 0.0, 1.0], [0.0, 0.0, 10.0, 0.0]]
+        return {'pose': _pose(), 'fov': fov, 'proj_mat': {'matrix': matrix}}
+
+    def simSetCameraOrientation(self, camera_name, orientation, vehicle_name):
+        pass
+
+    def simSetCameraFov(self, camera_name, fov_degrees, vehicle_name):
+        pass
+
+    def simGetGroundTruthKinematics(self, vehicle_name):
+        return self._kinematics(vehicle_name)
+
+    def simGetGroundTruthEnvironment(self, vehicle_name):
+        return {'position': _vector(), 'geo_point': _geo_point(), 'gravity': _vector(0.0, 0.0, 9.81),
+                'air_pressure': 101325.0, 'temperature': 288.15, 'air_density': 1.225}
+
+    # sensor APIs
+    def getImuData(self, imu_name, vehicle_name):
+        return {'time_stamp': self._time_stamp(), 'orientation': _quaternion(),
+                'angular_velocity': _vector(), 'linear_acceleration': _vector(0.0, 0.0, -9.81)}
+
+    def getBarometerData(self, barometer_name, vehicle_name):
+        return {'time_stamp': self._time_stamp(), 'altitude': 122.0, 'pressure': 101325.0, 'qnh': 1013.25}
+
+    def getMagnetometerData(self, magnetometer_name, vehicle_name):
+        return {'time_stamp': self._time_stamp(), 'magnetic_field_body': _vector(0.2, 0.0, 0.4), 'magnetic_field_covariance': []}
+
+    def getGpsData(self, gps_name, vehicle_name):
+        return {'time_stamp': self._time_stamp(), 'is_valid': True,
+                'gnss': {'geo_point': _geo_point(), 'eph': 0.1, 'epv': 0.1, 'velocity': _vector(),
+                         'fix_type': 3, 'time_utc': self._time_stamp() // 1000}}
+
+    def getDistanceSensorData(self, distance_sensor_name, vehicle_name):
+        return {'time_stamp': self._time_stamp(), 'distance': 10.0, 'min_distance': 0.2, 'max_distance': 40.0,
+                'relative_pose': _pose()}
+
+    def getLidarData(self, lidar_name, vehicle_name):
+        def build():
+            angles = np.linspace(0, 2 * np.pi, self.lidar_points, endpoint = False)
+            points = np.stack([10 * np.cos(angles), 10 * np.sin(angles), np.zeros_like(angles)], axis = 1)
+            return points.astype(np.float32).ravel().tolist()
+        point_cloud = self._cached(('lidar', self.lidar_points), build)
+        return {'point_cloud': point_cloud, 'time_stamp': self._time_stamp(), 'pose': self._poses.get(vehicle_name, _pose())}
+
+    def simGetLidarSegmentation(self, lidar_name, vehicle_name):
+        return self._cached(('lidar_segmentation', self.lidar_points), lambda: [i % 256 for i in range(self.lidar_points)])
+
+    #  Plotting APIs
+    def simFlushPersistentMarkers(self):
+        pass
+
+    def simPlotPoints(self, points, color_rgba, size, duration, is_persistent):
+        pass
+
+    def simPlotLineStrip(self, points, color_rgba, thickness, duration, is_persistent):
+        pass
+
+    def simPlotLineList(self, points, color_rgba, thickness, duration, is_persistent):
+        pass
+
+    def simPlotArrows(self, points_start, points_end, color_rgba, thickness, arrow_size, duration, is_persistent):
+        pass
+
+    def simPlotStrings(self, strings, positions, scale, color_rgba, duration):
+        pass
+
+    def simPlotTransforms(self, poses, scale, thickness, duration, is_persistent):
+        pass
+
+    def simPlotTransformsWithNames(self, poses, names, tf_scale, tf_thickness, text_scale, text_color_rgba, duration):
+        pass
+
+    def cancelLastTask(self, vehicle_name):
+        pass
+
+    def waitOnLastTask(self, timeout_sec):
+        return True
+
+    # -----------------------------------  Multirotor APIs ---------------------------------------------
+    def takeoff(self, timeout_sec, vehicle_name):
+        return True
+
+    def land(self, timeout_sec, vehicle_name):
+        return True
+
+    def goHome(self, timeout_sec, vehicle_name):
+        return True
+
+    def moveByAngleZ(self, pitch, roll, z, yaw, duration, vehicle_name):
+        return True
+
+    def moveByAngleThrottle(self, pitch, roll, throttle, yaw_rate, duration, vehicle_name):
+        return True
+
+    def moveByVelocity(self, vx, vy, vz, duration, drivetrain, yaw_mode, vehicle_name):
+        return True
+
+    def moveByVelocityZ(self, vx, vy, z, duration, drivetrain, yaw_mode, vehicle_name):
+        return True
+
+    def moveOnPath(self, path, velocity, timeout_sec, drivetrain, yaw_mode, lookahead, adaptive_lookahead, vehicle_name):
+        return True
+
+    def moveToPosition(self, x, y, z, velocity, timeout_sec, drivetrain, yaw_mode, lookahead, adaptive_lookahead, vehicle_name):
+        with self._lock:
+            pose = self._poses.get(vehicle_name, _pose())
+            self._poses[vehicle_name] = _pose(_vector(x, y, z), pose['orientation'])
+        return True
+
+    def moveToZ(self, z, velocity, timeout_sec, yaw_mode, lookahead, adaptive_lookahead, vehicle_name):
+        return True
+
+    def moveByManual(self, vx_max, vy_max, z_min, duration, drivetrain, yaw_mode, vehicle_name):
+        return True
+
+    def rotateToYaw(self, yaw, timeout_sec, margin, vehicle_name):
+        return True
+
+    def rotateByYawRate(self, yaw_rate, duration, vehicle_name):
+        return True
+
+    def hover(self, vehicle_name):
+        return True
+
+    def moveByRC(self, rcdata, vehicle_name):
+        pass
+
+    def moveByMotorPWMs(self, front_right_pwm, rear_left_pwm, front_left_pwm, rear_right_pwm, duration, vehicle_name):
+        return True
+
+    def moveByRollPitchYawZ(self, roll, pitch, yaw, z, duration, vehicle_name):
+        return True
+
+    def moveByRollPitchYawThrottle(self, roll, pitch, yaw, throttle, duration, vehicle_name):
+        return True
+
+    def moveByRollPitchYawrateThrottle(self, roll, pitch, yaw_rate, throttle, duration, vehicle_name):
+        return True
+
+    def moveByRollPitchYawrateZ(self, roll, pitch, yaw_rate, z, duration, vehicle_name):
+        return True
+
+    def moveByAngleRatesZ(self, roll_rate, pitch_rate, yaw_rate, z, duration, vehicle_name):
+        return True
+
+    def moveByAngleRatesThrottle(self, roll_rate, pitch_rate, yaw_rate, throttle, duration, vehicle_name):
+        return True
+
+    def setAngleRateControllerGains(self, kp, ki, kd, vehicle_name):
+        pass
+
+    def setAngleLevelControllerGains(self, kp, ki, kd, vehicle_name):
+        pass
+
+    def setVelocityControllerGains(self, kp, ki, kd, vehicle_name):
+        pass
+
+    def setPositionControllerGains(self, kp, ki, kd, vehicle_name):
+        pass
+
+    def getMultirotorState(self, vehicle_name):
+        return {'collision': self._collision(), 'kinematics_estimated': self._kinematics(vehicle_name),
+                'gps_location': _geo_point(), 'timestamp': self._time_stamp(), 'landed_state': LandedState.Landed,
+                'rc_data': RCData().__dict__, 'ready': True, 'ready_message': '', 'can_arm': True}
+
+    # -----------------------------------  Car APIs ---------------------------------------------
+    def setCarControls(self, controls, vehicle_name):
+        self._car_controls[vehicle_name] = controls
+
+    def getCarState(self, vehicle_name):
+        return {'speed': 0.0, 'gear': 0, 'rpm': 0.0, 'maxrpm': 7500.0, 'handbrake': False,
+                'collision': self._collision(), 'kinematics_estimated': self._kinematics(vehicle_name),
+                'timestamp': self._time_stamp()}
+
+    def getCarControls(self, vehicle_name):
+        return self._car_controls.get(vehicle_name, CarControls().__dict__)
+
+
+class FakeAirSimServer(object):
+    """
+    Local msgpack-rpc server standing in for the simulator, for benchmarking and testing clients without Unreal or a GPU
+
+    Requests on a connection are handled in order and each response is delayed by `latency` seconds independently of the
+    others, so pipelined requests overlap their latency like on a real network. With `bandwidth` set, responses additionally
+    wait for their bytes to be transferred over a per-connection link of that many bytes per second.
+
+    Example:
+        with FakeAirSimServer(image_width = 640, image_height = 480, latency = 0.001) as server:
+            client = MultirotorClient(port = server.port)
+
+    Args:
+        port (int, optional): Port to listen on, 0 picks a free port, see `port`
+        latency (float, optional): Seconds added to every response
+        bandwidth (float, optional): Bytes per second of each connection, unlimited if None
+        api (FakeAirSimApi, optional): RPC handlers, by default a `FakeAirSimApi` built with `**api_args`
+        **api_args: Payload sizes passed to `FakeAirSimApi`
+    """
+    def __init__(self, port = 0, latency = 0.0, bandwidth = None, api = None, **api_args):
+        self.api = api if api is not None else FakeAirSimApi(**api_args)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.call_counts = collections.Counter()
+        self._counts_lock = threading.Lock()
+
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(('127.0.0.1', port))
+        self._listener.listen(16)
+        self.port = self._listener.getsockname()[1]
+        self._connections = []
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        """
+        Start serving in a background thread
+        """
+        self._thread = threading.Thread(target = self._accept)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and close all connections
+        """
+        self._stopped = True
+        self._listener.close()
+        for conn in self._connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+            conn.close()
+        self._connections = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _accept(self):
+        while not self._stopped:
+            try:
+                conn, _ = self._listener.accept()
+            except socket.error:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._connections.append(conn)
+            thread = threading.Thread(target = self._serve, args = (conn,))
+            thread.daemon = True
+            thread.start()
+
+    def _dispatch(self, method, params):
+        # connections are served by their own threads
+        with self._counts_lock:
+            self.call_counts[method] += 1
+        handler = getattr(self.api, method, None) if not method.startswith('_') else None
+        if handler is None:
+            return "'{0}' method not found".format(method), None
+        try:
+            return None, handler(*params)
+        except Exception as e:
+            return str(e), None
+
+    def _serve(self, conn):
+        # bytes are sent as msgpack bin like the simulator does, e.g. for ImageResponse.image_data_uint8
+        packer = msgpack.Packer(default = lambda x: x.to_msgpack(), use_bin_type = True)
+        unpacker = msgpack.Unpacker(raw = False, max_buffer_size = 0)
+        outbox = []
+        ready = threading.Condition()
+        writer = threading.Thread(target = self._send_due, args = (conn, outbox, ready))
+        writer.daemon = True
+        writer.start()
+
+        try:
+            while True:
+                data = conn.recv(1 << 16)
+                if not data:
+                    break
+                unpacker.feed(data)
+                for message in unpacker:
+                    if message[0] == 2:     # notification, no response
+                        self._dispatch(message[1], message[2])
+                        continue
+                    _, msgid, method, params = message
+                    error, result = self._dispatch(method, params)
+                    response = packer.pack([1, msgid, error, result])
+                    with ready:
+                        heapq.heappush(outbox, (time.time() + self.latency, msgid, response))
+                        ready.notify()
+        except socket.error:
+            pass
+        finally:
+            with ready:
+                heapq.heappush(outbox, (0, -1, None))
+                ready.notify()
+
+    def _send_due(self, conn, outbox, ready):
+        while True:
+            with ready:
+                while not outbox or outbox[0][0] > time.time():
+                    ready.wait(outbox[0][0] - time.time() if outbox else None)
+                _, _, response = heapq.heappop(outbox)
+            if response is None:
+                return
+            if self.bandwidth:
+                time.sleep(len(response) / float(self.bandwidth))
+            try:
+                conn.sendall(response)
+            except socket.error:
+                return
@@ -3,20 +3,92 @@ import msgpackrpc #install as admin: pip install msgpack-rpc-python
 import numpy as np #pip install numpy
 
 class MsgpackMixin:
+    # Subclasses either keep their fields in __dict__, with defaults as class attributes, or declare __slots__
+    # and set the defaults in __init__
+    __slots__ = ()
+
     def __repr__(self):
         from pprint import pformat
-        return "<" + type(self).__name__ + "> " + pformat(vars(self), indent=4, width=1)
+        return "<" + type(self).__name__ + "> " + pformat(self.to_msgpack(), indent=4, width=1)
 
     def to_msgpack(self, *args, **kwargs):
-        return self.__dict__
+        if hasattr(self, '__dict__'):
+            return self.__dict__
+        return {name: getattr(self, name) for name in self.__slots__}
 
     @classmethod
     def from_msgpack(cls, encoded):
-        obj = cls()
-        #obj.__dict__ = {k.decode('utf-8'): (from_msgpack(v.__class__, v) if hasattr(v, "__dict__") else v) for k, v in encoded.items()}
-        obj.__dict__ = { k : (v if not isinstance(v, dict) else getattr(getattr(obj, k).__class__, "from_msgpack")(v)) for k, v in encoded.items()}
-        #return cls(**msgpack.unpack(encoded))
-        return obj
+        decoder = _msgpack_decoders.get(cls)
+        if decoder is None:
+            decoder = _compile_decoder(cls)
+        return decoder(encoded)
+
+
+# decoders generated by _compile_decoder, keyed by class
+_msgpack_decoders = {}
+
+def _msgpack_fields(cls):
+    """
+    Names of the fields of a MsgpackMixin class, its __slots__ or its public non-callable class attributes
+    """
+    fields = []
+    for klass in reversed(cls.__mro__):
+        if klass is object or klass is MsgpackMixin:
+            continue
+        for name in klass.__dict__.get('__slots__', ()):
+            if name not in fields:
+                fields.append(name)
+        if '__slots__' not in klass.__dict__:
+            for name, value in klass.__dict__.items():
+                if not name.startswith('_') and not callable(value) and not isinstance(value, (staticmethod, classmethod, property)) \
+                        and name not in fields:
+                    fields.append(name)
+    return fields
+
+def _compile_decoder(cls):
+    """
+    Generates a function decoding the msgpack dict of `cls`, with nested MsgpackMixin fields decoded by their own decoders.
+    The type of each nested field comes from its default, the class attribute or for slotted classes the value set by __init__.
+    """
+    fields = _msgpack_fields(cls)
+    slotted = not any('__dict__' in klass.__dict__ for klass in cls.__mro__)
+    defaults = cls() if slotted else cls
+    nested = [(name, type(getattr(defaults, name))) for name in fields if isinstance(getattr(defaults, name), MsgpackMixin)]
+
+    env = {'cls': cls, 'new': cls.__new__}
+    for name, field_type in nested:
+        env['decode_' + name] = _msgpack_decoders.get(field_type) or _compile_decoder(field_type)
+
+    lines = ["def decode(encoded):",
+             "    obj = new(cls)"]
+    if slotted:
+        # a missing field keeps the default set by __init__
+        nested_names = set(name for name, _ in nested)
+        lines.append("    try:")
+        for name in fields:
+            if name in nested_names:
+                lines.append("        v = encoded[%r]; obj.%s = decode_%s(v) if v.__class__ is dict else v" % (name, name, name))
+            else:
+                lines.append("        obj.%s = encoded[%r]" % (name, name))
+        lines += ["    except KeyError:",
+                  "        obj = cls()",
+                  "        for k, v in encoded.items():",
+                  "            if k in fields:",
+                  "                setattr(obj, k, decoders[k](v) if k in decoders and v.__class__ is dict else v)"]
+        env['fields'] = frozenset(fields)
+        env['decoders'] = {name: env['decode_' + name] for name, _ in nested}
+    else:
+        # a missing field falls back to the class attribute
+        lines.append("    d = dict(encoded)")
+        for name, _ in nested:
+            lines.append("    v = d.get(%r)" % name)
+            lines.append("    if v.__class__ is dict: d[%r] = decode_%s(v)" % (name, name))
+        lines.append("    obj.__dict__ = d")
+    lines.append("    return obj")
+
+    exec(compile("\n".join(lines), "<%s decoder>" % cls.__name__, "exec"), env)
+    decoder = _msgpack_decoders[cls] = env['decode']
+    return decoder
 
 
 class ImageType:
@@ -49,9 +121,7 @@ class WeatherParameter:
     Enabled = 8
 
 class Vector3r(MsgpackMixin):
-    x_val = 0.0
-    y_val = 0.0
-    z_val = 0.0
+    __slots__ = ('x_val', 'y_val', 'z_val')
 
     def __init__(self, x_val = 0.0, y_val = 0.0, z_val = 0.0):
         self.x_val = x_val
@@ -107,10 +177,7 @@ class Vector3r(MsgpackMixin):
 
 
 class Quaternionr(MsgpackMixin):
-    w_val = 0.0
-    x_val = 0.0
-    y_val = 0.0
-    z_val = 0.0
+    __slots__ = ('w_val', 'x_val', 'y_val', 'z_val')
 
     def __init__(self, x_val = 0.0, y_val = 0.0, z_val = 0.0, w_val = 1.0):
         self.x_val = x_val
@@ -194,8 +261,7 @@ class Quaternionr(MsgpackMixin):
 
 
 class Pose(MsgpackMixin):
-    position = Vector3r()
-    orientation = Quaternionr()
+    __slots__ = ('position', 'orientation')
 
     def __init__(self, position_val = None, orientation_val = None):
         position_val = position_val if position_val != None else Vector3r()
@@ -282,6 +348,45 @@ class ImageResponse(MsgpackMixin):
     height = 0
     image_type = ImageType.Scene
 
+    def as_array(self):
+        """
+        Pixels of an uncompressed image without copying them
+
+        Returns:
+            numpy.ndarray: Read-only uint8 view over `image_data_uint8`, shaped (height, width, channels)
+        """
+        if self.compress:
+            raise ValueError("as_array needs an uncompressed image, request it with compress = False or decode the PNG in image_data_uint8")
+        pixels = self.width * self.height
+        if pixels == 0 or len(self.image_data_uint8) % pixels != 0:
+            raise ValueError("image_data_uint8 has %d bytes, which does not fit a %dx%d image" % (len(self.image_data_uint8), self.width, self.height))
+        return np.frombuffer(self.image_data_uint8, np.uint8).reshape(self.height, self.width, -1)
+
+    def depth_array(self):
+        """
+        Pixels of a float image, e.g. DepthPerspective requested with pixels_as_float = True
+
+        The float list is converted to float32 in one call on first use and cached, later calls return views over the
+        cached array. The views are read-only so all callers see the received pixels, copy them to change them.
+        `image_data_float` is left as it is.
+
+        Returns:
+            numpy.ndarray: read-only float32 array shaped (height, width)
+        """
+        depth = self.__dict__.get('_depth')
+        if depth is None:
+            depth = self._depth = np.asarray(self.image_data_float, np.float32).reshape(-1)
+            depth.setflags(write = False)
+        if depth.size != self.width * self.height:
+            raise ValueError("image_data_float has %d values, which does not fit a %dx%d image" % (depth.size, self.width, self.height))
+        return depth.reshape(self.height, self.width)
+
+    def to_msgpack(self, *args, **kwargs):
+        # the array cached by depth_array is not a field
+        if '_depth' not in self.__dict__:
+            return self.__dict__
+        return {name: value for name, value in self.__dict__.items() if name != '_depth'}
+
 class CarControls(MsgpackMixin):
     throttle = 0.0
     steering = 0.0
@@ -313,12 +418,16 @@ class CarControls(MsgpackMixin):
             self.throttle = - abs(throttle_val)
 
 class KinematicsState(MsgpackMixin):
-    position = Vector3r()
-    orientation = Quaternionr()
-    linear_velocity = Vector3r()
-    angular_velocity = Vector3r()
-    linear_acceleration = Vector3r()
-    angular_acceleration = Vector3r()
+    __slots__ = ('position', 'orientation', 'linear_velocity', 'angular_velocity', 'linear_acceleration', 'angular_acceleration')
+
+    def __init__(self, position = None, orientation = None, linear_velocity = None, angular_velocity = None,
+                 linear_acceleration = None, angular_acceleration = None):
+        self.position = position if position is not None else Vector3r()
+        self.orientation = orientation if orientation is not None else Quaternionr()
+        self.linear_velocity = linear_velocity if linear_velocity is not None else Vector3r()
+        self.angular_velocity = angular_velocity if angular_velocity is not None else Vector3r()
+        self.linear_acceleration = linear_acceleration if linear_acceleration is not None else Vector3r()
+        self.angular_acceleration = angular_acceleration if angular_acceleration is not None else Vector3r()
 
 class EnvironmentState(MsgpackMixin):
     position = Vector3r()
@@ -362,6 +471,51 @@ class LidarData(MsgpackMixin):
     time_stamp = np.uint64(0)
     pose = Pose()
 
+    def point_array(self):
+        """
+        Returns:
+            numpy.ndarray: (N, 3) float32 points, in the frame set by the DataFrame setting of the lidar
+        """
+        if not isinstance(self.point_cloud, (list, np.ndarray)):
+            return np.zeros((0, 3), np.float32)
+        count = len(self.point_cloud) // 3
+        return np.fromiter(self.point_cloud, np.float32, count * 3).reshape(count, 3)
+
+class LidarScan:
+    """
+    Lidar point cloud held in numpy arrays, returned by `VehicleClient.getLidarScan`
+
+    Attributes:
+        points (numpy.ndarray): (N, 3) float32 points
+        segmentation (numpy.ndarray): (N,) int32 segmentation ID of the object each point hit, None if not requested
+        pose (Pose): Pose of the lidar when the scan was taken
+        time_stamp (int): Time of the scan in nanoseconds
+    """
+    __slots__ = ('points', 'segmentation', 'pose', 'time_stamp')
+
+    def __init__(self, points = None, segmentation = None, pose = None, time_stamp = 0):
+        self.points = points if points is not None else np.zeros((0, 3), np.float32)
+        self.segmentation = segmentation
+        self.pose = pose if pose is not None else Pose()
+        self.time_stamp = time_stamp
+
+    @staticmethod
+    def from_lidar_data(lidar_data, segmentation = None):
+        """
+        Args:
+            lidar_data (LidarData): Result of `getLidarData`
+            segmentation (list[int], optional): Result of `simGetLidarSegmentation` for the same scan
+        """
+        if segmentation is not None:
+            segmentation = np.fromiter(segmentation, np.int32, len(segmentation))
+        return LidarScan(lidar_data.point_array(), segmentation, lidar_data.pose, lidar_data.time_stamp)
+
+    def __len__(self):
+        return len(self.points)
+
+    def __repr__(self):
+        return "<LidarScan> %d points, time_stamp %d" % (len(self.points), self.time_stamp)
+
 class ImuData(MsgpackMixin):
     time_stamp = np.uint64(0)
     orientation = Quaternionr()
@@ -505,3 +659,13 @@ class MeshPositionVertexBuffersResponse(MsgpackMixin):
     vertices = 0.0
     indices = 0.0
     name = ''
+
+
+# generate the decoders of the API types up front, classes defined elsewhere get theirs on first use
+_pending = MsgpackMixin.__subclasses__()
+while _pending:
+    _cls = _pending.pop()
+    _pending.extend(_cls.__subclasses__())
+    if _cls not in _msgpack_decoders:
+        _compile_decoder(_cls)
+del _pending, _cls
@@ -6,6 +6,10 @@ import os
 import inspect
 import types
 import re
+import collections
+import io
+import struct
+import zlib
 
 from .types import *
 
@@ -20,7 +24,8 @@ def list_to_2d_float_array(flst, width, height):
     return np.reshape(np.asarray(flst, np.float32), (height, width))
     
 def get_pfm_array(response):
-    return list_to_2d_float_array(response.image_data_float, response.width, response.height)
+    # a writable copy, depth_array() returns a read-only view of the response's cached pixels
+    return response.depth_array().copy()
 
     
 def get_public_fields(obj):
@@ -90,6 +95,90 @@ def to_quaternion(pitch, roll, yaw):
     q.z_val = t1 * t2 * t4 - t0 * t3 * t5 #z
     return q
 
+# batch versions of the above working on numpy arrays, quaternions are (..., 4) arrays in (x, y, z, w) order
+# like Quaternionr.to_numpy_array() and angles are (..., 3) arrays in (pitch, roll, yaw) order like to_eularian_angles()
+
+def to_eularian_angles_batch(q):
+    q = np.asarray(q)
+    x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    ysqr = y * y
+    roll = np.arctan2(2.0 * (w*x + y*z), 1.0 - 2.0*(x*x + ysqr))
+    pitch = np.arcsin(np.clip(2.0 * (w*y - z*x), -1.0, 1.0))
+    yaw = np.arctan2(2.0 * (w*z + x*y), 1.0 - 2.0*(ysqr + z*z))
+    return np.stack((pitch, roll, yaw), axis = -1)
+
+def to_quaternion_batch(pitch_roll_yaw):
+    half = np.asarray(pitch_roll_yaw) * 0.5
+    cp, cr, cy = np.cos(half[..., 0]), np.cos(half[..., 1]), np.cos(half[..., 2])
+    sp, sr, sy = np.sin(half[..., 0]), np.sin(half[..., 1]), np.sin(half[..., 2])
+    return np.stack((cy * sr * cp - sy * cr * sp,
+                     cy * cr * sp + sy * sr * cp,
+                     sy * cr * cp - cy * sr * sp,
+                     cy * cr * cp + sy * sr * sp), axis = -1)
+
+def to_rotation_matrix_batch(pitch_roll_yaw):
+    """
+    Rotation matrices Rz(yaw) * Ry(pitch) * Rx(roll), shaped (..., 3, 3)
+    """
+    pry = np.asarray(pitch_roll_yaw)
+    cp, cr, cy = np.cos(pry[..., 0]), np.cos(pry[..., 1]), np.cos(pry[..., 2])
+    sp, sr, sy = np.sin(pry[..., 0]), np.sin(pry[..., 1]), np.sin(pry[..., 2])
+    m = np.empty(pry.shape[:-1] + (3, 3), np.result_type(pry, np.float32))
+    m[..., 0, 0] = cy * cp
+    m[..., 0, 1] = cy * sp * sr - sy * cr
+    m[..., 0, 2] = cy * sp * cr + sy * sr
+    m[..., 1, 0] = sy * cp
+    m[..., 1, 1] = sy * sp * sr + cy * cr
+    m[..., 1, 2] = sy * sp * cr - cy * sr
+    m[..., 2, 0] = -sp
+    m[..., 2, 1] = cp * sr
+    m[..., 2, 2] = cp * cr
+    return m
+
+def quaternion_to_rotation_matrix_batch(q):
+    """
+    Rotation matrices of unit quaternions, shaped (..., 3, 3)
+    """
+    q = np.asarray(q)
+    x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    m = np.empty(q.shape[:-1] + (3, 3), np.result_type(q, np.float32))
+    m[..., 0, 0] = 1.0 - 2.0 * (y*y + z*z)
+    m[..., 0, 1] = 2.0 * (x*y - z*w)
+    m[..., 0, 2] = 2.0 * (x*z + y*w)
+    m[..., 1, 0] = 2.0 * (x*y + z*w)
+    m[..., 1, 1] = 1.0 - 2.0 * (x*x + z*z)
+    m[..., 1, 2] = 2.0 * (y*z - x*w)
+    m[..., 2, 0] = 2.0 * (x*z - y*w)
+    m[..., 2, 1] = 2.0 * (y*z + x*w)
+    m[..., 2, 2] = 1.0 - 2.0 * (x*x + y*y)
+    return m
+
+def quaternion_conjugate_batch(q):
+    q = np.array(q)
+    q[..., :3] *= -1
+    return q
+
+def quaternion_multiply_batch(a, b):
+    """
+    Hamilton products a * b, same as Quaternionr.__mul__
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    ax, ay, az, aw = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bx, by, bz, bw = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+    return np.stack((aw*bx + ax*bw + ay*bz - az*by,
+                     aw*by + ay*bw + az*bx - ax*bz,
+                     aw*bz + az*bw + ax*by - ay*bx,
+                     aw*bw - ax*bx - ay*by - az*bz), axis = -1)
+
+def quaternion_rotate_batch(q, v):
+    """
+    Rotates (..., 3) vectors by unit quaternions, q * v * q.conjugate(), broadcasting q against v
+    """
+    q, v = np.asarray(q), np.asarray(v)
+    u, w = q[..., :3], q[..., 3:]
+    t = 2.0 * np.cross(u, v)
+    return v + w * t + np.cross(u, t)
+
     
 def wait_key(message = ''):
     ''' Wait for a key press on the console and return it. '''
@@ -119,27 +208,35 @@ def wait_key(message = ''):
     return result
 
     
-def read_pfm(file):
-    """ Read a pfm file """
-    file = open(file, 'rb')
+class PfmInfo(collections.namedtuple('PfmInfo', ['width', 'height', 'channels', 'scale', 'endian', 'offset'])):
+    """
+    Header of a pfm file, `offset` is the size of the header in bytes, where the pixel data starts
+    """
+    @property
+    def shape(self):
+        return (self.height, self.width, 3) if self.channels == 3 else (self.height, self.width)
 
-    color = None
-    width = None
-    height = None
-    scale = None
-    endian = None
+    @property
+    def dtype(self):
+        return np.dtype(self.endian + 'f4')
 
+def _read_pfm_header(file):
     header = file.readline().rstrip()
     header = str(bytes.decode(header, encoding='utf-8'))
     if header == 'PF':
-        color = True
+        channels = 3
     elif header == 'Pf':
-        color = False
+        channels = 1
     else:
         raise Exception('Not a PFM file.')
 
+    pattern = r'^(\d+)\s(\d+)\s$'
     temp_str = str(bytes.decode(file.readline(), encoding='utf-8'))
-    dim_match = re.match(r'^(\d+)\s(\d+)\s$', temp_str)
+    dim_match = re.match(pattern, temp_str)
+    if not dim_match:
+        # some writers put width and height on separate lines
+        temp_str += str(bytes.decode(file.readline(), encoding='utf-8'))
+        dim_match = re.match(pattern, temp_str)
     if dim_match:
         width, height = map(int, dim_match.groups())
     else:
@@ -152,14 +249,99 @@ def read_pfm(file):
     else:
         endian = '>' # big-endian
 
-    data = np.fromfile(file, endian + 'f')
-    shape = (height, width, 3) if color else (height, width)
+    return PfmInfo(width, height, channels, scale, endian, file.tell())
 
-    data = np.reshape(data, shape)
-    # DEY: I don't know why this was there.
-    file.close()
-    
-    return data, scale
+def pfm_info(file):
+    """
+    Reads only the header of a pfm file
+
+    Returns:
+        PfmInfo: width, height, channels, scale, endian and data offset
+    """
+    with open(file, 'rb') as f:
+        return _read_pfm_header(f)
+
+def read_pfm(file, mmap = False, flip = False):
+    """ Read a pfm file
+
+    Args:
+        file (str): Path of the file
+        mmap (bool, optional): Return a read-only np.memmap of the file instead of reading it, pages are loaded when accessed
+        flip (bool, optional): Reverse the row order. The pfm format stores the bottom row first, while write_pfm (like AirSim)
+            writes the top row first, so only files from other tools need flipping. The flip is a view, it doesn't copy.
+
+    Returns:
+        tuple: (data, scale) with data shaped (H, W) or (H, W, 3)
+    """
+    with open(file, 'rb') as f:
+        info = _read_pfm_header(f)
+        if mmap:
+            data = np.memmap(f, dtype = info.dtype, mode = 'r', offset = info.offset, shape = info.shape)
+        else:
+            data = np.fromfile(f, info.dtype, int(np.prod(info.shape))).reshape(info.shape)
+
+    return (data[::-1] if flip else data), info.scale
+
+class PfmSequenceWriter:
+    """
+    Writes a sequence of same-sized frames as pfm files, e.g. depth images of a recording
+
+    The header is built once and each frame is converted into one preallocated buffer, so writing a frame doesn't allocate.
+
+    Example:
+        with PfmSequenceWriter('depth/frame_%06d.pfm', width, height) as writer:
+            for response in responses:
+                writer.write(response.depth_array())
+
+    Args:
+        pattern (str): Path of the files, formatted with the frame index
+        width (int): Frame width
+        height (int): Frame height
+        channels (int, optional): 1 for greyscale, 3 for color frames
+        scale (float, optional): Scale written to the header
+        flip (bool, optional): Write the bottom row first as the pfm format specifies, see read_pfm
+        start (int, optional): Index of the first frame
+    """
+    def __init__(self, pattern, width, height, channels = 1, scale = 1, flip = False, start = 0):
+        if channels not in (1, 3):
+            raise ValueError('channels must be 1 or 3')
+        self.pattern = pattern
+        self.flip = flip
+        self.index = start
+        self.shape = (height, width, 3) if channels == 3 else (height, width)
+        self._buffer = np.empty(self.shape, '<f4')
+        self._header = ('%s\n%d %d\n%f\n' % ('PF' if channels == 3 else 'Pf', width, height, -scale)).encode('utf-8')
+
+    def write(self, image):
+        """
+        Args:
+            image (numpy.ndarray): Frame of the writer's shape, (H, W, 1) is accepted for greyscale
+
+        Returns:
+            str: Path of the written file
+        """
+        image = np.asarray(image)
+        if image.ndim == 3 and image.shape[2] == 1 and len(self.shape) == 2:
+            image = image[..., 0]
+        if image.shape != self.shape:
+            raise ValueError('Frame shape %s does not match the writer shape %s' % (image.shape, self.shape))
+        np.copyto(self._buffer, image[::-1] if self.flip else image, casting = 'same_kind')
+
+        filename = self.pattern % self.index
+        with open(filename, 'wb') as f:
+            f.write(self._header)
+            f.write(self._buffer.data)
+        self.index += 1
+        return filename
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     
 def write_pfm(file, image, scale=1):
@@ -193,30 +375,79 @@ def write_pfm(file, image, scale=1):
     image.tofile(file)
 
     
-def write_png(filename, image):
-    """ image must be numpy array H X W X channels
+# PNG color type by number of channels: greyscale, greyscale + alpha, RGB, RGBA
+_PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+_PNG_FILTERS = {'none': 0, 'sub': 1, 'up': 2}
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_PNG_SLICE_BYTES = 1 << 20   # uncompressed bytes per IDAT chunk
+
+def _png_chunk(out, png_tag, data):
+    out.write(struct.pack("!I", len(data)))
+    out.write(png_tag)
+    out.write(data)
+    out.write(struct.pack("!I", zlib.crc32(data, zlib.crc32(png_tag)) & 0xFFFFFFFF))
+    return len(data) + 12
+
+def encode_png(image, compression_level = 3, strategy = None, png_filter = 'sub', out = None):
+    """ Encode an image as PNG
+
+    Args:
+        image (numpy.ndarray): H X W or H X W X channels uint8 or uint16 array, 1 to 4 channels as grey, grey + alpha, RGB or RGBA
+        compression_level (int, optional): zlib level, 1-3 are several times faster than 9 for slightly larger files
+        strategy (int, optional): zlib strategy such as zlib.Z_RLE or zlib.Z_FILTERED, zlib's default if None
+        png_filter (str, optional): Scanline filter, 'none', 'sub' or 'up'. Filters usually make rendered images smaller and faster to compress.
+        out (file, optional): Writable file-like, e.g. an open file or io.BytesIO, to encode into instead of returning bytes
+
+    Returns:
+        bytes: Encoded image, or the number of bytes written if `out` is given
     """
-    import zlib, struct
-
-    buf = image.flatten().tobytes()
-    width = image.shape[1]
-    height = image.shape[0]
-
-    # reverse the vertical line order and add null bytes at the start
-    width_byte_3 = width * 3
-    raw_data = b''.join(b'\x00' + buf[span:span + width_byte_3]
-                        for span in range((height - 1) * width_byte_3, -1, - width_byte_3))
-
-    def png_pack(png_tag, data):
-        chunk_head = png_tag + data
-        return (struct.pack("!I", len(data)) +
-                chunk_head +
-                struct.pack("!I", 0xFFFFFFFF & zlib.crc32(chunk_head)))
-
-    png_bytes = b''.join([
-        b'\x89PNG\r\n\x1a\n',
-        png_pack(b'IHDR', struct.pack("!2I5B", width, height, 8, 6, 0, 0, 0)),
-        png_pack(b'IDAT', zlib.compress(raw_data, 9)),
-        png_pack(b'IEND', b'')])
-
-    write_file(filename, png_bytes)
+    image = np.asarray(image)
+    if image.ndim == 2:
+        image = image[..., None]
+    if image.ndim != 3 or image.shape[2] not in _PNG_COLOR_TYPES:
+        raise ValueError('Image must have H x W or H x W x 1, 2, 3 or 4 dimensions, got %s' % (image.shape,))
+    if image.dtype == np.uint8:
+        bit_depth = 8
+    elif image.dtype == np.uint16:
+        bit_depth = 16
+    else:
+        raise ValueError('Image dtype must be uint8 or uint16, got %s' % image.dtype)
+    height, width, channels = image.shape
+
+    # scanlines with their filter type byte in front, 16 bit samples are big-endian
+    rows = np.ascontiguousarray(image, '>u2' if bit_depth == 16 else np.uint8).view(np.uint8).reshape(height, -1)
+    pixel_bytes = channels * bit_depth // 8
+    raw = np.empty((height, rows.shape[1] + 1), np.uint8)
+    raw[:, 0] = _PNG_FILTERS[png_filter]
+    if png_filter == 'sub':
+        raw[:, 1:pixel_bytes + 1] = rows[:, :pixel_bytes]
+        np.subtract(rows[:, pixel_bytes:], rows[:, :-pixel_bytes], out = raw[:, pixel_bytes + 1:])
+    elif png_filter == 'up':
+        raw[:1, 1:] = rows[:1]
+        np.subtract(rows[1:], rows[:-1], out = raw[1:, 1:])
+    else:
+        raw[:, 1:] = rows
+
+    buffer = io.BytesIO() if out is None else out
+    written = len(_PNG_SIGNATURE)
+    buffer.write(_PNG_SIGNATURE)
+    written += _png_chunk(buffer, b'IHDR', struct.pack("!2I5B", width, height, bit_depth, _PNG_COLOR_TYPES[channels], 0, 0, 0))
+
+    # compress in slices and emit one IDAT chunk per slice, so the compressed image is never held in one piece
+    compressor = zlib.compressobj(compression_level, zlib.DEFLATED, zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL,
+                                  zlib.Z_DEFAULT_STRATEGY if strategy is None else strategy)
+    data = memoryview(raw.reshape(-1))
+    for start in range(0, len(data), _PNG_SLICE_BYTES):
+        compressed = compressor.compress(data[start:start + _PNG_SLICE_BYTES])
+        if compressed:
+            written += _png_chunk(buffer, b'IDAT', compressed)
+    written += _png_chunk(buffer, b'IDAT', compressor.flush())
+    written += _png_chunk(buffer, b'IEND', b'')
+
+    return buffer.getvalue() if out is None else written
+
+def write_png(filename, image, compression_level = 3, strategy = None, png_filter = 'sub'):
+    """ image must be numpy array H X W X channels, see encode_png
+    """
+    with open(filename, 'wb') as f:
+        encode_png(image, compression_level, strategy, png_filter, f)
@@ -0,0 +1,46 @@
+# Compares one round trip per call against VehicleClient.batch() for a typical control tick:
+# getMultirotorState for every vehicle plus simGetCollisionInfo and simGetImages.
+# A FakeAirSimServer with a fixed response latency is started locally, so no simulator is needed.
+
+import setup_path
+import airsim
+
+from airsim.testing import FakeAirSimServer
+
+import time
+import argparse
+
+def tick_serial(client, vehicle_names, requests):
+    states = [client.getMultirotorState(name) for name in vehicle_names]
+    return states, client.simGetCollisionInfo(vehicle_names[0]), client.simGetImages(requests, vehicle_names[0])
+
+def tick_batch(client, vehicle_names, requests):
+    with client.batch() as b:
+        for name in vehicle_names:
+            b.getMultirotorState(name)
+        b.simGetCollisionInfo(vehicle_names[0])
+        b.simGetImages(requests, vehicle_names[0])
+    return b.results[:-2], b.results[-2], b.results[-1]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--vehicles', type = int, default = 16)
+    parser.add_argument('--latency', type = float, default = 0.002, help = 'server response latency in seconds')
+    parser.add_argument('--ticks', type = int, default = 50)
+    args = parser.parse_args()
+
+    server = FakeAirSimServer(latency = args.latency).start()
+    client = airsim.MultirotorClient(port = server.port)
+    vehicle_names = ['Drone%d' % i for i in range(args.vehicles)]
+    requests = [airsim.ImageRequest('0', airsim.ImageType.Scene, False, False)]
+
+    for name, tick in (('serial', tick_serial), ('batch', tick_batch)):
+        tick(client, vehicle_names, requests)
+        start = time.time()
+        for _ in range(args.ticks):
+            states, collision, responses = tick(client, vehicle_names, requests)
+        elapsed = (time.time() - start) / args.ticks
+        print("%-6s: %7.2f ms per tick (%d calls), %.1f Hz max" % (name, elapsed * 1000, len(states) + 2, 1 / elapsed))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+# Times utils.write_png against the previous implementation (Python scanline join, zlib level 9) on a synthetic
+# 1080p frame, for each compression level and scanline filter.
+
+import setup_path
+from airsim.utils import encode_png
+
+import numpy as np
+import argparse
+import time
+import zlib
+
+def previous_encode(image):
+    buf = image.flatten().tobytes()
+    width_byte_3 = image.shape[1] * 3
+    raw_data = b''.join(b'\x00' + buf[span:span + width_byte_3]
+                        for span in range((image.shape[0] - 1) * width_byte_3, -1, - width_byte_3))
+    return zlib.compress(raw_data, 9)
+
+def synthetic_frame(width, height):
+    # smooth shading with a flat region, closer to rendered frames than noise
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    image = np.stack([128 + 100 * np.sin(x / 60) * np.cos(y / 45), 128 + 80 * np.sin((x + y) / 90), 255 * y / height], -1)
+    image[height // 4:height // 2, width // 4:width // 2] = [40, 90, 160]
+    return image.astype(np.uint8)
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, len(result)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--width', type = int, default = 1920)
+    parser.add_argument('--height', type = int, default = 1080)
+    parser.add_argument('--repeat', type = int, default = 5)
+    args = parser.parse_args()
+
+    image = synthetic_frame(args.width, args.height)
+    elapsed, size = best_of(lambda: previous_encode(image), args.repeat)
+    print("%-22s %9.1f ms %8d KB" % ('previous, level 9', elapsed, size // 1024))
+    for level in (1, 2, 3, 6, 9):
+        for png_filter in ('none', 'sub', 'up'):
+            elapsed, size = best_of(lambda: encode_png(image, level, png_filter = png_filter), args.repeat)
+            print("%-22s %9.1f ms %8d KB" % ('level %d, %s' % (level, png_filter), elapsed, size // 1024))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+# Micro-benchmarks of the Python client's RPC APIs against a local FakeAirSimServer.
+#
+# For every case the full API call is timed (wire + decode), reporting calls/sec and p50/p99 latency, then the
+# raw msgpack result of the same RPC is decoded on its own to separate decode cost (MsgpackMixin.from_msgpack) from wire time.
+# Results are written as JSON, and a previous results file can be passed with --compare to flag regressions, e.g.
+#
+#   python rpc_benchmark.py --output release_new.json --compare release_old.json
+
+import setup_path
+import airsim
+from airsim.client import _rpc_result_decoders
+from airsim.testing import FakeAirSimServer
+
+import numpy as np
+import msgpack
+import argparse
+import inspect
+import json
+import platform
+import sys
+import time
+
+IMAGE_SIZES = [(256, 144), (640, 480), (1920, 1080)]
+LIDAR_POINTS = [10000, 100000]
+
+def image_request(image_type, pixels_as_float = False, compress = False):
+    return airsim.ImageRequest('0', image_type, pixels_as_float, compress)
+
+def build_cases():
+    """
+    Returns list of (name, group, api_settings, api_name, args, rpc_name)
+    """
+    cases = []
+    for name in ['getMultirotorState', 'getCarState', 'simGetCollisionInfo', 'simGetVehiclePose', 'simGetGroundTruthKinematics',
+                 'getImuData', 'getGpsData', 'ping']:
+        cases.append((name, 'state', {}, name, (), name))
+
+    for width, height in IMAGE_SIZES:
+        size = {'image_width': width, 'image_height': height}
+        suffix = '%dx%d' % (width, height)
+        cases.append(('simGetImages_scene_' + suffix, 'image', size, 'simGetImages',
+                      ([image_request(airsim.ImageType.Scene)],), 'simGetImages'))
+        cases.append(('simGetImages_scene_png_' + suffix, 'image', size, 'simGetImages',
+                      ([image_request(airsim.ImageType.Scene, compress = True)],), 'simGetImages'))
+        cases.append(('simGetImages_depth_float_' + suffix, 'image', size, 'simGetImages',
+                      ([image_request(airsim.ImageType.DepthPerspective, pixels_as_float = True)],), 'simGetImages'))
+
+    for points in LIDAR_POINTS:
+        cases.append(('getLidarData_%dk' % (points // 1000), 'lidar', {'lidar_points': points}, 'getLidarData', (), 'getLidarData'))
+
+    cases.append(('simGetMeshPositionVertexBuffers', 'mesh', {'mesh_count': 20, 'mesh_vertices': 5000},
+                  'simGetMeshPositionVertexBuffers', (), 'simGetMeshPositionVertexBuffers'))
+
+    points = [airsim.Vector3r(i, 0, -1) for i in range(1000)]
+    poses = [airsim.Pose(airsim.Vector3r(i, 0, -1)) for i in range(100)]
+    cases.append(('simPlotPoints_1000', 'plot', {}, 'simPlotPoints', (points,), 'simPlotPoints'))
+    cases.append(('simPlotLineStrip_1000', 'plot', {}, 'simPlotLineStrip', (points,), 'simPlotLineStrip'))
+    cases.append(('simPlotTransforms_100', 'plot', {}, 'simPlotTransforms', (poses,), 'simPlotTransforms'))
+    return cases
+
+def measure(fn, min_time, min_calls, max_calls):
+    fn()
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < max_calls and (len(samples) < min_calls or time.perf_counter() - start < min_time):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    samples = np.array(samples) * 1000
+    return {'calls': len(samples), 'calls_per_sec': len(samples) / elapsed, 'mean_ms': float(samples.mean()),
+            'p50_ms': float(np.percentile(samples, 50)), 'p99_ms': float(np.percentile(samples, 99))}
+
+def wire_args(api, api_args):
+    # arguments the API sends to the server, including its defaults such as vehicle_name
+    bound = inspect.signature(api).bind(*api_args)
+    bound.apply_defaults()
+    return bound.args
+
+class _CarAndMultirotorClient(airsim.MultirotorClient, airsim.CarClient):
+    pass
+
+def run(args):
+    server = FakeAirSimServer(latency = args.latency).start()
+    client = _CarAndMultirotorClient(port = server.port)
+    client.ping()
+
+    results = {}
+    for name, group, settings, api_name, api_args, rpc_name in build_cases():
+        if args.filter and args.filter not in name and args.filter != group:
+            continue
+        for key, value in settings.items():
+            setattr(server.api, key, value)
+        api = getattr(client, api_name)
+        result = measure(lambda: api(*api_args), args.min_time, args.min_calls, args.max_calls)
+        result['group'] = group
+
+        decoder = _rpc_result_decoders.get(rpc_name)
+        if decoder is not None:
+            raw = client.client.call(rpc_name, *wire_args(api, api_args))
+            result['raw_bytes'] = len(msgpack.packb(raw, use_bin_type = True))
+            decode = measure(lambda: decoder(raw), args.min_time / 2, args.min_calls, args.max_calls)
+            result['decode'] = {k: decode[k] for k in ('mean_ms', 'p50_ms', 'p99_ms')}
+            result['wire_mean_ms'] = max(result['mean_ms'] - decode['mean_ms'], 0.0)
+
+        results[name] = result
+        print("%-40s %9.1f calls/s  p50 %8.3f ms  p99 %8.3f ms%s" % (name, result['calls_per_sec'], result['p50_ms'], result['p99_ms'],
+              "  decode %8.3f ms" % result['decode']['mean_ms'] if 'decode' in result else ''))
+
+    server.stop()
+    return results
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print("\n%-40s %12s %12s %8s" % ('case', 'baseline p50', 'p50', 'ratio'))
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        for metric, value, base in [('p50_ms', result['p50_ms'], baseline[name]['p50_ms'])] + \
+                ([('decode.p50_ms', result['decode']['p50_ms'], baseline[name]['decode']['p50_ms'])]
+                 if 'decode' in result and 'decode' in baseline[name] else []):
+            ratio = value / base if base > 0 else float('inf')
+            if metric == 'p50_ms':
+                print("%-40s %12.3f %12.3f %7.2fx" % (name, base, value, ratio))
+            if ratio > 1 + threshold:
+                regressions.append((name, metric, base, value))
+    for name, metric, base, value in regressions:
+        print("REGRESSION %s %s: %.3f ms -> %.3f ms" % (name, metric, base, value))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmark the AirSim Python client against a local fake server')
+    parser.add_argument('--output', default = 'rpc_benchmark.json', help = 'JSON file to write results to')
+    parser.add_argument('--compare', help = 'previous JSON results to compare against')
+    parser.add_argument('--threshold', type = float, default = 0.2, help = 'relative slowdown reported as regression')
+    parser.add_argument('--filter', help = 'only run cases whose name contains this string, or of this group')
+    parser.add_argument('--latency', type = float, default = 0.0, help = 'server response latency in seconds')
+    parser.add_argument('--min-time', type = float, default = 1.0, help = 'seconds to run each case for')
+    parser.add_argument('--min-calls', type = int, default = 5)
+    parser.add_argument('--max-calls', type = int, default = 10000)
+    args = parser.parse_args()
+
+    results = run(args)
+    report = {'meta': {'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': platform.python_version(), 'platform': platform.platform(),
+                       'numpy': np.__version__, 'msgpack': '.'.join(map(str, msgpack.version)), 'latency': args.latency},
+              'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent = 2, sort_keys = True)
+    print("\nResults written to %s" % args.output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -8,37 +8,8 @@ import glob
 from airsim import *
 
 def rotation_matrix_from_angles(pry):
-    pitch = pry[0]
-    roll = pry[1]
-    yaw = pry[2]
-    sy = numpy.sin(yaw)
-    cy = numpy.cos(yaw)
-    sp = numpy.sin(pitch)
-    cp = numpy.cos(pitch)
-    sr = numpy.sin(roll)
-    cr = numpy.cos(roll)
-    
-    Rx = numpy.array([
-        [1, 0, 0],
-        [0, cr, -sr],
-        [0, sr, cr]
-    ])
-    
-    Ry = numpy.array([
-        [cp, 0, sp],
-        [0, 1, 0],
-        [-sp, 0, cp]
-    ])
-    
-    Rz = numpy.array([
-        [cy, -sy, 0],
-        [sy, cy, 0],
-        [0, 0, 1]
-    ])
-    
-    #Roll is applied first, then pitch, then yaw.
-    RyRx = numpy.matmul(Ry, Rx)
-    return numpy.matmul(Rz, RyRx)
+    #Roll is applied first, then pitch, then yaw. Also takes (N,3) angles and returns (N,3,3) matrices.
+    return utils.to_rotation_matrix_batch(pry)
 
 def project_3d_point_to_screen(subjectXYZ, camXYZ, camQuaternion, camProjMatrix4x4, imageWidthHeight):
     #Turn the camera position into a column vector.
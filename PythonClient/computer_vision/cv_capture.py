@@ -28,6 +28,7 @@ except OSError:
     if not os.path.isdir(tmp_dir):
         raise
 
+writer = airsim.io.AsyncFrameWriter() # writes the images while the next ones are captured
 for x in range(50): # do few times
     #xn = 1 + x*5  # some random number
     client.simSetVehiclePose(airsim.Pose(airsim.Vector3r(x, 0, -2), airsim.to_quaternion(0, 0, 0)), True)
@@ -41,15 +42,17 @@ for x in range(50): # do few times
     for i, response in enumerate(responses):
         if response.pixels_as_float:
             print("Type %d, size %d, pos %s" % (response.image_type, len(response.image_data_float), pprint.pformat(response.camera_position)))
-            airsim.write_pfm(os.path.normpath(os.path.join(tmp_dir, str(x) + "_" + str(i) + '.pfm')), airsim.get_pfm_array(response))
+            writer.write(os.path.normpath(os.path.join(tmp_dir, str(x) + "_" + str(i) + '.pfm')), response)
         else:
             print("Type %d, size %d, pos %s" % (response.image_type, len(response.image_data_uint8), pprint.pformat(response.camera_position)))
-            airsim.write_file(os.path.normpath(os.path.join(tmp_dir, str(i), str(x) + "_" + str(i) + '.png')), response.image_data_uint8)
+            writer.write(os.path.normpath(os.path.join(tmp_dir, str(i), str(x) + "_" + str(i) + '.png')), response.image_data_uint8)
 
     pose = client.simGetVehiclePose()
     pp.pprint(pose)
 
     time.sleep(3)
 
+writer.close()
+
 # currently reset() doesn't work in CV mode. Below is the workaround
 client.simSetVehiclePose(airsim.Pose(airsim.Vector3r(0, 0, 0), airsim.to_quaternion(0, 0, 0)), True)
@@ -11,6 +11,12 @@ import h5py
 from pathlib import Path
 import copy
 import re
+import concurrent.futures
+import hashlib
+import json
+import itertools
+import time
+from collections import deque
 
 
 # This constant is used as an upper bound  for normalizing the car's speed to be between 0 and 1 
@@ -82,53 +88,74 @@ def splitTrainValidationAndTestData(all_data_mappings, split_ratio=(0.7, 0.2, 0.
 
     return [train_data_mappings, validation_data_mappings, test_data_mappings]
     
-def generateDataMapAirSim(folders):
-    """ Data map generator for simulator(AirSim) data. Reads the driving_log csv file and returns a list of 'center camera image name - label(s)' tuples
+def generateFolderDataMapAirSim(folder):
+    """ Data map generator for one folder of simulator(AirSim) data, see generateDataMapAirSim.
            Inputs:
-               folders: list of folders to collect data from
+               folder: folder to collect data from
 
            Returns:
-               mappings: All data mappings as a dictionary. Key is the image filepath, the values are a 2-tuple:
-                   0 -> label(s) as a list of double
-                   1 -> previous state as a list of double
+               mappings: list of (image filepath, (label(s), previous state)) tuples in recording order
     """
+    print('Reading data from {0}...'.format(folder))
+    current_df = pd.read_csv(os.path.join(folder, 'airsim_rec.txt'), sep='\t')
+    row_count = current_df.shape[0]
+    if row_count < 3:
+        return []
 
-    all_mappings = {}
-    for folder in folders:
-        print('Reading data from {0}...'.format(folder))
-        current_df = pd.read_csv(os.path.join(folder, 'airsim_rec.txt'), sep='\t')
-        
-        for i in range(1, current_df.shape[0] - 1): 
+    # Each row i in [1, row_count - 1) is a training example, whole columns are computed at once
+    previous_rows = slice(0, row_count - 2)
+    current_rows = slice(1, row_count - 1)
+    next_rows = slice(2, row_count)
 
-            
-            if current_df.iloc[i-1]['Brake'] != 0:   # Consider only training examples without breaks
-                continue
+    norm_steering = (current_df['Steering'].values.astype(np.float64) + 1) / 2.0  # Normalize steering: between 0 and 1
+    norm_throttle = current_df['Throttle'].values.astype(np.float64)
+    norm_speed = current_df['Speed (kmph)'].values.astype(np.float64) / MAX_SPEED  # Normalize speed: between 0 and 1
 
+    #compute average steering over 3 consecutive recorded images, this will serve as the label
+    average_steering = (norm_steering[previous_rows] + norm_steering[current_rows] + norm_steering[next_rows]) / 3.0
 
-            norm_steering = [ (float(current_df.iloc[i-1][['Steering']]) + 1) / 2.0 ]  # Normalize steering: between 0 and 1
-            norm_throttle = [ float(current_df.iloc[i-1][['Throttle']]) ]
-            norm_speed = [ float(current_df.iloc[i-1][['Speed (kmph)']]) / MAX_SPEED ]  # Normalize speed: between 0 and 1
+    keep = current_df['Brake'].values[previous_rows] == 0   # Consider only training examples without breaks
 
+    image_names = current_df['ImageName'].values[current_rows][keep]
+    image_folder = os.path.join(folder, 'images')
+    labels = average_steering[keep].tolist()
+    previous_states = np.stack([norm_steering[previous_rows], norm_throttle[previous_rows], norm_speed[previous_rows]], axis=1)[keep].tolist()
 
-            previous_state = norm_steering + norm_throttle + norm_speed   # Append lists
+    return [(os.path.join(image_folder, image_name).replace('\\', '/'), ([label], previous_state))
+            for image_name, label, previous_state in zip(image_names, labels, previous_states)]
 
+def generateFolderDataMapsAirSim(folders, workers=None):
+    """ Runs generateFolderDataMapAirSim for each folder, in a process pool if there are several folders
+           Returns:
+               list of the mappings of each folder, in folder order
+    """
+    if len(folders) > 1 and workers != 1:
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            return list(executor.map(generateFolderDataMapAirSim, folders))
+    return [generateFolderDataMapAirSim(folder) for folder in folders]
 
-            #compute average steering over 3 consecutive recorded images, this will serve as the label
+def generateDataMapAirSim(folders, workers=None):
+    """ Data map generator for simulator(AirSim) data. Reads the driving_log csv file and returns a list of 'center camera image name - label(s)' tuples
+           Inputs:
+               folders: list of folders to collect data from
+               workers: number of processes parsing folders in parallel, all cores if None, 1 to parse in this process
 
-            norm_steering0 = (float(current_df.iloc[i][['Steering']]) + 1) / 2.0
-            norm_steering1 = (float(current_df.iloc[i+1][['Steering']]) + 1) / 2.0
+           Returns:
+               mappings: All data mappings as a dictionary. Key is the image filepath, the values are a 2-tuple:
+                   0 -> label(s) as a list of double
+                   1 -> previous state as a list of double
+    """
 
-            temp_sum_steering = norm_steering[0] + norm_steering0 + norm_steering1
-            average_steering = temp_sum_steering / 3.0
+    folder_mappings = generateFolderDataMapsAirSim(folders, workers)
 
-            current_label = [average_steering]
-            
-            image_filepath = os.path.join(os.path.join(folder, 'images'), current_df.iloc[i]['ImageName']).replace('\\', '/')
-            
+    # Merge in folder order, so the mappings and their shuffled order don't depend on the number of workers
+    all_mappings = {}
+    for mappings in folder_mappings:
+        for image_filepath, value in mappings:
             if (image_filepath in all_mappings):
                 print('Error: attempting to add image {0} twice.'.format(image_filepath))
-            
-            all_mappings[image_filepath] = (current_label, previous_state)
+
+            all_mappings[image_filepath] = value
 
     mappings = [(key, all_mappings[key]) for key in all_mappings]
     
@@ -137,14 +164,14 @@ def generateDataMapAirSim(folders):
     return mappings
 
 
-def generatorForH5py(data_mappings, chunk_size=32):
+def generatorForH5py(data_mappings, chunk_size=32, keep_partial_chunk=False):
     """
-    This function batches the data for saving to the H5 file
+    This function batches the data for saving to the H5 file, the last chunk is dropped if it has less than chunk_size rows unless keep_partial_chunk is set
     """
     for chunk_id in range(0, len(data_mappings), chunk_size):
         # Data is expected to be a dict of <image: (label, previousious_state)>
         data_chunk = data_mappings[chunk_id:chunk_id + chunk_size]
-        if (len(data_chunk) == chunk_size):
+        if (len(data_chunk) == chunk_size or keep_partial_chunk):
             image_names_chunk = [a for (a, b) in data_chunk]
             labels_chunk = np.asarray([b[0] for (a, b) in data_chunk])
             previous_state_chunk = np.asarray([b[1] for (a, b) in data_chunk])
@@ -152,74 +179,257 @@ def generatorForH5py(data_mappings, chunk_size=32):
             #Flatten and yield as tuple
             yield (image_names_chunk, labels_chunk.astype(float), previous_state_chunk.astype(float))
             if chunk_id + chunk_size > len(data_mappings):
-                raise StopIteration
-    raise StopIteration
+                return
     
     
-def saveH5pyData(data_mappings, target_file_path, chunk_size):
+def saveH5pyData(data_mappings, target_file_path, chunk_size, workers=None, prefetch=None, hdf5_chunk_rows=None, compression=None, compression_level=None,
+                 append=False):
     """
-    Saves H5 data to file
+    Saves H5 data to file. Images of the next chunks are loaded by a pool of threads while the current chunk is written.
+            Inputs:
+                data_mappings: mappings to save, only full chunks of chunk_size are saved unless appending
+                target_file_path: h5 file to write
+                chunk_size: number of rows loaded and written at a time
+                workers: number of image loading threads, os.cpu_count() if None
+                prefetch: number of chunks loaded ahead of the one being written, 2 * workers if None
+                hdf5_chunk_rows: rows per HDF5 chunk, chunk_size if None
+                compression: HDF5 compression, None, 'lzf' or 'gzip'
+                compression_level: gzip level from 0 to 9
+                append: add all rows, including a last partial chunk, after the rows already in the file
+            Returns:
+                (start, stop) range of the rows written
     """
-    gen = generatorForH5py(data_mappings,chunk_size)
-
-    image_names_chunk, labels_chunk, previous_state_chunk = next(gen)
-    images_chunk = np.asarray(readImagesFromPath(image_names_chunk))
-    row_count = images_chunk.shape[0]
+    workers = workers or os.cpu_count() or 1
+    prefetch = prefetch or 2 * workers
+    hdf5_chunk_rows = hdf5_chunk_rows or chunk_size
+    # generatorForH5py only yields full chunks unless appending
+    row_count = len(data_mappings) if append else (len(data_mappings) // chunk_size) * chunk_size
+    if row_count == 0:
+        if not append:
+            print('Not enough data for a chunk of {0} rows, skipping {1}.'.format(chunk_size, target_file_path))
+            return (0, 0)
+        existing_rows = h5pyRowCount(target_file_path)
+        return (existing_rows, existing_rows)
+
+    start_time = time.time()
+    gen = generatorForH5py(data_mappings, chunk_size, keep_partial_chunk=append)
+    image_bytes = 0
 
     checkAndCreateDir(target_file_path)
-    with h5py.File(target_file_path, 'w') as f:
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor, h5py.File(target_file_path, 'a' if append else 'w') as f:
+        pending = deque()
+        def loadNextChunks():
+            # keep `prefetch` chunks loading, each is read by one thread
+            for image_names_chunk, label_chunk, previous_state_chunk in itertools.islice(gen, prefetch - len(pending)):
+                pending.append((executor.submit(readImagesFromPath, image_names_chunk), label_chunk, previous_state_chunk))
+
+        loadNextChunks()
+        dset_images = dset_labels = dset_previous_state = None
+        if 'image' in f:
+            dset_images, dset_labels, dset_previous_state = f['image'], f['label'], f['previous_state']
+            first_row = dset_images.shape[0]
+            for dset in (dset_images, dset_labels, dset_previous_state):
+                dset.resize(first_row + row_count, axis=0)
+        else:
+            first_row = 0
+        row = first_row
+        while pending:
+            images_future, label_chunk, previous_state_chunk = pending.popleft()
+            loadNextChunks()
+            image_chunk = np.asarray(images_future.result())
+
+            if dset_images is None:
+                # The row count is known, so the datasets are allocated once instead of resized for every chunk
+                def createDataset(name, chunk):
+                    return f.create_dataset(name, shape=(row_count,) + chunk.shape[1:], maxshape=(None,) + chunk.shape[1:],
+                                            chunks=(hdf5_chunk_rows if append else min(hdf5_chunk_rows, row_count),) + chunk.shape[1:], dtype=chunk.dtype,
+                                            compression=compression, compression_opts=compression_level)
+                dset_images = createDataset('image', image_chunk)
+                dset_labels = createDataset('label', label_chunk)
+                dset_previous_state = createDataset('previous_state', previous_state_chunk)
+
+            dset_images[row:row + image_chunk.shape[0]] = image_chunk
+            dset_labels[row:row + label_chunk.shape[0]] = label_chunk
+            dset_previous_state[row:row + previous_state_chunk.shape[0]] = previous_state_chunk
 
-        # Initialize a resizable dataset to hold the output
-        images_chunk_maxshape = (None,) + images_chunk.shape[1:]
-        labels_chunk_maxshape = (None,) + labels_chunk.shape[1:]
-        previous_state_maxshape = (None,) + previous_state_chunk.shape[1:]
+            # Increment the row count
+            row += image_chunk.shape[0]
+            image_bytes += image_chunk.nbytes
 
-        dset_images = f.create_dataset('image', shape=images_chunk.shape, maxshape=images_chunk_maxshape,
-                                chunks=images_chunk.shape, dtype=images_chunk.dtype)
+    elapsed = max(time.time() - start_time, 1e-9)
+    print('Saved {0} images ({1:.1f} MB) to {2} in {3:.1f}s: {4:.1f} images/s, {5:.1f} MB/s, {6:.1f} MB on disk.'.format(
+        row - first_row, image_bytes / 1e6, target_file_path, elapsed, (row - first_row) / elapsed, image_bytes / 1e6 / elapsed,
+        os.path.getsize(target_file_path) / 1e6))
+    return (first_row, row)
 
-        dset_labels = f.create_dataset('label', shape=labels_chunk.shape, maxshape=labels_chunk_maxshape,
-                                       chunks=labels_chunk.shape, dtype=labels_chunk.dtype)
-        
-        dset_previous_state = f.create_dataset('previous_state', shape=previous_state_chunk.shape, maxshape=previous_state_maxshape,
-                                       chunks=previous_state_chunk.shape, dtype=previous_state_chunk.dtype)
-                                       
-        dset_images[:] = images_chunk
-        dset_labels[:] = labels_chunk
-        dset_previous_state[:] = previous_state_chunk
-
-        for image_names_chunk, label_chunk, previous_state_chunk in gen:
-            image_chunk = np.asarray(readImagesFromPath(image_names_chunk))
-            
-            # Resize the dataset to accommodate the next chunk of rows
-            dset_images.resize(row_count + image_chunk.shape[0], axis=0)
-            dset_labels.resize(row_count + label_chunk.shape[0], axis=0)
-            dset_previous_state.resize(row_count + previous_state_chunk.shape[0], axis=0)
-            # Create the next chunk
-            dset_images[row_count:] = image_chunk
-            dset_labels[row_count:] = label_chunk
-            dset_previous_state[row_count:] = previous_state_chunk
 
-            # Increment the row count
-            row_count += image_chunk.shape[0]
+def h5pyRowCount(target_file_path):
+    """
+    Number of rows in an H5 file written by saveH5pyData, 0 if it doesn't exist
+    """
+    if not os.path.isfile(target_file_path):
+        return 0
+    with h5py.File(target_file_path, 'r') as f:
+        return f['image'].shape[0] if 'image' in f else 0
+
+
+def truncateH5pyData(target_file_path, row_count):
+    """
+    Drops the rows after the first row_count rows of an H5 file written by saveH5pyData
+    """
+    if h5pyRowCount(target_file_path) > row_count:
+        with h5py.File(target_file_path, 'a') as f:
+            for name in ('image', 'label', 'previous_state'):
+                f[name].resize(row_count, axis=0)
+
+
+def removeH5pyRows(target_file_path, start, stop, chunk_size=1024):
+    """
+    Removes the rows start to stop of an H5 file written by saveH5pyData, the following rows move up
+    """
+    with h5py.File(target_file_path, 'a') as f:
+        for name in ('image', 'label', 'previous_state'):
+            dset = f[name]
+            row_count = dset.shape[0]
+            for source in range(stop, row_count, chunk_size):
+                rows = min(chunk_size, row_count - source)
+                dset[source - (stop - start):source - (stop - start) + rows] = dset[source:source + rows]
+            dset.resize(row_count - (stop - start), axis=0)
             
             
-def cook(folders, output_directory, train_eval_test_split, chunk_size):
+# Manifest of the folders cooked into the h5 files, stored next to them
+MANIFEST_FILE = 'cook_manifest.json'
+
+
+def hashFile(file_path, block_size=1 << 20):
+    """
+    SHA-1 of a file's contents as a hex string
+    """
+    sha1 = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def splitForImage(image_filepath, split_ratio):
+    """
+    Index of the split (train, eval, test) of an image. It only depends on the image path, so an image stays in its split when data is added.
+    """
+    position = int(hashlib.md5(image_filepath.encode('utf-8')).hexdigest()[:15], 16) / float(1 << 60)
+    return min(int(np.searchsorted(np.cumsum(split_ratio), position, side='right')), len(split_ratio) - 1)
+
+
+def readManifest(output_directory):
+    manifest_path = os.path.join(output_directory, MANIFEST_FILE)
+    if not os.path.isfile(manifest_path):
+        return None
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+
+def writeManifest(output_directory, manifest):
+    # written to a temporary file and renamed, so the manifest is never partially written
+    manifest_path = os.path.join(output_directory, MANIFEST_FILE)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+
+def cook(folders, output_directory, train_eval_test_split, chunk_size, workers=None, hdf5_chunk_rows=None, compression=None, compression_level=None):
     """ Primary function for data pre-processing. Reads and saves all data as h5 files.
+        The cooked folders are recorded in a manifest next to the h5 files, so only new or changed folders are parsed and appended on later runs.
+        The rows of folders which are no longer listed are removed.
+        Each image is assigned to train, eval or test by a hash of its path, so rows never move between the files.
             Inputs:
                 folders: a list of all data folders
                 output_directory: location for saving h5 files
                 train_eval_test_split: dataset split ratio
+                chunk_size: number of rows loaded and written at a time
+                workers, hdf5_chunk_rows, compression, compression_level: see saveH5pyData
     """
     output_files = [os.path.join(output_directory, f) for f in ['train.h5', 'eval.h5', 'test.h5']]
-    if (any([os.path.isfile(f) for f in output_files])):
-       print("Preprocessed data already exists at: {0}. Skipping preprocessing.".format(output_directory))
-
-    else:
-        all_data_mappings = generateDataMapAirSim(folders)
-        
-        split_mappings = splitTrainValidationAndTestData(all_data_mappings, split_ratio=train_eval_test_split)
-        
-        for i in range(0, len(split_mappings)-1, 1):
-            print('Processing {0}...'.format(output_files[i]))
-            saveH5pyData(split_mappings[i], output_files[i], chunk_size)
-            print('Finished saving {0}.'.format(output_files[i]))
\ No newline at end of file
+    split_names = ['train', 'eval', 'test']
+    manifest = readManifest(output_directory)
+    if manifest is None and (any([os.path.isfile(f) for f in output_files])):
+       print("Preprocessed data already exists at: {0} without a {1}. Skipping preprocessing.".format(output_directory, MANIFEST_FILE))
+       return
+
+    if manifest is None:
+        manifest = {'version': 1, 'split_ratio': list(train_eval_test_split), 'folders': {}}
+    elif manifest['split_ratio'] != list(train_eval_test_split):
+        print("Error: {0} was cooked with split ratio {1}, delete it to cook with {2}.".format(output_directory, manifest['split_ratio'], train_eval_test_split))
+        sys.exit()
+    checkAndCreateDir(os.path.join(output_directory, MANIFEST_FILE))
+
+    # The folders are in the order of their rows in every split. A removal interrupted while moving up rows leaves the folders after the
+    # removed one in an unknown state, they are dropped and cooked again.
+    pending = manifest.pop('pending', None)
+    if pending is not None:
+        keys = list(manifest['folders'].keys())
+        dropped = keys[keys.index(pending):] if pending in keys else []
+        print('Removal of {0} was interrupted, cooking {1} again.'.format(pending, ', '.join(dropped[1:]) or 'nothing'))
+        for key in dropped:
+            del manifest['folders'][key]
+        writeManifest(output_directory, manifest)
+
+    # Rows written after the last manifest update belong to an interrupted run
+    for i in range(0, len(split_names)-1, 1):
+        truncateH5pyData(output_files[i], max([entry['rows'][split_names[i]][1] for entry in manifest['folders'].values()] + [0]))
+
+    changed_folders = []
+    folder_keys = set()
+    for folder in folders:
+        key = os.path.normpath(folder).replace('\\', '/')
+        folder_keys.add(key)
+        record_path = os.path.join(folder, 'airsim_rec.txt')
+        stat = os.stat(record_path)
+        entry = manifest['folders'].get(key)
+        if entry is not None and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            continue
+        content_hash = hashFile(record_path)
+        if entry is not None and entry['sha1'] == content_hash:
+            entry['mtime'] = stat.st_mtime
+            continue
+        changed_folders.append((folder, key, {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha1': content_hash}))
+
+    # Folders no longer listed and changed folders lose their rows, the rows of the folders cooked after them move up
+    removed_keys = [key for key in manifest['folders'] if key not in folder_keys]
+    removed_keys += [key for _, key, _ in changed_folders if key in manifest['folders']]
+    for key in removed_keys:
+        print('Removing data of {0}...'.format(key))
+        manifest['pending'] = key
+        writeManifest(output_directory, manifest)
+        old_entry = manifest['folders'].pop(key)
+        for i in range(0, len(split_names)-1, 1):
+            start, stop = old_entry['rows'][split_names[i]]
+            if stop > start:
+                removeH5pyRows(output_files[i], start, stop)
+            for other in manifest['folders'].values():
+                other_start, other_stop = other['rows'][split_names[i]]
+                if other_start >= stop:
+                    other['rows'][split_names[i]] = [other_start - (stop - start), other_stop - (stop - start)]
+        del manifest['pending']
+        writeManifest(output_directory, manifest)
+
+    if not changed_folders:
+        writeManifest(output_directory, manifest)
+        print("Preprocessed data at {0} is up to date.".format(output_directory))
+        return
+
+    folder_mappings = generateFolderDataMapsAirSim([folder for folder, _, _ in changed_folders], workers)
+    for (folder, key, entry), mappings in zip(changed_folders, folder_mappings):
+        split_mappings = [[] for _ in split_names]
+        for mapping in mappings:
+            split_mappings[splitForImage(mapping[0], train_eval_test_split)].append(mapping)
+
+        entry['rows'] = {}
+        for i in range(0, len(split_names)-1, 1):
+            random.shuffle(split_mappings[i])
+            print('Processing {0} for {1}...'.format(folder, output_files[i]))
+            entry['rows'][split_names[i]] = list(saveH5pyData(split_mappings[i], output_files[i], chunk_size, workers=workers, hdf5_chunk_rows=hdf5_chunk_rows,
+                                                             compression=compression, compression_level=compression_level, append=True))
+        entry['rows']['test'] = [0, 0]
+        manifest['folders'][key] = entry
+        writeManifest(output_directory, manifest)
+        print('Finished {0}.'.format(folder))
@@ -7,6 +7,9 @@ import PIL
 from PIL import Image
 from PIL import ImageChops
 import cv2
+import concurrent.futures
+import queue
+from collections import deque
 
 
 class DriveDataGenerator(image.ImageDataGenerator):
@@ -53,7 +56,7 @@ class DriveDataGenerator(image.ImageDataGenerator):
         self.brighten_range = brighten_range
 
     def flow(self, x_images, x_prev_states = None, y=None, batch_size=32, shuffle=True, seed=None,
-             save_to_dir=None, save_prefix='', save_format='png', zero_drop_percentage=0.5, roi=None):
+             save_to_dir=None, save_prefix='', save_format='png', zero_drop_percentage=0.5, roi=None, workers=0, prefetch=None):
         return DriveIterator(
             x_images, x_prev_states, y, self,
             batch_size=batch_size,
@@ -64,7 +67,9 @@ class DriveDataGenerator(image.ImageDataGenerator):
             save_prefix=save_prefix,
             save_format=save_format,
             zero_drop_percentage=zero_drop_percentage,
-            roi=roi)
+            roi=roi,
+            workers=workers,
+            prefetch=prefetch)
     
     def random_transform_with_states(self, x, seed=None):
         """Randomly augment a single image tensor.
@@ -74,9 +79,10 @@ class DriveDataGenerator(image.ImageDataGenerator):
         # Returns
             A tuple. 0 -> randomly transformed version of the input (same shape). 1 -> true if image was horizontally flipped, false otherwise
         """
-        img_row_axis = self.row_axis
-        img_col_axis = self.col_axis
-        img_channel_axis = self.channel_axis
+        # the axes of the generator are those of a batch, a single image has no batch axis
+        img_row_axis = self.row_axis - 1
+        img_col_axis = self.col_axis - 1
+        img_channel_axis = self.channel_axis - 1
 
         is_image_horizontally_flipped = False
 
@@ -160,11 +166,94 @@ class DriveDataGenerator(image.ImageDataGenerator):
 
         return (x, is_image_horizontally_flipped)
 
+    def random_transform_batch_with_states(self, x):
+        """Randomly augment a batch of image tensors in place, drawing the random parameters of all images at once.
+        Shifts are rounded to whole pixels. Batches are augmented image by image with random_transform_with_states
+        if a rotation, shear or zoom is set, which need an interpolated transform.
+        # Arguments
+            x: 4D tensor, batch of images.
+        # Returns
+            A tuple. 0 -> x, randomly transformed. 1 -> boolean array, true for the images which were horizontally flipped
+        """
+        batch_size = x.shape[0]
+        if self.rotation_range or self.shear_range or self.zoom_range[0] != 1 or self.zoom_range[1] != 1:
+            is_horiz_flipped = np.zeros(batch_size, dtype=bool)
+            for i in range(batch_size):
+                x[i], is_horiz_flipped[i] = self.random_transform_with_states(x[i])
+            return (x, is_horiz_flipped)
+
+        img_row_axis = self.row_axis
+        img_col_axis = self.col_axis
+        img_channel_axis = self.channel_axis
+
+        if self.height_shift_range or self.width_shift_range:
+            rows = self.__shifted_indexes(x.shape[img_row_axis], self.height_shift_range, batch_size)
+            cols = self.__shifted_indexes(x.shape[img_col_axis], self.width_shift_range, batch_size)
+            # Gather every image from its shifted rows and columns, pixels shifted in from outside are filled with cval if fill_mode is 'constant'
+            batch_index = np.arange(batch_size)[:, None, None]
+            if img_channel_axis == 1:
+                shifted = x.transpose(0, 2, 3, 1)[batch_index, rows[:, :, None], cols[:, None, :]].transpose(0, 3, 1, 2)
+            else:
+                shifted = x[batch_index, rows[:, :, None], cols[:, None, :]]
+            if self.fill_mode == 'constant':
+                outside = (rows[:, :, None] < 0) | (cols[:, None, :] < 0)
+                shifted[np.expand_dims(outside, img_channel_axis).repeat(x.shape[img_channel_axis], img_channel_axis)] = self.cval
+            x[...] = shifted
+
+        if self.channel_shift_range != 0:
+            # like random_channel_shift, every channel of every image gets its own offset
+            intensity_shape = [batch_size, 1, 1, 1]
+            intensity_shape[img_channel_axis] = x.shape[img_channel_axis]
+            intensity = np.random.uniform(-self.channel_shift_range, self.channel_shift_range, intensity_shape)
+            image_axes = (1, 2, 3)
+            x[...] = np.clip(x + intensity, x.min(axis=image_axes, keepdims=True), x.max(axis=image_axes, keepdims=True))
+
+        is_horiz_flipped = np.zeros(batch_size, dtype=bool)
+        if self.horizontal_flip:
+            is_horiz_flipped = np.random.random(batch_size) < 0.5
+            x[is_horiz_flipped] = np.flip(x[is_horiz_flipped], img_col_axis)
+
+        if self.vertical_flip:
+            is_vert_flipped = np.random.random(batch_size) < 0.5
+            x[is_vert_flipped] = np.flip(x[is_vert_flipped], img_row_axis)
+
+        if self.brighten_range != 0:
+            # Scaling the V of HSV scales all channels of a pixel by the same factor, so the HSV round trip is not needed
+            random_bright = np.random.uniform(low = 1.0-self.brighten_range, high=1.0+self.brighten_range, size=batch_size).reshape(-1, 1, 1, 1)
+            value = x.max(axis=img_channel_axis, keepdims=True)
+            x *= np.clip(value * random_bright, 0, 255) / np.maximum(value, 1e-12)
+
+        return (x, is_horiz_flipped)
+
+    def __shifted_indexes(self, size, shift_range, batch_size):
+        """Source indexes of each image of a batch along one axis, shifted by a random number of pixels.
+        Indexes of pixels outside of the image are -1 if fill_mode is 'constant'.
+        """
+        if shift_range:
+            shifts = np.round(np.random.uniform(-shift_range, shift_range, batch_size) * size).astype(int)
+        else:
+            shifts = np.zeros(batch_size, dtype=int)
+        indexes = np.arange(size)[None, :] + shifts[:, None]
+        if self.fill_mode == 'constant':
+            return np.where((indexes < 0) | (indexes >= size), -1, indexes)
+        if self.fill_mode == 'wrap':
+            return indexes % size
+        if self.fill_mode == 'reflect':
+            indexes = indexes % (2 * size)
+            return np.where(indexes >= size, 2 * size - 1 - indexes, indexes)
+        return np.clip(indexes, 0, size - 1)
+
 
 
 class DriveIterator(image.Iterator):
     """Iterator yielding data from a Numpy array.
 
+    Batches are assembled in preallocated buffers, which are reused from batch to batch. With `workers`
+    set, `next()` keeps `prefetch` batches being assembled by a pool of threads, so the next batches are
+    ready while the model trains on the current one. Call `close()` to stop the threads.
+    Batches requested by index, e.g. by the Keras Sequence enqueuer of `fit_generator(workers=n)`, are
+    assembled by the caller's threads, which can run in parallel.
+
     # Arguments
         x: Numpy array of input data.
         y: Numpy array of targets data.
@@ -182,12 +271,16 @@ class DriveIterator(image.Iterator):
             images (if `save_to_dir` is set).
         save_format: Format to use for saving sample images
             (if `save_to_dir` is set).
+        workers: Number of threads assembling batches ahead of `next()`,
+            0 to assemble each batch when it is requested (default).
+        prefetch: Number of batches assembled ahead, 2 * workers if None.
     """
 
     def __init__(self, x_images, x_prev_states, y, image_data_generator,
                  batch_size=32, shuffle=False, seed=None,
                  data_format=None,
-                 save_to_dir=None, save_prefix='', save_format='png', zero_drop_percentage = 0.5, roi = None):
+                 save_to_dir=None, save_prefix='', save_format='png', zero_drop_percentage = 0.5, roi = None,
+                 workers=0, prefetch=None):
         if y is not None and len(x_images) != len(y):
             raise ValueError('X (images tensor) and y (labels) '
                              'should have the same length. '
@@ -229,6 +322,20 @@ class DriveIterator(image.Iterator):
         self.save_prefix = save_prefix
         self.save_format = save_format
         self.batch_size = batch_size
+
+        # Shape of a batch of images after cropping to the roi
+        image_shape = list(self.x_images.shape)[1:]
+        if self.roi is not None:
+            image_shape[0] = len(range(*slice(self.roi[0], self.roi[1]).indices(image_shape[0])))
+            image_shape[1] = len(range(*slice(self.roi[2], self.roi[3]).indices(image_shape[1])))
+        self.batch_image_shape = tuple([self.batch_size] + image_shape)
+
+        # Buffers of the batches being assembled, a batch takes a free one or allocates a new one
+        self.free_buffers = queue.Queue()
+        self.workers = workers
+        self.prefetch = prefetch or 2 * max(workers, 1)
+        self.executor = None
+        self.pending = deque()
         super(DriveIterator, self).__init__(x_images.shape[0], batch_size, shuffle, seed)
 
     def next(self):
@@ -237,59 +344,47 @@ class DriveIterator(image.Iterator):
         # Returns
             The next batch.
         """
-        # Keeps under lock only the mechanism which advances
-        # the indexing of each batch.
+        if self.workers <= 0:
+            # Keeps under lock only the mechanism which advances
+            # the indexing of each batch.
+            with self.lock:
+                index_array = next(self.index_generator)
+            # The transformation of images is not under thread lock
+            # so it can be done in parallel
+            return self.__get_indexes(index_array)
+
+        # The batches are assembled in the order of the index generator, so they are returned in that order too
         with self.lock:
-            index_array = next(self.index_generator)
-        # The transformation of images is not under thread lock
-        # so it can be done in parallel
-
-        return self.__get_indexes(index_array)
+            if self.executor is None:
+                self.executor = concurrent.futures.ThreadPoolExecutor(self.workers)
+            while len(self.pending) < self.prefetch:
+                self.pending.append(self.executor.submit(self.__get_indexes, next(self.index_generator)))
+            future = self.pending.popleft()
+        return future.result()
 
     def __get_indexes(self, index_array):
+        # h5py reads a list of rows in one call when it is sorted
         index_array = sorted(index_array)
-        if self.x_prev_states is not None:
-            batch_x_images = np.zeros(tuple([self.batch_size]+ list(self.x_images.shape)[1:]),
-                                      dtype=K.floatx())
-            batch_x_prev_states = np.zeros(tuple([self.batch_size]+list(self.x_prev_states.shape)[1:]), dtype=K.floatx())
+        batch_count = len(index_array)
+        try:
+            buffer = self.free_buffers.get_nowait()
+        except queue.Empty:
+            buffer = np.empty(self.batch_image_shape, dtype=K.floatx())
+        batch_x_images = buffer[:batch_count]
+
+        # Only the roi of the images is read
+        if self.roi is not None:
+            x_images = self.x_images[index_array, self.roi[0]:self.roi[1], self.roi[2]:self.roi[3], :]
         else:
-            batch_x_images = np.zeros(tuple([self.batch_size] + list(self.x_images.shape)[1:]), dtype=K.floatx())
+            x_images = self.x_images[index_array]
+        np.copyto(batch_x_images, x_images)
 
-        if self.roi is not None:
-            batch_x_images = batch_x_images[:, self.roi[0]:self.roi[1], self.roi[2]:self.roi[3], :]
-            
-        used_indexes = []
-        is_horiz_flipped = []
-        for i, j in enumerate(index_array):
-            x_images = self.x_images[j]            
-            
-            if self.roi is not None:
-                x_images = x_images[self.roi[0]:self.roi[1], self.roi[2]:self.roi[3], :]
-                
-                
-            transformed = self.image_data_generator.random_transform_with_states(x_images.astype(K.floatx()))
-            x_images = transformed[0]
-            is_horiz_flipped.append(transformed[1])
-            x_images = self.image_data_generator.standardize(x_images)
-            batch_x_images[i] = x_images
-
-            if self.x_prev_states is not None:
-                x_prev_states = self.x_prev_states[j]
-                
-                if (transformed[1]):
-                    x_prev_states[0] *= -1.0
-                
-                batch_x_prev_states[i] = x_prev_states
-            
-            used_indexes.append(j)
+        _, is_horiz_flipped = self.image_data_generator.random_transform_batch_with_states(batch_x_images)
+        for i in range(batch_count):
+            batch_x_images[i] = self.image_data_generator.standardize(batch_x_images[i])
 
-        if self.x_prev_states is not None:
-            batch_x = [np.asarray(batch_x_images)]
-        else:
-            batch_x = np.asarray(batch_x_images)
-            
         if self.save_to_dir:
-            for i in range(0, self.batch_size, 1):
+            for i in range(0, batch_count, 1):
                 hash = np.random.randint(1e4)
                
                 img = image.array_to_img(batch_x_images[i], self.data_format, scale=True)
@@ -299,44 +394,42 @@ class DriveIterator(image.Iterator):
                                                                         format=self.save_format)
                 img.save(os.path.join(self.save_to_dir, fname))
 
-        batch_y = self.y[list(sorted(used_indexes))]
-        idx = []
-        num_of_close_samples = 0
-        num_of_non_close_samples = 0
-        for i in range(0, len(is_horiz_flipped), 1):
-            if batch_y.shape[1] == 1:
-                
-                if (is_horiz_flipped[i]):
-                    batch_y[i] *= -1
-
-                if (np.isclose(batch_y[i], 0.5, rtol=0.005, atol=0.005)): 
-                    num_of_close_samples += 1
-                    if (np.random.uniform(low=0, high=1) > self.zero_drop_percentage):
-                        idx.append(True)
-                    else:
-                        idx.append(False)
-                else:
-                    num_of_non_close_samples += 1
-                    idx.append(True)
-            else:
-                
-                if (batch_y[i][int(len(batch_y[i])/2)] == 1):
-                    if (np.random.uniform(low=0, high=1) > self.zero_drop_percentage):
-                        idx.append(True)
-                    else:
-                        idx.append(False)
-                else:
-                    idx.append(True)
-                
-                if (is_horiz_flipped[i]):
-                    batch_y[i] = batch_y[i][::-1]
+        # Flipped images steer the other way. Samples driving straight ahead are dropped with a probability of zero_drop_percentage.
+        batch_y = np.asarray(self.y[index_array])
+        if batch_y.shape[1] == 1:
+            batch_y[is_horiz_flipped] *= -1
+            is_straight = np.isclose(batch_y[:, 0], 0.5, rtol=0.005, atol=0.005)
+        else:
+            is_straight = batch_y[:, int(batch_y.shape[1]/2)] == 1
+            batch_y[is_horiz_flipped] = batch_y[is_horiz_flipped, ::-1]
+        idx = ~is_straight | (np.random.uniform(low=0, high=1, size=batch_count) > self.zero_drop_percentage)
 
+        # The kept samples are copied out, so the buffer is free for the next batch
         batch_y = batch_y[idx]
-        batch_x[0] = batch_x[0][idx]
-        
+        batch_x_images = batch_x_images[idx]
+        self.free_buffers.put(buffer)
+
+        if self.x_prev_states is not None:
+            batch_x = [batch_x_images]
+        else:
+            batch_x = batch_x_images
         
         return batch_x, batch_y
         
     def _get_batches_of_transformed_samples(self, index_array):
         return self.__get_indexes(index_array)
+
+    def close(self):
+        """Stops the threads assembling batches for `next()`, the batches they assembled are dropped."""
+        with self.lock:
+            executor, self.executor = self.executor, None
+            pending, self.pending = self.pending, deque()
+        for future in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __del__(self):
+        if getattr(self, 'executor', None) is not None:
+            self.executor.shutdown(wait=False)
         
@@ -33,23 +33,22 @@ client.setCarControls(car_controls)
 # Initialize image buffer
 image_buf = np.zeros((1, 66, 200, 3))
 
-def get_image():
+def get_image(image_response):
     """
-    Get image from AirSim client
+    Crop the image used by the model from an AirSim image response
     """
-    image_response = client.simGetImages([airsim.ImageRequest("0", airsim.ImageType.Scene, False, False)])[0]
-    image1d = np.fromstring(image_response.image_data_uint8, dtype=np.uint8)
-    image_rgb = image1d.reshape(image_response.height, image_response.width, 3)
+    image_rgb = image_response.as_array()
     return image_rgb[78:144,27:227,0:2].astype(float)
 
-while True:    
+# Images are requested every 0.05s, the next one is rendered while the model predicts on the current one
+for frame in client.stream_images([airsim.ImageRequest("0", airsim.ImageType.Scene, False, False)], rate_hz=20):
     # Update throttle value according to steering angle
     if abs(car_controls.steering) <= 1.0:
         car_controls.throttle = 0.8-(0.4*abs(car_controls.steering))
     else:
         car_controls.throttle = 0.4
     
-    image_buf[0] = get_image()
+    image_buf[0] = get_image(frame[0])
     image_buf[0] /= 255 # Normalization
 
     start_time = time.time()
@@ -68,9 +67,6 @@ while True:
     
     # Update next car state
     client.setCarControls(car_controls)
-    
-    # Wait a bit between iterations
-    time.sleep(0.05)
 
 
 client.enableApiControl(False)
\ No newline at end of file
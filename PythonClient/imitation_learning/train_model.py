@@ -26,6 +26,10 @@ batch_size = 32
 learning_rate = 0.0001
 number_of_epochs = 500
 
+# Keras threads assembling batches ahead of training, and number of batches kept ready
+data_workers = 4
+data_queue_size = 16
+
 # Activation functions
 activation = 'relu'
 out_activation = 'sigmoid'
@@ -91,4 +95,5 @@ early_stopping_callback = EarlyStopping(monitor="val_loss", patience=training_pa
 callbacks=[plateau_callback, csv_callback, checkpoint_callback, early_stopping_callback, TQDMNotebookCallback()]
 
 history = model.fit_generator(train_generator, steps_per_epoch=num_train_examples//batch_size, epochs=number_of_epochs, callbacks=callbacks,\
-                   validation_data=eval_generator, validation_steps=num_eval_examples//batch_size, verbose=2)
+                   validation_data=eval_generator, validation_steps=num_eval_examples//batch_size, verbose=2,\
+                   workers=data_workers, max_queue_size=data_queue_size)
@@ -56,11 +56,8 @@ class LidarTest:
 
     def parse_lidarData(self, data):
 
-        # reshape array of floats to array of [X,Y,Z]
-        points = numpy.array(data.point_cloud, dtype=numpy.dtype('f4'))
-        points = numpy.reshape(points, (int(points.shape[0]/3), 3))
-       
-        return points
+        # array of floats as (N,3) float32 array of [X,Y,Z]
+        return data.point_array()
 
     def write_lidarData_to_disk(self, points):
         # TODO
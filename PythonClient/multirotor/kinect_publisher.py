@@ -34,14 +34,10 @@ class KinectPublisher:
         self.msg_tf = TFMessage()
 
     def getDepthImage(self,response_d):
-        img_depth = np.array(response_d.image_data_float, dtype=np.float32)
-        img_depth = img_depth.reshape(response_d.height, response_d.width)
-        return img_depth
+        return response_d.depth_array()
 
     def getRGBImage(self,response_rgb):
-        img1d = np.fromstring(response_rgb.image_data_uint8, dtype=np.uint8)
-        img_rgb = img1d.reshape(response_rgb.height, response_rgb.width, 3)
-        img_rgb = img_rgb[..., :3][..., ::-1]
+        img_rgb = response_rgb.as_array()[..., :3][..., ::-1]
         return img_rgb
 
     def enhanceRGB(self,img_rgb):
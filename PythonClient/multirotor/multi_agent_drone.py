@@ -1,5 +1,4 @@
 import airsim
-import cv2
 import numpy as np
 import os
 import pprint
@@ -74,21 +73,21 @@ except OSError:
     if not os.path.isdir(tmp_dir):
         raise
 
+writer = airsim.io.AsyncFrameWriter()
 for idx, response in enumerate(responses1 + responses2):
 
     filename = os.path.join(tmp_dir, str(idx))
 
     if response.pixels_as_float:
         print("Type %d, size %d" % (response.image_type, len(response.image_data_float)))
-        airsim.write_pfm(os.path.normpath(filename + '.pfm'), airsim.get_pfm_array(response))
+        writer.write(os.path.normpath(filename + '.pfm'), response)
     elif response.compress: #png format
         print("Type %d, size %d" % (response.image_type, len(response.image_data_uint8)))
-        airsim.write_file(os.path.normpath(filename + '.png'), response.image_data_uint8)
+        writer.write(os.path.normpath(filename + '.png'), response.image_data_uint8)
     else: #uncompressed array
         print("Type %d, size %d" % (response.image_type, len(response.image_data_uint8)))
-        img1d = np.fromstring(response.image_data_uint8, dtype=np.uint8) #get numpy array
-        img_rgb = img1d.reshape(response.height, response.width, 3) #reshape array to 3 channel image array H X W X 3
-        cv2.imwrite(os.path.normpath(filename + '.png'), img_rgb) # write to png
+        writer.write(os.path.normpath(filename + '.png'), response) # encoded to png by the writer
+writer.close()
 
 airsim.wait_key('Press any key to reset to original state')
 
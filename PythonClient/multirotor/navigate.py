@@ -27,10 +27,12 @@ vy = 0
 driving = 0
 help = False
 
-while True:
+# the next depth image is fetched while the current one is processed
+stream = client.stream_images([airsim.ImageRequest("0", airsim.ImageType.DepthVis)])
+for frame in stream:
     # this will return png width= 256, height= 144
-    result = client.simGetImage("0", airsim.ImageType.DepthVis)
-    if (result == "\0"):
+    result = frame[0].image_data_uint8
+    if (len(result) <= 1):
         if (not help):
             help = True
             print("Please press '1' in the AirSim view to enable the Depth camera view")
@@ -96,3 +98,4 @@ while True:
     key = cv2.waitKey(1) & 0xFF;
     if (key == 27 or key == ord('q') or key == ord('x')):
         break;
+stream.close()
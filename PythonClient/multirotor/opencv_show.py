@@ -47,29 +47,20 @@ thickness = 2
 textSize, baseline = cv2.getTextSize("FPS", fontFace, fontScale, thickness)
 print (textSize)
 textOrg = (10, 10 + textSize[1])
-frameCount = 0
-startTime=time.clock()
-fps = 0
 
-while True:
-    # because this method returns std::vector<uint8>, msgpack decides to encode it as a string unfortunately.
-    rawImage = client.simGetImage("0", cameraTypeMap[cameraType])
-    if (rawImage == None):
+# the next image is fetched while the current one is decoded and shown
+stream = client.stream_images([airsim.ImageRequest("0", cameraTypeMap[cameraType])])
+for frame in stream:
+    rawImage = frame[0].image_data_uint8
+    if (len(rawImage) == 0):
         print("Camera is not returning image, please check airsim for error messages")
         sys.exit(0)
     else:
         png = cv2.imdecode(airsim.string_to_uint8_array(rawImage), cv2.IMREAD_UNCHANGED)
-        cv2.putText(png,'FPS ' + str(fps),textOrg, fontFace, fontScale,(255,0,255),thickness)
+        cv2.putText(png,'FPS %.1f' % stream.fps,textOrg, fontFace, fontScale,(255,0,255),thickness)
         cv2.imshow("Depth", png)
 
-    frameCount  = frameCount  + 1
-    endTime=time.clock()
-    diff = endTime - startTime
-    if (diff > 1):
-        fps = frameCount
-        frameCount = 0
-        startTime = endTime
-    
     key = cv2.waitKey(1) & 0xFF;
     if (key == 27 or key == ord('q') or key == ord('x')):
         break;
+stream.close()
@@ -47,6 +47,7 @@ class OrbitNavigator:
         self.client = airsim.MultirotorClient()
         self.client.confirmConnection()
         self.client.enableApiControl(True)
+        self.writer = airsim.io.AsyncFrameWriter() # snapshots are saved in the background
 
         self.home = self.client.getMultirotorState().kinematics_estimated.position
         # check that our home position is stable
@@ -150,6 +151,8 @@ class OrbitNavigator:
             print("disarming.")
             self.client.armDisarm(False)
 
+        self.writer.close()
+
 
     def track_orbits(self, angle):
         # tracking # of completed orbits is surprisingly tricky to get right in order to handle random wobbles
@@ -217,7 +220,7 @@ class OrbitNavigator:
         response = responses[0]
         filename = "photo_" + str(self.snapshot_index)
         self.snapshot_index += 1
-        airsim.write_file(os.path.normpath(filename + '.png'), response.image_data_uint8)        
+        self.writer.write(os.path.normpath(filename + '.png'), response.image_data_uint8)
         print("Saved snapshot: {}".format(filename))
         self.start_time = time.time()  # cause smooth ramp up to happen again after photo is taken.
 
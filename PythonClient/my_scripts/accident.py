@@ -1,9 +1,9 @@
 import sys
 import os
-import time
 import random
 import datetime
 from car_controller import AirSimCarControl
+import airsim
 
 # Use below in settings.json with blocks environment
 """
@@ -189,19 +189,29 @@ def main(car1_route, car2_route):
     car1_route = RouteManager(car1, route=car1_route, random=True, moderated=moderated)
     car2_route = RouteManager(car2, route=car2_route, random=True, moderated=moderated)
 
-    while True:
-        # Print state of the car
-        # car1.printCarState()
-        # car2.printCarState()
-
-        car1_route.run()
-        car2_route.run()
-
-        # get image
-        car1.saveImage('MyCamera1', os.path.join(dirname, '{}.png'.format(idx)))
-        idx += 1
-
-        time.sleep(0.1)
+    # step the simulation 0.1s at a time, the image is captured right after each step
+    stepper = car1.client.stepper(0.1)
+    stepper.add('image', 'simGetImage', 'MyCamera1', airsim.ImageType.Scene, 'Car1')
+
+    try:
+        with stepper:
+            while True:
+                # Print state of the car
+                # car1.printCarState()
+                # car2.printCarState()
+
+                car1_route.run()
+                car2_route.run()
+
+                # get image, None when the camera returned nothing
+                observation = stepper.step()
+                if observation['image'] is not None:
+                    car1.writer.write(os.path.join(dirname, '{}.png'.format(idx)), observation['image'])
+                idx += 1
+    finally:
+        # write the images still queued, also when stopped with Ctrl-C
+        car1.close()
+        car2.close()
 
 if __name__ == '__main__':
     car1_route = 'straight'
@@ -7,7 +7,6 @@ import time
 import math
 import json
 from fisheye_effector import FisheyeEffector
-from threading import Thread
 
 # AirSim API Documentation
 # https://microsoft.github.io/AirSim/apis/#vehicle-specific-apis
@@ -91,8 +90,8 @@ class AirSimClient:
 
     def __init__(self):
         if self._client is None:
-            # connect to the AirSim simulator
-            self._client = airsim.CarClient()
+            # connect to the AirSim simulator, one connection per car so image captures don't delay controls
+            self._client = airsim.CarClient(pool_size=4)
             self._client.confirmConnection()
 
     def enableApiControl(self, flag, name):
@@ -113,13 +112,19 @@ class AirSimClient:
     def simGetImage(self, name, image_type):
         return self._client.simGetImage(name, image_type)
 
+    def stepper(self, dt):
+        # pauses the simulation and advances it dt seconds per step, see airsim.SimStepper
+        return airsim.SimStepper(self._client, dt)
+
 class AirSimCarControl:
-    def __init__(self, name):
+    def __init__(self, name, write_policy='block'):
+        # write_policy 'block' keeps every image, 'drop_oldest' or 'drop' keep up with the simulation by dropping images
         self.client = AirSimClient()
         self.name = name
         self.client.enableApiControl(True, name)
         self.controls = airsim.CarControls()
         self.X, self.Y, self.Z = getInitialPosition(name)
+        self.writer = airsim.io.AsyncFrameWriter(workers=1, max_queue=32, policy=write_policy)
         # self.effector = FisheyeEffector(distortion=0.1)
 
     def printCarState(self):
@@ -166,14 +171,14 @@ class AirSimCarControl:
     def saveImage(self, name, save_path):
         image = self.client.simGetImage(name, airsim.ImageType.Scene)
         # image = self.effector.apply(image)
-        # Thread(target=self.threadedSaveImage, args=(image, save_path)).start()
-        with open(save_path, 'wb') as output:
-            output.write(image)
-
-    def threadedSaveImage(self, image, save_path):
-        # image = self.effector.apply(image)
-        with open(save_path, 'wb') as output:
-            output.write(image)
+        if image is not None:
+            self.writer.write(save_path, image)
+
+    def close(self):
+        # writes the images still queued
+        self.writer.close()
+        if self.writer.dropped:
+            print('%s: %d images were dropped because writing fell behind' % (self.name, self.writer.dropped))
 
     def drive(self, speed=20.0, orientation=0.0):
         current_speed, _, _, _, current_orientation = self.getCarState()
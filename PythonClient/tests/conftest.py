@@ -0,0 +1,12 @@
+from airsim.testing import FakeAirSimServer
+
+import pytest
+
+
+@pytest.fixture
+def server(request):
+    """
+    FakeAirSimServer for the test, parametrize it indirectly with a dict of FakeAirSimServer arguments to change them
+    """
+    with FakeAirSimServer(**getattr(request, 'param', {})) as server:
+        yield server
@@ -0,0 +1,105 @@
+import airsim
+from airsim.testing import FakeAirSimApi, FakeAirSimServer
+
+import asyncio
+import gc
+import socket
+import time
+
+import msgpackrpc
+import pytest
+
+
+def test_async_client(server):
+    async def run():
+        async with airsim.AsyncMultirotorClient(port = server.port) as client:
+            states = await asyncio.gather(*[client.getMultirotorState('Drone%d' % i) for i in range(4)])
+            assert all(isinstance(state, airsim.MultirotorState) for state in states)
+            assert await client.ping()
+            responses = await client.simGetImages([airsim.ImageRequest('0', airsim.ImageType.Scene)])
+            assert isinstance(responses[0], airsim.ImageResponse)
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize('server', [dict(latency = 0.05)], indirect = True)
+def test_movement_futures_are_in_flight_together(server):
+    async def run():
+        async with airsim.AsyncMultirotorClient(port = server.port) as client:
+            takeoff = client.takeoffAsync(vehicle_name = 'Drone1')
+            assert isinstance(takeoff, asyncio.Future)
+            start = time.time()
+            results = await asyncio.gather(takeoff, *[client.moveToPositionAsync(i, 0, -5, 1, vehicle_name = 'Drone%d' % i)
+                                                      for i in range(4)])
+            # one latency for all five calls, not five
+            assert time.time() - start < 0.2
+            assert results == [True] * 5
+            pose = await client.simGetVehiclePose('Drone3')
+            assert pose.position.x_val == 3 and pose.position.z_val == -5
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize('server', [dict(latency = 0.5)], indirect = True)
+def test_timeout(server):
+    async def run():
+        async with airsim.AsyncMultirotorClient(port = server.port, timeout_value = 0.05) as client:
+            with pytest.raises(msgpackrpc.error.TimeoutError):
+                await client.ping()
+
+    asyncio.run(run())
+
+
+def test_connection_refused():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+
+    async def run():
+        client = airsim.AsyncVehicleClient(port = port)
+        with pytest.raises(msgpackrpc.error.TransportError):
+            await asyncio.gather(client.ping(), client.ping())
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize('server', [dict(latency = 0.5)], indirect = True)
+def test_connection_closed_fails_calls_in_flight(server):
+    async def run():
+        client = airsim.AsyncVehicleClient(port = server.port)
+        ping = client.client.call_async('ping')
+        await asyncio.sleep(0.05)
+        server.stop()
+        with pytest.raises(msgpackrpc.error.TransportError):
+            await ping
+
+    asyncio.run(run())
+
+
+def test_failed_lidar_scan_leaves_no_unretrieved_future():
+    class Api(FakeAirSimApi):
+        def getLidarData(self, lidar_name, vehicle_name):
+            raise ValueError('no lidar')
+
+        def simGetLidarSegmentation(self, lidar_name, vehicle_name):
+            raise ValueError('no lidar')
+
+    errors = []
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        async with airsim.AsyncVehicleClient(port = server.port) as client:
+            with pytest.raises(msgpackrpc.error.RPCError):
+                await client.getLidarScan()
+            assert await client.ping()
+        gc.collect()
+
+    with FakeAirSimServer(api = Api()) as server:
+        asyncio.run(run())
+    assert errors == []
+
+
+def test_call_outside_event_loop():
+    client = airsim.AsyncVehicleClient()
+    with pytest.raises(RuntimeError):
+        client.client.call_async('ping')
@@ -0,0 +1,75 @@
+import colorsys
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip('keras.preprocessing.image')
+pytest.importorskip('cv2')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'imitation_learning'))
+from Generator import DriveDataGenerator
+
+
+def batch(count = 8, height = 5, width = 7):
+    return np.random.uniform(1, 150, (count, height, width, 3)).astype(np.float32)
+
+
+@pytest.mark.parametrize('rotation_range', [0, 1e-4])
+def test_horizontal_flip_flips_columns(rotation_range):
+    # the batch path and the per-image path taken with a rotation flip the same axis
+    x = batch()
+    generator = DriveDataGenerator(horizontal_flip = True, rotation_range = rotation_range)
+    np.random.seed(3)
+    y, flipped = generator.random_transform_batch_with_states(x.copy())
+    assert flipped.dtype == bool and flipped.any() and not flipped.all()
+    np.testing.assert_allclose(y[flipped], x[flipped][:, :, ::-1], atol = 1e-2)
+    np.testing.assert_allclose(y[~flipped], x[~flipped], atol = 1e-2)
+
+
+def test_single_image_flip_flips_columns():
+    x = batch(1)[0]
+    generator = DriveDataGenerator(horizontal_flip = True)
+    for _ in range(20):
+        y, flipped = generator.random_transform_with_states(x.copy())
+        np.testing.assert_array_equal(y, x[:, ::-1] if flipped else x)
+
+
+@pytest.mark.parametrize('fill_mode, padding', [('nearest', 'edge'), ('constant', 'constant'), ('wrap', 'wrap'), ('reflect', 'symmetric')])
+def test_shift_matches_padding(fill_mode, padding):
+    x = batch(16)
+    generator = DriveDataGenerator(width_shift_range = 0.4, fill_mode = fill_mode, cval = -1.0)
+    y, _ = generator.random_transform_batch_with_states(x.copy())
+    width = x.shape[2]
+    pad_args = {'constant_values': -1.0} if padding == 'constant' else {}
+    for i in range(len(x)):
+        padded = np.pad(x[i], ((0, 0), (width, width), (0, 0)), mode = padding, **pad_args)
+        assert any(np.array_equal(y[i], padded[:, width + shift:2 * width + shift]) for shift in range(-width, width + 1))
+
+
+def test_channel_shift_per_channel():
+    x = np.full((64, 4, 4, 3), 100.0, np.float32)
+    x[:, 0, 0] = 0
+    x[:, -1, -1] = 255
+    generator = DriveDataGenerator(channel_shift_range = 20)
+    y, _ = generator.random_transform_batch_with_states(x.copy())
+    offsets = y[:, 1, 1] - 100
+    assert np.all(np.abs(offsets) <= 20)
+    # each channel has its own offset, constant over the image
+    assert np.mean(np.abs(offsets[:, 0] - offsets[:, 1]) > 1e-3) > 0.9
+    np.testing.assert_allclose(y[:, 1:3, 1:3] - 100, np.broadcast_to(offsets[:, None, None], (64, 2, 2, 3)), atol = 1e-4)
+
+
+def test_brightness_matches_hsv():
+    x = np.random.uniform(0, 255, (4, 3, 3, 3)).astype(np.float32)
+    generator = DriveDataGenerator(brighten_range = 0.6)
+    np.random.seed(5)
+    y, _ = generator.random_transform_batch_with_states(x.copy())
+    np.random.seed(5)
+    factors = np.random.uniform(0.4, 1.6, 4)
+    for b in range(4):
+        for i in range(3):
+            for j in range(3):
+                h, s, v = colorsys.rgb_to_hsv(*x[b, i, j])
+                np.testing.assert_allclose(y[b, i, j], colorsys.hsv_to_rgb(h, s, min(v * factors[b], 255)), atol = 1e-2)
@@ -0,0 +1,60 @@
+import airsim
+from airsim.testing import FakeAirSimApi, FakeAirSimServer
+
+import pytest
+
+
+def test_batch_results_in_order(server):
+    client = airsim.MultirotorClient(port = server.port)
+    with client.batch() as batch:
+        assert batch.getMultirotorState('Drone1') == 0
+        assert batch.simGetVehiclePose('Drone1') == 1
+        batch.simGetImages([airsim.ImageRequest('0', airsim.ImageType.Scene)], 'Drone1')
+        batch.call('ping')
+    state, pose, images, pong = batch.results
+    assert isinstance(state, airsim.MultirotorState)
+    assert isinstance(pose, airsim.Pose)
+    assert isinstance(images[0], airsim.ImageResponse)
+    assert pong is True
+
+
+def test_batch_uses_rpc_names_and_defaults(server):
+    client = airsim.VehicleClient(port = server.port)
+    with client.batch() as batch:
+        batch.simIsPause()
+        batch.simGetCollisionInfo()
+    assert batch.results[0] in (True, False)
+    assert isinstance(batch.results[1], airsim.CollisionInfo)
+    assert server.call_counts.get('simIsPaused') == 1
+
+
+@pytest.mark.parametrize('name', ['moveToZAsync', 'getLidarScan', 'stream_images', 'batch', '_call_decoded'])
+def test_batch_rejects_unsupported_apis(server, name):
+    client = airsim.MultirotorClient(port = server.port)
+    with pytest.raises(AttributeError):
+        getattr(client.batch(), name)
+
+
+def test_batch_not_sent_on_exception(server):
+    client = airsim.VehicleClient(port = server.port)
+    with pytest.raises(RuntimeError):
+        with client.batch() as batch:
+            batch.reset()
+            raise RuntimeError()
+    assert batch.results is None
+    assert 'reset' not in server.call_counts
+
+
+def test_batch_applies_api_result_hooks():
+    class Api(FakeAirSimApi):
+        def simGetImage(self, camera_name, image_type, vehicle_name):
+            return b'' if camera_name == 'empty' else super(Api, self).simGetImage(camera_name, image_type, vehicle_name)
+
+    with FakeAirSimServer(api = Api()) as server:
+        client = airsim.VehicleClient(port = server.port)
+        with client.batch() as batch:
+            batch.simGetImage('empty', airsim.ImageType.Scene)
+            batch.simGetImage('0', airsim.ImageType.Scene)
+        assert batch.results[0] is None
+        assert batch.results[1] == client.simGetImage('0', airsim.ImageType.Scene)
+        assert client.simGetImage('empty', airsim.ImageType.Scene) is None
@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks')
+
+
+def run_benchmark(*args):
+    return subprocess.run([sys.executable, 'rpc_benchmark.py', '--filter', 'state', '--min-time', '0', '--min-calls', '2',
+                           '--max-calls', '3'] + list(args), cwd = BENCHMARKS, stdout = subprocess.PIPE, timeout = 120)
+
+
+def test_rpc_benchmark_writes_and_compares_results(tmp_path):
+    output = str(tmp_path / 'results.json')
+    assert run_benchmark('--output', output).returncode == 0
+    with open(output) as f:
+        results = json.load(f)['results']
+    assert 'getMultirotorState' in results and 'simGetImages_scene_256x144' not in results
+    assert results['getMultirotorState']['calls'] == 2
+    assert results['getMultirotorState']['decode']['p50_ms'] >= 0
+
+    baseline = str(tmp_path / 'baseline.json')
+    for result in results.values():
+        result['p50_ms'] = 1e-9
+    with open(baseline, 'w') as f:
+        json.dump({'results': results}, f)
+    regressed = run_benchmark('--output', str(tmp_path / 'new.json'), '--compare', baseline)
+    assert regressed.returncode == 1
+    assert b'REGRESSION getMultirotorState p50_ms' in regressed.stdout
@@ -0,0 +1,134 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+h5py = pytest.importorskip('h5py')
+pytest.importorskip('pandas')
+Image = pytest.importorskip('PIL.Image')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'imitation_learning'))
+import Cooking
+
+SPLIT = [0.7, 0.2, 0.1]
+
+
+def record_folder(path, count, seed):
+    # airsim_rec.txt with count rows and 16x8 images whose pixels hold the row number
+    rng = np.random.RandomState(seed)
+    os.makedirs(os.path.join(path, 'images'), exist_ok=True)
+    with open(os.path.join(path, 'airsim_rec.txt'), 'w') as f:
+        f.write('Timestamp\tSpeed (kmph)\tThrottle\tSteering\tBrake\tGear\tImageName\n')
+        for i in range(count):
+            name = 'img_%d_%d.png' % (seed, i)
+            Image.fromarray(np.full((8, 16, 3), i % 256, np.uint8)).save(os.path.join(path, 'images', name))
+            f.write('%d\t%f\t0.5\t%f\t0\tN\t%s\n' % (i, rng.uniform(0, 40), rng.uniform(-1, 1), name))
+    return str(path)
+
+
+def cook(folders, output):
+    Cooking.cook(folders, str(output), SPLIT, 16, workers=1)
+    with open(os.path.join(str(output), Cooking.MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def labels(output, split):
+    with h5py.File(os.path.join(str(output), split + '.h5'), 'r') as f:
+        return f['label'][:]
+
+
+def check_ranges(manifest, output):
+    # the row ranges of the folders tile each file in manifest order
+    for split in ('train', 'eval'):
+        row = 0
+        for entry in manifest['folders'].values():
+            start, stop = entry['rows'][split]
+            assert start == row
+            row = stop
+        assert len(labels(output, split)) == row
+
+
+@pytest.fixture
+def folders(tmp_path):
+    return [record_folder(tmp_path / name, 40, seed) for seed, name in enumerate(['a', 'b', 'c'])]
+
+
+def test_new_folder_is_appended(tmp_path, folders):
+    output = tmp_path / 'out'
+    manifest = cook(folders[:2], output)
+    check_ranges(manifest, output)
+    before = {split: labels(output, split) for split in ('train', 'eval')}
+
+    manifest = cook(folders, output)
+    check_ranges(manifest, output)
+    assert list(manifest['folders']) == [os.path.normpath(folder).replace('\\', '/') for folder in folders]
+    for split in ('train', 'eval'):
+        np.testing.assert_array_equal(labels(output, split)[:len(before[split])], before[split])
+
+
+def test_unchanged_folders_are_skipped(tmp_path, folders, capsys):
+    output = tmp_path / 'out'
+    cook(folders, output)
+    capsys.readouterr()
+    cook(folders, output)
+    assert 'up to date' in capsys.readouterr().out
+
+
+def test_changed_folder_is_replaced(tmp_path, folders):
+    output = tmp_path / 'out'
+    manifest = cook(folders, output)
+    keys = list(manifest['folders'])
+    c_rows = manifest['folders'][keys[2]]['rows']['train']
+    c_labels = labels(output, 'train')[c_rows[0]:c_rows[1]]
+
+    record_folder(folders[0], 30, 7)
+    manifest = cook(folders, output)
+    check_ranges(manifest, output)
+    assert list(manifest['folders']) == [keys[1], keys[2], keys[0]]
+    new_c_rows = manifest['folders'][keys[2]]['rows']['train']
+    np.testing.assert_array_equal(labels(output, 'train')[new_c_rows[0]:new_c_rows[1]], c_labels)
+
+
+def test_unlisted_folder_is_removed(tmp_path, folders):
+    output = tmp_path / 'out'
+    cook(folders, output)
+    manifest = cook([folders[0], folders[2]], output)
+    check_ranges(manifest, output)
+    assert len(manifest['folders']) == 2
+
+
+def test_interrupted_removal_is_recovered(tmp_path, folders):
+    output = tmp_path / 'out'
+    manifest = cook(folders, output)
+    keys = list(manifest['folders'])
+    expected = {split: labels(output, split) for split in ('train', 'eval')}
+
+    # crash after marking the removal of b and moving up part of the rows
+    manifest['pending'] = keys[1]
+    Cooking.writeManifest(str(output), manifest)
+    start, stop = manifest['folders'][keys[1]]['rows']['train']
+    Cooking.removeH5pyRows(os.path.join(str(output), 'train.h5'), start, stop)
+
+    manifest = cook(folders, output)
+    check_ranges(manifest, output)
+    assert 'pending' not in manifest
+    assert list(manifest['folders']) == [keys[0], keys[1], keys[2]]
+    # the interrupted folders are cooked again, their rows hold the same samples
+    for split in ('train', 'eval'):
+        assert sorted(labels(output, split).ravel()) == pytest.approx(sorted(expected[split].ravel()))
+
+
+def test_split_is_deterministic_per_image():
+    splits = [Cooking.splitForImage('images/img_%d.png' % i, SPLIT) for i in range(1000)]
+    assert splits == [Cooking.splitForImage('images/img_%d.png' % i, SPLIT) for i in range(1000)]
+    assert abs(splits.count(0) / 1000.0 - 0.7) < 0.05
+
+
+def test_legacy_output_is_skipped(tmp_path, folders, capsys):
+    output = tmp_path / 'out'
+    os.makedirs(str(output))
+    open(os.path.join(str(output), 'train.h5'), 'w').close()
+    Cooking.cook(folders, str(output), SPLIT, 16, workers=1)
+    assert 'Skipping preprocessing' in capsys.readouterr().out
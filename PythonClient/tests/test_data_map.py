@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip('h5py')
+pytest.importorskip('pandas')
+pytest.importorskip('PIL')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'imitation_learning'))
+import Cooking
+
+
+def record_folder(path, rows):
+    # rows of (speed, throttle, steering, brake), only airsim_rec.txt is read so no images are written
+    os.makedirs(str(path), exist_ok=True)
+    with open(os.path.join(str(path), 'airsim_rec.txt'), 'w') as f:
+        f.write('Timestamp\tSpeed (kmph)\tThrottle\tSteering\tBrake\tGear\tImageName\n')
+        for i, (speed, throttle, steering, brake) in enumerate(rows):
+            f.write('%d\t%f\t%f\t%f\t%d\tN\timg_%d.png\n' % (i, speed, throttle, steering, brake, i))
+    return str(path)
+
+
+def reference_mappings(folder, rows):
+    # the original row by row loop
+    mappings = []
+    for i in range(1, len(rows) - 1):
+        previous, current, following = rows[i - 1], rows[i], rows[i + 1]
+        if previous[3] != 0:
+            continue
+        label = sum((row[2] + 1) / 2.0 for row in (previous, current, following)) / 3.0
+        state = [(previous[2] + 1) / 2.0, previous[1], previous[0] / Cooking.MAX_SPEED]
+        mappings.append((os.path.join(folder, 'images', 'img_%d.png' % i).replace('\\', '/'), ([label], state)))
+    return mappings
+
+
+def random_rows(count, seed):
+    rng = np.random.RandomState(seed)
+    return [(rng.uniform(0, 60), rng.uniform(0, 1), rng.uniform(-1, 1), int(rng.uniform() < 0.2)) for _ in range(count)]
+
+
+def test_matches_row_by_row_labels(tmp_path):
+    rows = random_rows(30, 0)
+    folder = record_folder(tmp_path / 'a', rows)
+    mappings = Cooking.generateFolderDataMapAirSim(folder)
+    expected = reference_mappings(folder, rows)
+    assert len(mappings) == len(expected) < 28
+    for (name, (label, state)), (expected_name, (expected_label, expected_state)) in zip(mappings, expected):
+        assert name == expected_name
+        np.testing.assert_allclose(label, expected_label, atol=1e-6)
+        np.testing.assert_allclose(state, expected_state, atol=1e-6)
+
+
+def test_short_recordings_have_no_examples(tmp_path):
+    assert Cooking.generateFolderDataMapAirSim(record_folder(tmp_path / 'a', random_rows(2, 0))) == []
+
+
+def test_mappings_do_not_depend_on_workers(tmp_path):
+    folders = [record_folder(tmp_path / name, random_rows(20, seed)) for seed, name in enumerate('abc')]
+    serial = Cooking.generateFolderDataMapsAirSim(folders, workers=1)
+    parallel = Cooking.generateFolderDataMapsAirSim(folders, workers=2)
+    assert serial == parallel
+
+    mappings = Cooking.generateDataMapAirSim(folders, workers=2)
+    assert sorted(mappings) == sorted(mapping for folder in serial for mapping in folder)
@@ -0,0 +1,87 @@
+import airsim
+from airsim.testing import FakeAirSimServer
+import numpy as np
+import pytest
+
+BACKENDS = [('npy', None), ('npy', True), ('hdf5', None)]
+
+
+def write_frames(writer, count, first = 0):
+    for i in range(first, first + count):
+        writer.append(timestamp = 1000 + i, action = np.array([i, -i], np.float32), step = i)
+
+
+@pytest.mark.parametrize('backend, compression', BACKENDS)
+def test_round_trip_with_partial_chunk(tmp_path, backend, compression):
+    if backend == 'hdf5':
+        pytest.importorskip('h5py')
+    dataset = airsim.Dataset(str(tmp_path / 'data'))
+    with dataset.new_episode(chunk_size = 4, compression = compression, backend = backend) as writer:
+        write_frames(writer, 10)
+    assert dataset.episodes == ['episode_00000' + ('.h5' if backend == 'hdf5' else '')]
+
+    with dataset.episode(0) as episode:
+        assert len(episode) == 10
+        assert episode.columns['action'] == (np.dtype(np.float32), (2,))
+        assert [len(chunk['step']) for chunk in episode.chunks()] == [4, 4, 2]
+        assert [len(chunk['step']) for chunk in episode.chunks(3, 9, ['step'])] == [1, 4, 1]
+        np.testing.assert_array_equal(episode.column('step'), np.arange(10))
+        np.testing.assert_array_equal(episode[-1]['action'], [9, -9])
+        assert episode.index_range(1003, 1007) == (3, 7)
+        with pytest.raises(IndexError):
+            episode[10]
+
+
+def test_airsim_values_from_fake_server(tmp_path):
+    with FakeAirSimServer(image_width = 4, image_height = 3) as server:
+        client = airsim.CarClient(port = server.port)
+        requests = [airsim.ImageRequest('0', airsim.ImageType.Scene, False, False),
+                    airsim.ImageRequest('0', airsim.ImageType.DepthPlanner, True)]
+        with airsim.Dataset(str(tmp_path)).new_episode(chunk_size = 2) as writer:
+            for _ in range(3):
+                scene, depth = client.simGetImages(requests)
+                writer.append(scene = scene, depth = depth, state = client.getCarState(),
+                              pose = client.simGetVehiclePose(), collision = client.simGetCollisionInfo())
+
+    episode = airsim.Episode(writer.path)
+    frame = episode[2]
+    assert frame['scene'].shape == (3, 4, 3) and frame['depth'].shape == (3, 4)
+    assert frame['state'].dtype == airsim.telemetry.STATE_DTYPE
+    assert frame['pose']['orientation'].tolist() == [0, 0, 0, 1]
+    assert not frame['collision']['has_collided']
+    # the first column with a timestamp sets the frame time
+    assert frame['timestamp'] == scene.time_stamp
+
+
+def test_unflushed_frames_are_lost_after_a_crash(tmp_path):
+    writer = airsim.EpisodeWriter(str(tmp_path / 'episode_00000'), chunk_size = 4)
+    write_frames(writer, 6)
+    assert len(airsim.Episode(writer.path)) == 4
+    writer.flush()
+    assert len(airsim.Episode(writer.path)) == 6
+    write_frames(writer, 3, 6)
+    writer.close()
+    np.testing.assert_array_equal(airsim.Episode(writer.path).column('step'), np.arange(9))
+
+
+def test_frames_must_match_the_first_one(tmp_path):
+    with airsim.EpisodeWriter(str(tmp_path / 'episode_00000')) as writer:
+        write_frames(writer, 1)
+        with pytest.raises(ValueError):
+            writer.append(step = 1)
+        with pytest.raises(ValueError):
+            writer.append(timestamp = 0, action = np.zeros(3, np.float32), step = 1)
+    with pytest.raises(ValueError):
+        airsim.EpisodeWriter(writer.path)
+    with pytest.raises(ValueError):
+        airsim.EpisodeWriter(str(tmp_path / 'other'), backend = 'csv')
+
+
+def test_dataset_numbers_and_streams_episodes(tmp_path):
+    dataset = airsim.Dataset(str(tmp_path))
+    for first in (0, 10):
+        with dataset.new_episode(chunk_size = 4) as writer:
+            write_frames(writer, 6, first)
+    assert dataset.episodes == ['episode_00000', 'episode_00001']
+    streamed = [(name, chunk['step'].tolist()) for name, chunk in dataset.stream(1004, 1012, ['step'])]
+    assert streamed == [('episode_00000', [4, 5]), ('episode_00001', [10, 11])]
@@ -0,0 +1,64 @@
+import airsim
+from airsim.decode import decode_image
+from airsim.io import encode_frame
+from airsim.testing import FakeAirSimServer
+import numpy as np
+import pytest
+
+REQUESTS = [airsim.ImageRequest('0', airsim.ImageType.Scene, False, False),
+            airsim.ImageRequest('1', airsim.ImageType.DepthPerspective, True)]
+
+
+def pfm_response(image):
+    response = airsim.ImageResponse()
+    response.compress = True
+    response.pixels_as_float = False
+    response.height, response.width = image.shape[:2]
+    response.image_data_uint8 = encode_frame('.pfm', image)
+    return response
+
+
+def test_decodes_fake_server_frames_into_reused_buffers():
+    with FakeAirSimServer(image_width = 6, image_height = 4) as server:
+        client = airsim.VehicleClient(port = server.port)
+        with airsim.DecodePool(workers = 2) as pool:
+            first = pool.decode(client.simGetImages(REQUESTS), REQUESTS)
+            depth = first[('1', airsim.ImageType.DepthPerspective)]
+            second = pool.decode(client.simGetImages(REQUESTS), REQUESTS)
+
+    assert first[('0', airsim.ImageType.Scene)].shape == (4, 6, 3)
+    assert depth.dtype == np.float32 and depth.shape == (4, 6)
+    np.testing.assert_allclose(depth.reshape(-1), np.linspace(1, 100, 24))
+    assert second[('1', airsim.ImageType.DepthPerspective)] is depth
+    assert pool.stats()['frames'] == 2
+    assert set(pool.last_image_times) == set(first)
+
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_pfm_responses(processes):
+    images = [np.random.RandomState(seed).uniform(0, 1, shape).astype(np.float32) for seed, shape in ((0, (3, 5)), (1, (3, 5, 3)))]
+    with airsim.DecodePool(workers = 2, processes = processes) as pool:
+        decoded = pool.decode([pfm_response(image) for image in images])
+    assert sorted(decoded) == [0, 1]
+    for index, image in enumerate(images):
+        np.testing.assert_array_equal(decoded[index], image)
+
+
+def test_png_responses():
+    pytest.importorskip('cv2')
+    rgb = np.random.RandomState(0).randint(0, 255, (4, 5, 3)).astype(np.uint8)
+    response = airsim.ImageResponse()
+    response.compress, response.pixels_as_float = True, False
+    response.image_data_uint8 = airsim.encode_png(rgb)
+    with airsim.DecodePool() as pool:
+        np.testing.assert_array_equal(pool.decode([response])[0], rgb[..., ::-1])
+
+
+def test_errors():
+    with airsim.DecodePool() as pool:
+        with pytest.raises(ValueError):
+            pool.decode([pfm_response(np.zeros((2, 2), np.float32))], REQUESTS)
+        with pytest.raises(ValueError):
+            pool.decode([pfm_response(np.zeros((2, 2), np.float32))] * 2, [REQUESTS[0], REQUESTS[0]])
+    with pytest.raises(ValueError):
+        decode_image(b'GIF89a')
@@ -0,0 +1,62 @@
+import time
+
+import airsim
+from airsim.testing import FakeAirSimApi, FakeAirSimServer
+import pytest
+
+
+def test_payload_sizes_and_call_counts():
+    with FakeAirSimServer(image_width = 8, image_height = 4, lidar_points = 10) as server:
+        client = airsim.MultirotorClient(port = server.port)
+        scene, depth = client.simGetImages([airsim.ImageRequest('0', airsim.ImageType.Scene, False, False),
+                                            airsim.ImageRequest('0', airsim.ImageType.DepthPerspective, True)])
+        assert scene.as_array().shape == (4, 8, 3)
+        assert depth.depth_array().shape == (4, 8)
+        assert len(client.getLidarData().point_cloud) == 30
+        client.ping()
+        client.ping()
+    assert server.call_counts['simGetImages'] == 1
+    assert server.call_counts['ping'] == 2
+
+
+def test_state_round_trips():
+    with FakeAirSimServer() as server:
+        client = airsim.MultirotorClient(port = server.port)
+        client.simSetVehiclePose(airsim.Pose(airsim.Vector3r(1, 2, 3)), True, 'Drone1')
+        assert client.simGetVehiclePose('Drone1').position.to_numpy_array().tolist() == [1, 2, 3]
+        assert client.simGetVehiclePose('Drone2').position.to_numpy_array().tolist() == [0, 0, 0]
+        client.simPause(True)
+        assert client.simIsPause()
+        client.reset()
+        assert client.simGetVehiclePose('Drone1').position.to_numpy_array().tolist() == [0, 0, 0]
+
+
+def test_unknown_and_private_methods_fail():
+    with FakeAirSimServer() as server:
+        client = airsim.VehicleClient(port = server.port)
+        with pytest.raises(Exception):
+            client.client.call('noSuchMethod')
+        with pytest.raises(Exception):
+            client.client.call('_cached', 'key', None)
+
+
+def test_custom_api():
+    class Api(FakeAirSimApi):
+        def getServerVersion(self):
+            return 42
+
+    with FakeAirSimServer(api = Api()) as server:
+        assert airsim.VehicleClient(port = server.port).getServerVersion() == 42
+
+
+def test_pipelined_requests_overlap_latency():
+    with FakeAirSimServer(latency = 0.05) as server:
+        client = airsim.VehicleClient(port = server.port)
+        start = time.time()
+        client.ping()
+        assert time.time() - start >= 0.05
+
+        start = time.time()
+        futures = [client.client.call_async('ping') for _ in range(10)]
+        assert all(future.get() for future in futures)
+        assert time.time() - start < 0.4
@@ -0,0 +1,92 @@
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip('keras.preprocessing.image')
+pytest.importorskip('cv2')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'imitation_learning'))
+from Generator import DriveDataGenerator
+
+ROI = [2, 10, 1, 13]
+
+
+@pytest.fixture
+def data():
+    count = 50
+    images = np.arange(count, dtype = np.uint8)[:, None, None, None] * np.ones((1, 12, 16, 3), np.uint8)
+    states = np.random.uniform(-1, 1, (count, 4))
+    labels = np.linspace(-1, 1, count)[:, None]
+    return images, states, labels
+
+
+def test_batch_shapes_and_partial_batch(data):
+    images, states, labels = data
+    iterator = DriveDataGenerator().flow(images, states, labels, batch_size = 16, shuffle = False, zero_drop_percentage = 0.0, roi = ROI)
+    sizes = []
+    for _ in range(4):
+        batch_x, batch_y = iterator.next()
+        assert batch_x[0].shape[1:] == (8, 12, 3)
+        assert batch_x[0].dtype == np.float32
+        assert len(batch_x[0]) == len(batch_y)
+        sizes.append(len(batch_y))
+    assert sizes == [16, 16, 16, 2]
+
+
+def test_batches_hold_their_rows(data):
+    images, states, labels = data
+    iterator = DriveDataGenerator().flow(images, states, labels, batch_size = 16, shuffle = True, zero_drop_percentage = 0.0)
+    batch_x, batch_y = iterator.next()
+    rows = batch_x[0][:, 0, 0, 0].astype(int)
+    np.testing.assert_allclose(batch_y, labels[rows])
+
+
+def test_prefetched_batches_match_sequential(data):
+    images, states, labels = data
+    sequential = DriveDataGenerator().flow(images, states, labels, batch_size = 8, shuffle = False, zero_drop_percentage = 0.0)
+    prefetched = DriveDataGenerator().flow(images, states, labels, batch_size = 8, shuffle = False, zero_drop_percentage = 0.0,
+                                           workers = 2, prefetch = 3)
+    try:
+        for _ in range(10):
+            (x_a,), y_a = sequential.next()
+            (x_b,), y_b = prefetched.next()
+            np.testing.assert_array_equal(x_a, x_b)
+            np.testing.assert_array_equal(y_a, y_b)
+    finally:
+        prefetched.close()
+
+
+def test_close_stops_threads(data):
+    images, states, labels = data
+    before = threading.active_count()
+    iterator = DriveDataGenerator().flow(images, states, labels, batch_size = 8, workers = 3)
+    iterator.next()
+    assert threading.active_count() > before
+    iterator.close()
+    assert threading.active_count() == before
+
+
+def test_no_threads_by_default(data):
+    images, states, labels = data
+    iterator = DriveDataGenerator().flow(images, states, labels, batch_size = 8)
+    iterator.next()
+    assert iterator.executor is None
+
+
+def test_indexed_batches(data):
+    images, states, labels = data
+    iterator = DriveDataGenerator().flow(images, states, labels, batch_size = 8, zero_drop_percentage = 0.0)
+    batch_x, batch_y = iterator._get_batches_of_transformed_samples(np.array([7, 3, 5]))
+    np.testing.assert_allclose(batch_y, labels[[3, 5, 7]])
+
+
+def test_zero_drop(data):
+    images, states, labels = data
+    labels = np.full_like(labels, 0.5)
+    labels[::2] = 0.1
+    iterator = DriveDataGenerator().flow(images, states, labels, batch_size = 50, shuffle = False, zero_drop_percentage = 1.0)
+    batch_x, batch_y = iterator.next()
+    assert len(batch_y) == 25 and np.all(batch_y == 0.1)
@@ -0,0 +1,105 @@
+import airsim
+
+import pytest
+
+
+class RecordingObserver:
+    def __init__(self):
+        self.records = []
+
+    def on_rpc(self, record):
+        self.records.append(record)
+
+
+def test_observed_call_returns_raw_result(server):
+    client = airsim.MultirotorClient(port = server.port)
+    raw = client.client.call('getMultirotorState', '')
+    client.set_rpc_observer(RecordingObserver())
+    observed = client.client.call('getMultirotorState', '')
+    assert type(observed) is dict and observed.keys() == raw.keys()
+
+
+def test_observer_records_wire_sizes_and_decode_time(server):
+    client = airsim.MultirotorClient(port = server.port)
+    observer = RecordingObserver()
+    client.set_rpc_observer(observer)
+
+    state = client.getMultirotorState()
+    assert isinstance(state, airsim.MultirotorState)
+    record, = observer.records
+    assert record.method == 'getMultirotorState'
+    assert record.vehicle_name == ''
+    assert record.error is None
+    assert record.bytes_sent > len('getMultirotorState')
+    assert record.bytes_received > record.bytes_sent
+    assert record.serialize_time > 0 and record.wire_time > 0 and record.deserialize_time > 0
+
+
+def test_observer_bytes_received_matches_response_size(server):
+    client = airsim.VehicleClient(port = server.port)
+    observer = RecordingObserver()
+    client.set_rpc_observer(observer)
+    client.simGetImages([airsim.ImageRequest('0', airsim.ImageType.Scene)])
+    small = observer.records[-1].bytes_received
+    client.simGetImages([airsim.ImageRequest('0', airsim.ImageType.Scene)] * 3)
+    assert observer.records[-1].bytes_received > 2 * small
+
+
+def test_observer_records_errors(server):
+    client = airsim.VehicleClient(port = server.port)
+    observer = RecordingObserver()
+    client.set_rpc_observer(observer)
+    with pytest.raises(Exception):
+        client.client.call('noSuchMethod')
+    assert observer.records[-1].method == 'noSuchMethod'
+    assert observer.records[-1].error is not None
+
+
+def test_observer_sees_batched_calls(server):
+    client = airsim.MultirotorClient(port = server.port)
+    observer = RecordingObserver()
+    client.set_rpc_observer(observer)
+    with client.batch() as batch:
+        batch.getMultirotorState('Drone1')
+        batch.simGetCollisionInfo('Drone1')
+    assert isinstance(batch.results[0], airsim.MultirotorState)
+    assert isinstance(batch.results[1], airsim.CollisionInfo)
+    assert [record.method for record in observer.records] == ['getMultirotorState', 'simGetCollisionInfo']
+    assert all(record.deserialize_time > 0 for record in observer.records)
+
+
+def test_rpc_stats_summary(server):
+    client = airsim.MultirotorClient(port = server.port)
+    stats = airsim.RpcStats()
+    client.set_rpc_observer(stats)
+    for _ in range(5):
+        client.getMultirotorState('Drone1')
+    client.set_rpc_observer(None)
+    client.getMultirotorState('Drone1')
+    assert stats.to_dict()['getMultirotorState']['Drone1']['calls'] == 5
+
+
+def test_nothing_measured_without_observer(server):
+    client = airsim.MultirotorClient(port = server.port)
+    future = client.client.call_async('getMultirotorState', 'Drone1')
+    future.get()
+    assert not hasattr(future, 'bytes_sent') and not hasattr(future, 'bytes_received')
+
+    observer = RecordingObserver()
+    client.set_rpc_observer(observer)
+    client.getMultirotorState('Drone1')
+    assert observer.records[0].bytes_sent > 0
+    client.set_rpc_observer(None)
+    future = client.client.call_async('getMultirotorState', 'Drone1')
+    future.get()
+    assert not hasattr(future, 'bytes_sent')
+
+
+def test_observer_on_pooled_client(server):
+    client = airsim.MultirotorClient(port = server.port, pool_size = 2)
+    observer = RecordingObserver()
+    client.set_rpc_observer(observer)
+    client.getMultirotorState('Drone1')
+    client.getMultirotorState('Drone2')
+    assert [record.vehicle_name for record in observer.records] == ['Drone1', 'Drone2']
+    assert all(record.bytes_received > 0 for record in observer.records)
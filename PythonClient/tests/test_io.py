@@ -0,0 +1,108 @@
+import os
+import threading
+
+import airsim
+from airsim.io import encode_frame
+import numpy as np
+import pytest
+
+
+def stall(writer):
+    # the single worker holds the first frame until the returned event is set, so the queue fills up
+    started, release = threading.Event(), threading.Event()
+    encode = writer._encode
+    def blocking_encode(filename, data):
+        started.set()
+        release.wait(5)
+        return encode(filename, data)
+    writer._encode = blocking_encode
+    return started, release
+
+
+def test_writes_bytes_arrays_and_stats(tmp_path):
+    depth = np.random.RandomState(0).uniform(0, 10, (4, 5)).astype(np.float32)
+    with airsim.AsyncFrameWriter(fsync_every = 2) as writer:
+        assert writer.write(str(tmp_path / 'raw.bin'), b'abc')
+        assert writer.write(str(tmp_path / 'depth.pfm'), depth)
+        assert writer.write(str(tmp_path / 'depth.npy'), depth)
+        writer.flush()
+        stats = writer.stats()
+    assert (stats['queued'], stats['written'], stats['dropped'], stats['errors']) == (3, 3, 0, 0)
+    assert stats['fsyncs'] == 2
+    assert stats['bytes_written'] == sum(os.path.getsize(str(tmp_path / name)) for name in ('raw.bin', 'depth.pfm', 'depth.npy'))
+    assert (tmp_path / 'raw.bin').read_bytes() == b'abc'
+    np.testing.assert_array_equal(airsim.read_pfm(str(tmp_path / 'depth.pfm'))[0], depth)
+    np.testing.assert_array_equal(np.load(str(tmp_path / 'depth.npy')), depth)
+
+
+def test_writable_arrays_are_copied(tmp_path):
+    image = np.zeros((2, 2), np.float32)
+    with airsim.AsyncFrameWriter(workers = 1) as writer:
+        started, release = stall(writer)
+        writer.write(str(tmp_path / 'first.bin'), b'')
+        started.wait(5)
+        writer.write(str(tmp_path / 'frame.npy'), image)
+        image[:] = 1
+        release.set()
+    assert not np.load(str(tmp_path / 'frame.npy')).any()
+
+
+@pytest.mark.parametrize('policy, kept', [('drop', [0, 1, 2]), ('drop_oldest', [0, 2, 3])])
+def test_full_queue_policies(tmp_path, policy, kept):
+    writer = airsim.AsyncFrameWriter(workers = 1, max_queue = 2, policy = policy)
+    started, release = stall(writer)
+    queued = [writer.write(str(tmp_path / ('%d.bin' % 0)), b'0')]
+    started.wait(5)
+    queued += [writer.write(str(tmp_path / ('%d.bin' % i)), b'%d' % i) for i in (1, 2, 3)]
+    assert writer.queue_depth == 2
+    release.set()
+    writer.close()
+
+    assert queued == ([True, True, True, False] if policy == 'drop' else [True] * 4)
+    assert writer.dropped == 1
+    assert sorted(int(name[:-4]) for name in os.listdir(str(tmp_path))) == kept
+
+
+def test_block_policy_times_out(tmp_path):
+    writer = airsim.AsyncFrameWriter(workers = 1, max_queue = 1)
+    started, release = stall(writer)
+    writer.write(str(tmp_path / 'a.bin'), b'a')
+    started.wait(5)
+    assert writer.write(str(tmp_path / 'b.bin'), b'b')
+    assert not writer.write(str(tmp_path / 'c.bin'), b'c', timeout = 0.05)
+    release.set()
+    writer.close()
+    assert writer.dropped == 1
+    assert sorted(os.listdir(str(tmp_path))) == ['a.bin', 'b.bin']
+
+
+def test_errors_raise_on_flush_and_writes_after_close(tmp_path):
+    writer = airsim.AsyncFrameWriter()
+    writer.write(str(tmp_path / 'frame.gif'), np.zeros((2, 2), np.uint8))
+    with pytest.raises(ValueError):
+        writer.flush()
+    assert writer.stats()['errors'] == 1
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.write(str(tmp_path / 'a.bin'), b'')
+    with pytest.raises(ValueError):
+        airsim.AsyncFrameWriter(policy = 'wait')
+
+
+def test_uncompressed_response_written_as_rgb_png(tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    bgr = np.arange(2 * 3 * 3, dtype = np.uint8).reshape(2, 3, 3)
+    response = airsim.ImageResponse()
+    response.compress = False
+    response.pixels_as_float = False
+    response.width, response.height = 3, 2
+    response.image_data_uint8 = bgr.tobytes()
+    with airsim.AsyncFrameWriter() as writer:
+        writer.write(str(tmp_path / 'scene.png'), response)
+    np.testing.assert_array_equal(np.asarray(Image.open(str(tmp_path / 'scene.png'))), bgr[..., ::-1])
+
+
+def test_encode_frame_pfm_matches_write_pfm(tmp_path):
+    image = np.random.RandomState(1).uniform(0, 1, (3, 4, 3)).astype(np.float32)
+    airsim.write_pfm(str(tmp_path / 'a.pfm'), image)
+    assert encode_frame('.PFM', image) == (tmp_path / 'a.pfm').read_bytes()
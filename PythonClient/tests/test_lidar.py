@@ -0,0 +1,22 @@
+import airsim
+
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.parametrize('server', [dict(lidar_points = 100)], indirect = True)
+
+
+def test_lidar_scan(server):
+    client = airsim.VehicleClient(port = server.port)
+    scan = client.getLidarScan()
+    assert len(scan) == 100
+    assert scan.points.shape == (100, 3) and scan.points.dtype == np.float32
+    assert scan.segmentation.shape == (100,) and scan.segmentation.dtype == np.int32
+    assert isinstance(scan.pose, airsim.Pose)
+    assert client.getLidarScan(segmentation = False).segmentation is None
+
+
+def test_lidar_scan_matches_lidar_data(server):
+    client = airsim.VehicleClient(port = server.port)
+    data = client.getLidarData()
+    np.testing.assert_array_equal(airsim.LidarScan.from_lidar_data(data).points, np.reshape(data.point_cloud, (-1, 3)))
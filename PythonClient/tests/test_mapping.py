@@ -0,0 +1,55 @@
+import math
+
+import airsim
+import numpy as np
+
+
+def test_points_merge_into_voxels():
+    accumulator = airsim.LidarAccumulator(resolution = 1.0, max_points_per_voxel = 2)
+    accumulator.add(np.array([[0.1, 0.1, 0.1], [0.2, 0.2, 0.2], [0.3, 0.3, 0.3], [5.5, 0.5, 0.5]]))
+    assert len(accumulator) == 2
+    assert accumulator.point_count == 3
+    np.testing.assert_allclose(sorted(map(tuple, accumulator.voxel_centers())), [(0.5, 0.5, 0.5), (5.5, 0.5, 0.5)])
+
+
+def test_matches_brute_force_over_many_scans():
+    rng = np.random.RandomState(1)
+    accumulator = airsim.LidarAccumulator(resolution = 0.5)
+    scans = [rng.uniform(-20, 20, (2000, 3)).astype(np.float32) for _ in range(5)]
+    for scan in scans:
+        accumulator.add(scan)
+    expected = set(map(tuple, np.floor(np.concatenate(scans) / 0.5).astype(int)))
+    found = set(map(tuple, np.floor(accumulator.voxel_centers() / 0.5).astype(int)))
+    assert found == expected
+    assert accumulator.scan_count == 5
+
+
+def test_pose_transforms_points():
+    pose = airsim.Pose(airsim.Vector3r(10, 0, 0), airsim.to_quaternion(0, 0, math.pi / 2))
+    accumulator = airsim.LidarAccumulator(resolution = 0.1)
+    accumulator.add(np.array([[1.0, 0.0, 0.0]]), pose)
+    np.testing.assert_allclose(accumulator.points(), [[10.0, 1.0, 0.0]], atol = 1e-5)
+
+
+def test_max_voxels_keeps_nearest():
+    accumulator = airsim.LidarAccumulator(resolution = 1.0, max_voxels = 100, transform = False)
+    points = np.stack((np.arange(400) + 0.5, np.zeros(400), np.zeros(400)), axis = 1)
+    accumulator.add(points, airsim.Pose(airsim.Vector3r(0, 0, 0)))
+    assert len(accumulator) <= 100
+    assert accumulator.voxel_centers()[:, 0].max() < 100
+
+
+def test_non_finite_points_are_dropped():
+    accumulator = airsim.LidarAccumulator()
+    accumulator.add(np.array([[np.nan, 0, 0], [np.inf, 0, 0], [1, 1, 1]]))
+    assert accumulator.point_count == 1
+
+
+def test_save(tmp_path):
+    accumulator = airsim.LidarAccumulator()
+    accumulator.add(np.random.uniform(-1, 1, (50, 3)))
+    accumulator.save_ply(str(tmp_path / 'map.ply'))
+    with open(str(tmp_path / 'map.ply'), 'rb') as f:
+        assert f.read().startswith(b'ply\nformat binary_little_endian 1.0\nelement vertex %d\n' % accumulator.point_count)
+    accumulator.save_npz(str(tmp_path / 'map.npz'))
+    np.testing.assert_array_equal(np.load(str(tmp_path / 'map.npz'))['points'], accumulator.points())
@@ -0,0 +1,76 @@
+import airsim
+import numpy as np
+import pytest
+
+
+def frame(shape, seed = 0):
+    return np.random.RandomState(seed).uniform(0, 100, shape).astype(np.float32)
+
+
+@pytest.mark.parametrize('shape', [(4, 6), (4, 6, 3)])
+def test_write_read_round_trip(tmp_path, shape):
+    image = frame(shape)
+    path = str(tmp_path / 'frame.pfm')
+    airsim.write_pfm(path, image, scale = 2)
+
+    data, scale = airsim.read_pfm(path)
+    assert scale == 2
+    np.testing.assert_array_equal(data, image)
+
+    info = airsim.pfm_info(path)
+    assert (info.width, info.height, info.channels) == (6, 4, 3 if len(shape) == 3 else 1)
+    assert info.shape == shape
+    assert info.offset == len(open(path, 'rb').read()) - image.nbytes
+
+
+def test_mmap_and_flip(tmp_path):
+    image = frame((5, 3))
+    path = str(tmp_path / 'frame.pfm')
+    airsim.write_pfm(path, image)
+
+    data, _ = airsim.read_pfm(path, mmap = True)
+    assert isinstance(data, np.memmap)
+    np.testing.assert_array_equal(data, image)
+    flipped, _ = airsim.read_pfm(path, flip = True)
+    np.testing.assert_array_equal(flipped, image[::-1])
+
+
+def test_dimensions_on_separate_lines(tmp_path):
+    image = frame((2, 3))
+    path = str(tmp_path / 'frame.pfm')
+    with open(path, 'wb') as f:
+        f.write(b'Pf\n3\n2\n-1.0\n')
+        f.write(image.astype('<f4').tobytes())
+    data, _ = airsim.read_pfm(path)
+    np.testing.assert_array_equal(data, image)
+
+
+def test_not_a_pfm(tmp_path):
+    path = str(tmp_path / 'frame.pfm')
+    with open(path, 'wb') as f:
+        f.write(b'P6\n3 2\n255\n')
+    with pytest.raises(Exception):
+        airsim.read_pfm(path)
+
+
+@pytest.mark.parametrize('channels', [1, 3])
+def test_sequence_writer(tmp_path, channels):
+    shape = (4, 5, 3) if channels == 3 else (4, 5)
+    frames = [frame(shape, seed) for seed in range(3)]
+    pattern = str(tmp_path / 'frame_%03d.pfm')
+    with airsim.PfmSequenceWriter(pattern, 5, 4, channels = channels, start = 7) as writer:
+        paths = [writer.write(image) for image in frames]
+    assert paths == [pattern % i for i in (7, 8, 9)]
+    for path, image in zip(paths, frames):
+        np.testing.assert_array_equal(airsim.read_pfm(path)[0], image)
+
+
+def test_sequence_writer_flip_and_shapes(tmp_path):
+    image = frame((4, 5))
+    writer = airsim.PfmSequenceWriter(str(tmp_path / '%d.pfm'), 5, 4, flip = True)
+    path = writer.write(image[..., None])
+    np.testing.assert_array_equal(airsim.read_pfm(path, flip = True)[0], image)
+    with pytest.raises(ValueError):
+        writer.write(frame((5, 4)))
+    with pytest.raises(ValueError):
+        airsim.PfmSequenceWriter('%d.pfm', 5, 4, channels = 2)
@@ -0,0 +1,57 @@
+import io
+import struct
+import zlib
+
+import airsim
+import numpy as np
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def image(shape, dtype = np.uint8):
+    return np.random.RandomState(0).randint(0, np.iinfo(dtype).max, shape).astype(dtype)
+
+
+@pytest.mark.parametrize('png_filter', ['none', 'sub', 'up'])
+@pytest.mark.parametrize('shape', [(5, 7), (5, 7, 1), (5, 7, 3), (5, 7, 4)])
+def test_decodes_with_pil(shape, png_filter):
+    expected = image(shape)
+    decoded = np.asarray(Image.open(io.BytesIO(airsim.encode_png(expected, png_filter = png_filter))))
+    np.testing.assert_array_equal(decoded, expected.reshape(decoded.shape))
+
+
+def test_sixteen_bit(tmp_path):
+    expected = image((6, 4), np.uint16)
+    path = str(tmp_path / 'depth.png')
+    airsim.write_png(path, expected, compression_level = 9, strategy = zlib.Z_RLE)
+    np.testing.assert_array_equal(np.asarray(Image.open(path)).astype(np.uint16), expected)
+
+
+def test_idat_chunks_are_split(monkeypatch):
+    monkeypatch.setattr(airsim.utils, '_PNG_SLICE_BYTES', 64)
+    expected = image((32, 32, 3))
+    data = airsim.encode_png(expected, compression_level = 0)
+
+    tags, offset = [], 8
+    while offset < len(data):
+        length, = struct.unpack('!I', data[offset:offset + 4])
+        tags.append(data[offset + 4:offset + 8])
+        offset += length + 12
+    assert tags[0] == b'IHDR' and tags[-1] == b'IEND'
+    assert tags.count(b'IDAT') > 1
+    np.testing.assert_array_equal(np.asarray(Image.open(io.BytesIO(data))), expected)
+
+
+def test_encode_into_file_object():
+    expected = image((3, 3, 3))
+    out = io.BytesIO()
+    written = airsim.encode_png(expected, out = out)
+    assert written == len(out.getvalue())
+    assert out.getvalue() == airsim.encode_png(expected)
+
+
+@pytest.mark.parametrize('bad', [np.zeros((2, 2, 5), np.uint8), np.zeros((2, 2), np.float32), np.zeros(4, np.uint8)])
+def test_rejects_unsupported_images(bad):
+    with pytest.raises(ValueError):
+        airsim.encode_png(bad)
@@ -0,0 +1,54 @@
+import airsim
+from airsim.pointcloud import camera_intrinsics
+
+import numpy as np
+import pytest
+
+
+def depth_response(depth, image_type = airsim.ImageType.DepthPlanner):
+    depth = np.asarray(depth, np.float32)
+    return airsim.ImageResponse.from_msgpack({'image_data_float': depth.ravel().tolist(), 'width': depth.shape[1], 'height': depth.shape[0],
+                                              'pixels_as_float': True, 'compress': False, 'image_type': image_type})
+
+
+def test_intrinsics_from_fov():
+    fx, fy, cx, cy = camera_intrinsics(640, 480, fov = 90.0)
+    assert fx == pytest.approx(320.0) and fy == pytest.approx(320.0)
+    assert (cx, cy) == (320.0, 240.0)
+
+
+def test_planar_depth_is_x_coordinate():
+    points = airsim.depth_to_points(depth_response(np.full((4, 6), 3.0)))
+    assert points.shape == (24, 3)
+    np.testing.assert_allclose(points[:, 0], 3.0)
+
+
+def test_perspective_depth_is_distance():
+    points = airsim.depth_to_points(depth_response(np.full((4, 6), 3.0), airsim.ImageType.DepthPerspective))
+    np.testing.assert_allclose(np.linalg.norm(points, axis = 1), 3.0, rtol = 1e-6)
+
+
+def test_max_depth_and_mask():
+    depth = np.full((2, 2), 1.0)
+    depth[0, 0] = 100.0
+    points, mask = airsim.depth_to_points(depth_response(depth), max_depth = 10.0, return_mask = True)
+    assert len(points) == 3 and not mask[0, 0]
+
+
+def test_world_frame_uses_camera_pose():
+    response = depth_response(np.full((2, 2), 1.0))
+    response.camera_position = airsim.Vector3r(5, 0, 0)
+    points = airsim.depth_to_points(response, frame = 'world')
+    np.testing.assert_allclose(points[:, 0], 6.0)
+    with pytest.raises(ValueError):
+        airsim.depth_to_points(response, frame = 'body')
+
+
+def test_colored_cloud(tmp_path):
+    response = depth_response(np.full((2, 3), 1.0))
+    scene = airsim.ImageResponse.from_msgpack({'image_data_uint8': bytes(range(18)), 'width': 3, 'height': 2, 'compress': False})
+    cloud = airsim.PointCloud.from_depth(response, scene_response = scene)
+    np.testing.assert_array_equal(cloud.colors[0], [2, 1, 0])
+    cloud.save_ply(str(tmp_path / 'cloud.ply'))
+    cloud.save_pcd(str(tmp_path / 'cloud.pcd'))
+    assert (tmp_path / 'cloud.pcd').read_bytes().count(b'POINTS 6') == 1
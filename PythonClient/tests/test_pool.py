@@ -0,0 +1,34 @@
+import threading
+
+import airsim
+
+
+def test_pool_vehicle_affinity(server):
+    client = airsim.MultirotorClient(port = server.port, pool_size = 2)
+    pool = client.client
+    assert isinstance(pool, airsim.RpcClientPool)
+    first = pool.channel_index('Drone1')
+    assert pool.channel_index('Drone2') != first
+    assert pool.channel_index('Drone1') == first
+    assert airsim.RpcClientPool.vehicle_name_of('simPause', (True,)) is None
+    assert airsim.RpcClientPool.vehicle_name_of('getMultirotorState', ('Drone1',)) == 'Drone1'
+
+
+def test_pool_shared_between_threads(server):
+    client = airsim.MultirotorClient(port = server.port, pool_size = 3)
+    errors = []
+
+    def run(name):
+        try:
+            for _ in range(20):
+                assert isinstance(client.getMultirotorState(name), airsim.MultirotorState)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target = run, args = ('Drone%d' % i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert server.call_counts['getMultirotorState'] == 120
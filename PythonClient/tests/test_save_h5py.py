@@ -0,0 +1,69 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+h5py = pytest.importorskip('h5py')
+pytest.importorskip('pandas')
+Image = pytest.importorskip('PIL.Image')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'imitation_learning'))
+import Cooking
+
+
+@pytest.fixture
+def mappings(tmp_path):
+    # 10 images whose pixels hold their index, labelled with it
+    mappings = []
+    for i in range(10):
+        name = str(tmp_path / ('img_%d.png' % i))
+        Image.fromarray(np.full((4, 6, 3), i, np.uint8)).save(name)
+        mappings.append((name, ([i / 10.0], [i, 0.5, 0.25])))
+    return mappings
+
+
+def read(path):
+    with h5py.File(path, 'r') as f:
+        return f['image'][:], f['label'][:], f['previous_state'][:]
+
+
+@pytest.mark.parametrize('workers, prefetch', [(1, 1), (3, None)])
+def test_only_full_chunks_are_saved(tmp_path, mappings, workers, prefetch):
+    path = str(tmp_path / 'out' / 'train.h5')
+    assert Cooking.saveH5pyData(mappings, path, 4, workers=workers, prefetch=prefetch) == (0, 8)
+    images, labels, states = read(path)
+    assert images.shape == (8, 4, 6, 3)
+    np.testing.assert_array_equal(images[:, 0, 0, 0], np.arange(8))
+    np.testing.assert_allclose(labels[:, 0], np.arange(8) / 10.0)
+    np.testing.assert_array_equal(states[:, 0], np.arange(8))
+
+
+def test_hdf5_layout(tmp_path, mappings):
+    path = str(tmp_path / 'train.h5')
+    Cooking.saveH5pyData(mappings, path, 4, hdf5_chunk_rows=2, compression='gzip', compression_level=1)
+    with h5py.File(path, 'r') as f:
+        assert f['image'].chunks == (2, 4, 6, 3)
+        assert f['image'].compression == 'gzip'
+        assert f['image'].maxshape[0] is None
+
+
+def test_append_keeps_partial_chunks(tmp_path, mappings):
+    path = str(tmp_path / 'train.h5')
+    assert Cooking.saveH5pyData(mappings[:3], path, 4, append=True) == (0, 3)
+    assert Cooking.saveH5pyData(mappings[3:], path, 4, append=True) == (3, 10)
+    assert Cooking.saveH5pyData([], path, 4, append=True) == (10, 10)
+    images, labels, _ = read(path)
+    np.testing.assert_array_equal(images[:, 0, 0, 0], np.arange(10))
+    assert Cooking.h5pyRowCount(path) == 10
+
+    Cooking.removeH5pyRows(path, 2, 5, chunk_size=2)
+    np.testing.assert_array_equal(read(path)[0][:, 0, 0, 0], [0, 1, 5, 6, 7, 8, 9])
+    Cooking.truncateH5pyData(path, 4)
+    np.testing.assert_array_equal(read(path)[1][:, 0], [0, 0.1, 0.5, 0.6])
+
+
+def test_too_few_rows_for_a_chunk(tmp_path, mappings):
+    path = str(tmp_path / 'train.h5')
+    assert Cooking.saveH5pyData(mappings[:3], path, 4) == (0, 0)
+    assert not os.path.exists(path)
@@ -0,0 +1,60 @@
+import airsim
+from airsim.testing import FakeAirSimApi, FakeAirSimServer
+import pytest
+
+
+def test_step_advances_paused_simulation():
+    with FakeAirSimServer(image_width = 4, image_height = 2) as server:
+        client = airsim.MultirotorClient(port = server.port)
+        stepper = airsim.SimStepper(client, dt = 0.05)
+        stepper.add('state', 'getMultirotorState', vehicle_name = 'Drone1')
+        stepper.add('images', 'simGetImages', [airsim.ImageRequest('0', airsim.ImageType.Scene)], vehicle_name = 'Drone1')
+        with stepper:
+            assert client.simIsPause()
+            assert set(stepper.observe()) == {'state', 'images'}
+            for _ in range(3):
+                observation = stepper.step()
+        assert not client.simIsPause()
+
+    assert isinstance(observation['state'], airsim.MultirotorState)
+    assert isinstance(observation['images'][0], airsim.ImageResponse)
+    assert server.api._sim_time == pytest.approx(0.15)
+    assert server.call_counts['simContinueForTime'] == 3
+    assert server.call_counts['getMultirotorState'] == 4
+
+    stats = stepper.stats()
+    assert stats['steps'] == 3 and stats['sim_time'] == pytest.approx(0.15)
+    assert stats['realtime_factor'] > 0
+    assert set(stepper.last_timings) == set(airsim.SimStepper.PHASES)
+    stepper.reset_stats()
+    assert stepper.stats()['steps'] == 0
+
+
+def test_waits_for_pause():
+    class Api(FakeAirSimApi):
+        polls = 0
+
+        def simContinueForTime(self, seconds):
+            self._paused = False
+
+        def simIsPaused(self):
+            Api.polls += 1
+            if Api.polls >= 3:
+                self._paused = True
+            return self._paused
+
+    with FakeAirSimServer(api = Api()) as server:
+        stepper = airsim.SimStepper(airsim.VehicleClient(port = server.port), dt = 0.01)
+        assert stepper.step() == {}
+    assert Api.polls == 3
+
+
+def test_times_out_when_never_paused():
+    class Api(FakeAirSimApi):
+        def simContinueForTime(self, seconds):
+            self._paused = False
+
+    with FakeAirSimServer(api = Api()) as server:
+        stepper = airsim.SimStepper(airsim.VehicleClient(port = server.port), dt = 0.01, timeout = 0.05)
+        with pytest.raises(TimeoutError):
+            stepper.step()
@@ -0,0 +1,53 @@
+import time
+
+import airsim
+import pytest
+
+REQUESTS = [airsim.ImageRequest('0', airsim.ImageType.Scene, False, False)]
+
+pytestmark = pytest.mark.parametrize('server', [dict(image_width = 4, image_height = 2, latency = 0.02)], indirect = True)
+
+
+def test_frames_in_order_with_prefetch(server):
+    client = airsim.VehicleClient(port = server.port)
+    with client.stream_images(REQUESTS, prefetch = 3, max_frames = 5) as stream:
+        frames = list(stream)
+    assert [frame.index for frame in frames] == list(range(5))
+    assert all(len(frame) == 1 and frame[0].as_array().shape == (2, 4, 3) for frame in frames)
+    assert all(frame.latency >= 0.02 for frame in frames)
+    assert server.call_counts['simGetImages'] == 5
+    assert stream.stats()['frames'] == 5 and stream.stats()['in_flight'] == 0
+
+
+def test_prefetch_overlaps_processing(server):
+    client = airsim.VehicleClient(port = server.port)
+    start = time.time()
+    for frame in client.stream_images(REQUESTS, prefetch = 2, max_frames = 10):
+        time.sleep(0.02)
+    # fetching then processing one frame at a time would take 10 * (0.02 + 0.02)
+    assert time.time() - start < 0.35
+
+
+def test_rate_limit_and_dropped_ticks(server):
+    client = airsim.VehicleClient(port = server.port)
+    stream = client.stream_images(REQUESTS, rate_hz = 50, prefetch = 1, max_frames = 4)
+    start = time.time()
+    next(stream)
+    time.sleep(0.1)
+    list(stream)
+    assert time.time() - start >= 0.06
+    assert stream.dropped_ticks >= 2
+    assert stream.frames == 4
+    assert stream.fps > 0
+
+
+def test_close_drains_requests_in_flight(server):
+    client = airsim.VehicleClient(port = server.port)
+    stream = client.stream_images(REQUESTS, prefetch = 3)
+    next(stream)
+    stream.close()
+    with pytest.raises(StopIteration):
+        next(stream)
+    # the connection is usable again, no prefetched response is left to be read as the answer to this call
+    assert client.ping()
+    assert stream.stats()['in_flight'] == 0
@@ -0,0 +1,54 @@
+import airsim
+from airsim.telemetry import STATE_DTYPE, state_row
+from airsim.testing import FakeAirSimServer
+
+import numpy as np
+
+
+def state(timestamp, x, vx = 0.0):
+    state = airsim.MultirotorState()
+    state.timestamp = timestamp
+    state.kinematics_estimated.position = airsim.Vector3r(x, 0, 0)
+    state.kinematics_estimated.linear_velocity = airsim.Vector3r(vx, 0, 0)
+    return state
+
+
+def test_append_grows_and_keeps_rows():
+    log = airsim.StateLog(capacity = 2)
+    log.extend(state(i * 10, float(i), 2.0) for i in range(5))
+    assert len(log) == 5
+    assert log.data.dtype == STATE_DTYPE
+    np.testing.assert_array_equal(log.data['timestamp'], [0, 10, 20, 30, 40])
+    np.testing.assert_allclose(log.speeds(), 2.0)
+    assert log.distance_travelled() == 4.0
+
+
+def test_time_slice():
+    log = airsim.StateLog()
+    log.extend(state(i * 10, float(i)) for i in range(10))
+    np.testing.assert_array_equal(log.time_slice(20, 50)['timestamp'], [20, 30, 40])
+    assert len(log.time_slice(start = 85)) == 1
+
+
+def test_kinematics_state_needs_timestamp():
+    kinematics = airsim.KinematicsState(position = airsim.Vector3r(1, 2, 3))
+    row = state_row(kinematics, timestamp = 7)
+    assert row[0] == 7 and row[1] == (1, 2, 3) and row[-1] == -1
+
+
+def test_save_and_load(tmp_path):
+    log = airsim.StateLog()
+    log.extend(state(i, float(i)) for i in range(3))
+    for name in ('log.npy', 'log.npz'):
+        log.save(str(tmp_path / name))
+        loaded = airsim.StateLog.load(str(tmp_path / name))
+        np.testing.assert_array_equal(loaded.data, log.data)
+
+
+def test_logs_fake_server_states():
+    with FakeAirSimServer() as server:
+        client = airsim.MultirotorClient(port = server.port)
+        log = airsim.StateLog()
+        for _ in range(3):
+            log.append(client.getMultirotorState())
+    assert len(log) == 3 and log.data['timestamp'][0] > 0
@@ -0,0 +1,64 @@
+import airsim
+from airsim.testing import FakeAirSimServer
+
+import numpy as np
+import pytest
+
+
+def test_decoder_nested_and_missing_fields():
+    pose = airsim.Pose.from_msgpack({'position': {'x_val': 1.0, 'y_val': 2.0, 'z_val': 3.0}})
+    assert isinstance(pose.position, airsim.Vector3r)
+    assert (pose.position.x_val, pose.position.z_val) == (1.0, 3.0)
+    assert isinstance(pose.orientation, airsim.Quaternionr)
+    assert pose.orientation.w_val == 1.0
+
+
+def test_decoder_round_trip():
+    state = airsim.KinematicsState(position = airsim.Vector3r(1, 2, 3), orientation = airsim.Quaternionr(0.5, 0.5, 0.5, 0.5))
+    encoded = {name: value.to_msgpack() for name, value in state.to_msgpack().items()}
+    decoded = airsim.KinematicsState.from_msgpack(encoded)
+    assert decoded.position.y_val == 2
+    assert decoded.orientation.x_val == 0.5
+
+
+def test_decoder_rejects_non_dict():
+    with pytest.raises(Exception):
+        airsim.Pose.from_msgpack(airsim.Pose())
+
+
+def test_depth_array_keeps_image_data_float():
+    response = airsim.ImageResponse.from_msgpack({'image_data_float': [0.5, 1.5, 2.5, 3.5, 4.5, 5.5], 'width': 3, 'height': 2,
+                                                  'pixels_as_float': True, 'compress': False})
+    depth = response.depth_array()
+    assert depth.dtype == np.float32 and depth.shape == (2, 3)
+    assert depth[1, 2] == 5.5
+    assert isinstance(response.image_data_float, list)
+    assert response.depth_array() is not depth and np.shares_memory(response.depth_array(), depth)
+    assert '_depth' not in response.to_msgpack()
+
+
+def test_depth_array_is_read_only():
+    response = airsim.ImageResponse.from_msgpack({'image_data_float': [1.0, 2.0], 'width': 2, 'height': 1})
+    with pytest.raises(ValueError):
+        response.depth_array()[0, 0] = 0
+    clipped = airsim.get_pfm_array(response)
+    clipped[0, 0] = 0
+    assert response.depth_array()[0, 0] == 1.0
+
+
+def test_depth_array_size_mismatch():
+    response = airsim.ImageResponse.from_msgpack({'image_data_float': [0.0] * 5, 'width': 3, 'height': 2})
+    with pytest.raises(ValueError):
+        response.depth_array()
+
+
+def test_as_array_from_fake_server():
+    with FakeAirSimServer(image_width = 32, image_height = 16) as server:
+        client = airsim.VehicleClient(port = server.port)
+        raw, depth = client.simGetImages([airsim.ImageRequest('0', airsim.ImageType.Scene, False, False),
+                                          airsim.ImageRequest('0', airsim.ImageType.DepthPerspective, True, False)])
+    assert raw.as_array().shape[:2] == (16, 32)
+    assert depth.depth_array().shape == (16, 32)
+    compressed = airsim.ImageResponse()
+    with pytest.raises(ValueError):
+        compressed.as_array()
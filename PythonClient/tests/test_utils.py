@@ -0,0 +1,36 @@
+import math
+
+import airsim
+import numpy as np
+
+
+def random_angles(count):
+    rng = np.random.RandomState(0)
+    return np.stack((rng.uniform(-1.5, 1.5, count), rng.uniform(-3, 3, count), rng.uniform(-3, 3, count)), axis = 1)
+
+
+def test_batch_matches_scalar_conversions():
+    angles = random_angles(50)
+    quaternions = airsim.to_quaternion_batch(angles)
+    for (pitch, roll, yaw), q in zip(angles, quaternions):
+        expected = airsim.to_quaternion(pitch, roll, yaw)
+        np.testing.assert_allclose(q, expected.to_numpy_array(), atol = 1e-9)
+        np.testing.assert_allclose(airsim.to_eularian_angles_batch(q), airsim.to_eularian_angles(expected), atol = 1e-9)
+
+
+def test_rotation_matrices_agree():
+    angles = random_angles(20)
+    from_angles = airsim.to_rotation_matrix_batch(angles)
+    from_quaternions = airsim.quaternion_to_rotation_matrix_batch(airsim.to_quaternion_batch(angles))
+    np.testing.assert_allclose(from_angles, from_quaternions, atol = 1e-9)
+
+
+def test_multiply_and_rotate():
+    a, b = airsim.to_quaternion_batch(random_angles(2))
+    product = airsim.quaternion_multiply_batch(a, b)
+    qa, qb = airsim.Quaternionr(*a), airsim.Quaternionr(*b)
+    np.testing.assert_allclose(product, (qa * qb).to_numpy_array(), atol = 1e-9)
+
+    yaw_90 = airsim.to_quaternion_batch([0, 0, math.pi / 2])
+    np.testing.assert_allclose(airsim.quaternion_rotate_batch(yaw_90, [[1, 0, 0], [0, 1, 0]]), [[0, 1, 0], [-1, 0, 0]], atol = 1e-9)
+    np.testing.assert_allclose(airsim.quaternion_multiply_batch(a, airsim.quaternion_conjugate_batch(a)), [0, 0, 0, 1], atol = 1e-9)